@@ -0,0 +1,46 @@
+import argparse             # Required for argument passing
+import sys                  # Required for importing the NetworkNarcotic engine
+import os                   # Required for importing the NetworkNarcotic engine
+import io                   # Required for timing the address plan emitters
+import time                 # Required for timing the addressing planner
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+import nn                   # Required for building networks
+from nn_generate import generateInputFile # Required for generating input files
+from nn_addressing import planAddresses, emitAddressPlanJSON, emitAddressPlanCSV # Required for benchmarking the addressing planner
+
+"""
+###################################################################################################################
+Benchmarking the addressing planner.
+
+This script builds generated networks with a growing amount of links and times planning an address for every router
+interface, and writing the plan as JSON and CSV. Router clusters are full meshes of four routers, connected to the
+next one in parallel, so every cluster adds ten point-to-point links. With switches, every connection also gets a
+switch cluster, which turns it into a LAN. The best of a few repetitions is kept per size.
+###################################################################################################################
+"""
+parser = argparse.ArgumentParser(description="Times the addressing planner on generated networks of growing size.")
+parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000], help="the amounts of links to benchmark, roughly")
+parser.add_argument("--switches", type=int, default=0, help="the amount of switches in every connection, 0 connects router clusters directly")
+parser.add_argument("--p2p-prefix", type=int, choices=[30, 31], default=30, help="the prefix length of point-to-point subnets")
+parser.add_argument("--repeat", type=int, default=3, help="the amount of timed repetitions per size, the fastest one is kept")
+args = parser.parse_args()
+
+print(f"{'links':>7} {'interfaces':>11} {'summaries':>10} {'plan (ms)':>10} {'json (ms)':>10} {'csv (ms)':>10}")
+for intLinks in args.sizes:
+    objectInputFile = generateInputFile(max(2, intLinks // 10), 4, "full", "parallel", 1, args.switches)
+    objectTopology = nn.buildProject(objectInputFile, strGatewayInterface="eth0", strLayout="none", strSeed="benchmark")[1].objectTopology
+
+    arrayBest = [None, None, None]
+    for intRepeat in range(args.repeat):
+        floatStart = time.perf_counter()
+        objectPlan = planAddresses(objectTopology, args.p2p_prefix)
+        floatPlanned = time.perf_counter()
+        emitAddressPlanJSON(io.StringIO(), objectPlan)
+        floatJSON = time.perf_counter()
+        emitAddressPlanCSV(io.StringIO(), objectPlan)
+        floatCSV = time.perf_counter()
+        arrayBest = [min(floatTime, floatBest if floatBest != None else floatTime) for floatTime, floatBest in zip((floatPlanned - floatStart, floatJSON - floatPlanned, floatCSV - floatJSON), arrayBest)]
+
+    intInterfaces = sum(1 for tupleInterface in objectPlan.iterateInterfaces())
+    print(f"{len(objectTopology.arrayLinkStarts):>7} {intInterfaces:>11} {len(objectPlan.arraySummaries):>10} " + " ".join(f"{floatBest * 1000:>10.1f}" for floatBest in arrayBest))
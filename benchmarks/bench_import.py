@@ -0,0 +1,71 @@
+import argparse             # Required for argument passing
+import sys                  # Required for starting fresh interpreters
+import os                   # Required for locating the NetworkNarcotic engine
+import subprocess           # Required for starting fresh interpreters
+import tempfile             # Required for writing throwaway output files
+import time                 # Required for timing fresh interpreters
+
+"""
+###################################################################################################################
+Benchmarking startup.
+
+This script starts fresh interpreters with -X importtime to measure what importing and running nn.py costs, and
+guards against regressions: heavy modules must not be imported by stages that don't need them. Exits with status 1
+when a guard is violated, so it can run in CI.
+###################################################################################################################
+"""
+str_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+str_EXAMPLE = os.path.join(str_SOURCE, "example_input_file.yml")
+
+def measureImports(arrayArguments) -> tuple:
+    floatStart = time.perf_counter()
+    process = subprocess.run([sys.executable, "-X", "importtime"] + arrayArguments, cwd=str_SOURCE, capture_output=True, text=True)
+    floatWall = time.perf_counter() - floatStart
+    if (process.returncode != 0):
+        print(process.stdout + process.stderr)
+        print("Running " + " ".join(arrayArguments) + " failed. Aborting.")
+        exit(1)
+
+    dictCumulative = {} # Holds per imported module its cumulative import time in microseconds
+    dictTopLevel = {} # Same, but only for modules imported directly by the interpreter or nn.py itself
+    for strLine in process.stderr.splitlines():
+        if (strLine.startswith("import time:") and "cumulative" not in strLine):
+            arrayFields = strLine[len("import time:"):].split("|")
+            dictCumulative[arrayFields[2].strip()] = int(arrayFields[1])
+            if (not arrayFields[2][1:].startswith(" ")): # Nested imports are indented
+                dictTopLevel[arrayFields[2].strip()] = int(arrayFields[1])
+
+    return floatWall, dictCumulative, dictTopLevel
+
+parser = argparse.ArgumentParser(description="Measures and guards the startup cost of nn.py.")
+parser.add_argument("--max-import-ms", type=float, default=150, help="fail when importing nn takes longer than this")
+args = parser.parse_args()
+
+arrayScenarios = [
+    # Name, arguments, modules that must not be imported
+    ("import nn", ["-c", "import nn"], ["yaml", "schema", "psutil", "networkx", "numpy"]),
+    ("build, --layout none", ["nn.py", "-i", str_EXAMPLE, "-o", os.path.join(tempfile.gettempdir(), "bench_import.gns3"), "--gateway-interface", "bench0", "--layout", "none"], ["schema", "psutil", "networkx", "numpy"]),
+    ("build, --layout grid", ["nn.py", "-i", str_EXAMPLE, "-o", os.path.join(tempfile.gettempdir(), "bench_import.gns3"), "--gateway-interface", "bench0", "--layout", "grid"], ["schema", "psutil", "networkx", "numpy"]),
+    ("build, --layout cluster", ["nn.py", "-i", str_EXAMPLE, "-o", os.path.join(tempfile.gettempdir(), "bench_import.gns3"), "--gateway-interface", "bench0", "--layout", "cluster"], ["schema", "psutil", "networkx"]),
+    ("build, default layout", ["nn.py", "-i", str_EXAMPLE, "-o", os.path.join(tempfile.gettempdir(), "bench_import.gns3"), "--gateway-interface", "bench0"], ["schema", "psutil"])
+]
+
+booleanFailed = False
+print(f"{'scenario':<24} {'wall (ms)':>10} {'imports (ms)':>13}  heaviest imports")
+for strScenario, arrayArguments, arrayForbidden in arrayScenarios:
+    floatWall, dictCumulative, dictTopLevel = measureImports(arrayArguments)
+    arrayHeaviest = sorted((intTime, strModule) for strModule, intTime in dictTopLevel.items())[-3:]
+    intTotal = sum(dictTopLevel.values())
+    print(f"{strScenario:<24} {floatWall * 1000:>10.1f} {intTotal / 1000:>13.1f}  " + ", ".join(strModule + " " + str(round(intTime / 1000, 1)) + "ms" for intTime, strModule in reversed(arrayHeaviest)))
+
+    for strModule in arrayForbidden:
+        if (strModule in dictCumulative):
+            print("  REGRESSION: " + strScenario + " imports " + strModule)
+            booleanFailed = True
+
+    if (strScenario == "import nn" and dictCumulative.get("nn", 0) / 1000 > args.max_import_ms):
+        print("  REGRESSION: importing nn takes " + str(round(dictCumulative["nn"] / 1000, 1)) + "ms, more than " + str(args.max_import_ms) + "ms")
+        booleanFailed = True
+
+if (booleanFailed):
+    exit(1)
@@ -0,0 +1,89 @@
+import argparse             # Required for argument passing
+import sys                  # Required for importing the NetworkNarcotic engine
+import os                   # Required for importing the NetworkNarcotic engine
+import math                 # Required for measuring layout quality
+import random               # Required for generating topologies
+import time                 # Required for timing the layout engines
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from nn_layout import computeLayout, dict_LAYOUT_ENGINES # Required for benchmarking the layout engines
+
+"""
+###################################################################################################################
+Benchmarking the layout engines.
+
+This script lays out topologies of growing size with every layout engine. Topologies consist of clusters in all four
+cluster modes, chained together and with a few random connections between them, much like what the engine builds.
+Next to the time it took, every layout gets two quality measures: the median length of an edge, and how many
+devices sit closer than 50 pixels to another device (overlapping icons), both in GNS3 pixels.
+###################################################################################################################
+"""
+def buildGraph(intNodes, intClusterSize, intSeed) -> tuple:
+    objectRandom = random.Random(intSeed)
+    arrayNodes = list(range(intNodes))
+    dictClusters = {intNode: intNode // intClusterSize for intNode in arrayNodes}
+    arrayEdges = []
+
+    arrayClusters = [arrayNodes[intStart:intStart + intClusterSize] for intStart in range(0, intNodes, intClusterSize)]
+    for intCluster, arrayMembers in enumerate(arrayClusters):
+        match ["full", "loop", "line", "hubspoke"][intCluster % 4]:
+            case "full":
+                arrayEdges += [(intStart, intEnd) for intIndex, intStart in enumerate(arrayMembers) for intEnd in arrayMembers[intIndex + 1:]]
+            case "loop":
+                arrayEdges += [(intStart, intEnd) for intStart, intEnd in zip(arrayMembers, arrayMembers[1:] + arrayMembers[:1]) if intStart != intEnd]
+            case "line":
+                arrayEdges += list(zip(arrayMembers, arrayMembers[1:]))
+            case "hubspoke":
+                arrayEdges += [(arrayMembers[0], intEnd) for intEnd in arrayMembers[1:]]
+
+        if (intCluster > 0):
+            arrayEdges.append((objectRandom.choice(arrayClusters[intCluster - 1]), objectRandom.choice(arrayMembers)))
+        if (intCluster > 1 and objectRandom.random() < 0.2):
+            arrayEdges.append((objectRandom.choice(arrayClusters[objectRandom.randrange(intCluster - 1)]), objectRandom.choice(arrayMembers)))
+
+    return arrayNodes, arrayEdges, dictClusters
+
+def measureQuality(dictCoordinates, arrayEdges) -> tuple:
+    arrayLengths = sorted(math.dist(dictCoordinates[intStart], dictCoordinates[intEnd]) for intStart, intEnd in arrayEdges)
+    floatMedian = arrayLengths[len(arrayLengths) // 2] if arrayLengths else 0.0
+
+    # Bucket the devices per 50 pixel square, so only neighbouring buckets need to be compared
+    dictBuckets = {}
+    for intNode, tupleCoordinate in dictCoordinates.items():
+        dictBuckets.setdefault((tupleCoordinate[0] // 50, tupleCoordinate[1] // 50), []).append(tupleCoordinate)
+
+    intOverlapping = 0
+    for (intX, intY), arrayCoordinates in dictBuckets.items():
+        arrayNearby = [tupleOther for intOffsetX in (-1, 0, 1) for intOffsetY in (-1, 0, 1) for tupleOther in dictBuckets.get((intX + intOffsetX, intY + intOffsetY), [])]
+        for tupleCoordinate in arrayCoordinates:
+            if (sum(1 for tupleOther in arrayNearby if math.dist(tupleCoordinate, tupleOther) < 50) > 1):
+                intOverlapping += 1
+
+    return floatMedian, intOverlapping
+
+parser = argparse.ArgumentParser(description="Compares the layout engines on topologies of growing size.")
+parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 2000, 5000], help="the amounts of nodes to benchmark")
+parser.add_argument("--engines", nargs="+", choices=list(dict_LAYOUT_ENGINES), default=["fruchterman-reingold", "barnes-hut", "multilevel", "cluster"], help="the layout engines to benchmark")
+parser.add_argument("--cluster-size", type=int, default=8, help="the amount of devices per cluster")
+parser.add_argument("--max-dense", type=int, default=2000, help="skip fruchterman-reingold above this amount of nodes, it needs O(n²) memory")
+parser.add_argument("--seed", type=int, default=42, help="the seed used for generating topologies and laying them out")
+args = parser.parse_args()
+
+print(f"{'nodes':>7} {'edges':>7} {'engine':<22} {'time (s)':>10} {'median edge (px)':>17} {'overlapping':>12}")
+for intNodes in args.sizes:
+    arrayNodes, arrayEdges, dictClusters = buildGraph(intNodes, args.cluster_size, args.seed)
+    for strEngine in args.engines:
+        if (strEngine == "fruchterman-reingold" and intNodes > args.max_dense):
+            print(f"{intNodes:>7} {len(arrayEdges):>7} {strEngine:<22} {'skipped':>10}")
+            continue
+
+        floatStart = time.perf_counter()
+        try:
+            dictCoordinates = computeLayout(strEngine, arrayNodes, arrayEdges, dictClusters, args.seed)
+        except ImportError as err: # networkx needs scipy for 500 nodes or more
+            print(f"{intNodes:>7} {len(arrayEdges):>7} {strEngine:<22} {'failed':>10}  " + str(err))
+            continue
+        floatTime = time.perf_counter() - floatStart
+
+        floatMedian, intOverlapping = measureQuality(dictCoordinates, arrayEdges)
+        print(f"{intNodes:>7} {len(arrayEdges):>7} {strEngine:<22} {floatTime:>10.2f} {floatMedian:>17.0f} {intOverlapping:>12}")
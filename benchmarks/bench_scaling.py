@@ -0,0 +1,115 @@
+import argparse             # Required for argument passing
+import sys                  # Required for importing the NetworkNarcotic engine
+import os                   # Required for importing the NetworkNarcotic engine
+import json                 # Required for saving and comparing results
+import platform             # Required for describing the machine results were measured on
+import tempfile             # Required for writing input and output files
+import time                 # Required for timing every stage
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+import nn                   # Required for building networks
+from nn_generate import generateInputFile, countDevices, array_CLUSTER_MODES, array_CONNECTION_MODES, str_MIXED # Required for generating input files
+
+"""
+###################################################################################################################
+Benchmarking every stage of the engine.
+
+This script builds generated networks of growing size and times every stage of a build: loading the input file,
+validation, cluster expansion (switches and routers), connection discovery (elements and connections), link
+application (links), layout and serialization (write). The best of a few repetitions is kept per size. Results can be
+saved as a .json file and compared against an earlier one, which reports every stage that became slower and exits
+with 1, so regressions can be tracked over time.
+###################################################################################################################
+"""
+int_RESULTS_VERSION = 1
+float_NOISE = 0.005 # Seconds a stage may always slow down by, timings this small are mostly noise
+
+def benchmarkSize(intDevices, args, strDirectory) -> dict:
+    intClusters = max(2, intDevices // (args.amount + args.switches))
+    objectInputFile = generateInputFile(intClusters, args.amount, args.clustermode, args.connectionmode, args.cables, args.switches)
+    dictResult = {"devices": countDevices(objectInputFile), "clusters": intClusters}
+
+    import yaml # Required for writing input files
+    strInput = os.path.join(strDirectory, "input.yml")
+    with open(strInput, "w") as output:
+        yaml.safe_dump(objectInputFile, output, sort_keys=False, explicit_start=True)
+
+    dictBest = None
+    for intRepeat in range(args.repeat):
+        dictTimings = {}
+        floatStart = time.perf_counter()
+        objectInputFile = nn.loadInputFile(strInput)
+        nn.recordTiming(dictTimings, "load", floatStart)
+        try:
+            objectGNS3Project = nn.buildProject(objectInputFile, strGatewayInterface="eth0", strLayout=args.layout, strSeed="benchmark", dictTimings=dictTimings)[0]
+        except nn.NetworkNarcoticError as err:
+            dictResult["error"] = str(err)
+            return dictResult
+        floatStage = time.perf_counter()
+        nn.writeProject(objectGNS3Project, os.path.join(strDirectory, "output.gns3"), args.compact)
+        nn.recordTiming(dictTimings, "write", floatStage)
+
+        if (dictBest == None or sum(dictTimings.values()) < sum(dictBest.values())):
+            dictBest = dictTimings
+
+    dictResult["nodes"] = len(objectGNS3Project["topology"]["nodes"])
+    dictResult["links"] = len(objectGNS3Project["topology"]["links"])
+    dictResult["total"] = sum(dictBest.values())
+    dictResult["stages"] = dictBest
+    return dictResult
+
+def compareResults(arrayResults, strPrevious, floatTolerance) -> list:
+    with open(strPrevious, "r") as input:
+        dictPrevious = {dictResult["devices"]: dictResult for dictResult in json.load(input)["results"] if "stages" in dictResult}
+
+    arrayRegressions = []
+    for dictResult in arrayResults:
+        dictOld = dictPrevious.get(dictResult["devices"])
+        if (dictOld == None or "stages" not in dictResult):
+            continue
+        for strStage, floatSeconds in dictResult["stages"].items():
+            floatOld = dictOld["stages"].get(strStage)
+            if (floatOld != None and floatSeconds > floatOld * (1 + floatTolerance) + float_NOISE):
+                arrayRegressions.append(f"{dictResult['devices']} devices, {strStage}: {floatOld:.3f}s -> {floatSeconds:.3f}s")
+    return arrayRegressions
+
+parser = argparse.ArgumentParser(description="Times every stage of the engine on generated networks of growing size.")
+parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100, 500, 1000, 5000], help="the amounts of devices to benchmark")
+parser.add_argument("--amount", type=int, default=4, help="the amount of routers in every router cluster")
+parser.add_argument("--switches", type=int, default=0, help="the amount of switches in every connection, 0 connects router clusters directly")
+parser.add_argument("--clustermode", choices=array_CLUSTER_MODES + [str_MIXED], default=str_MIXED, help="the clustermode of every cluster")
+parser.add_argument("--connectionmode", choices=array_CONNECTION_MODES + [str_MIXED], default="parallel", help="the connectionmode of every connection")
+parser.add_argument("--cables", type=int, default=1, help="the amount of cables of every connection")
+parser.add_argument("--layout", choices=nn.array_LAYOUTS, default="cluster", help="the layout engine, the default one becomes very slow past a few hundred devices")
+parser.add_argument("--compact", action="store_true", help="write the .gns3 files without indentation")
+parser.add_argument("--repeat", type=int, default=3, help="the amount of timed repetitions per size, the fastest one is kept")
+parser.add_argument("--json", metavar="FILE", help="save the results to this .json file")
+parser.add_argument("--compare", metavar="FILE", help="compare the results against an earlier .json file and exit with 1 on regressions")
+parser.add_argument("--tolerance", type=float, default=0.25, help="how much slower a stage may become before it's a regression (default 0.25, 25%%)")
+args = parser.parse_args()
+
+arrayStages = ["load", "validate", "switches", "routers", "elements", "connections", "links", "layout", "write"]
+print(f"{'devices':>8} {'links':>8} " + " ".join(f"{strStage:>11}" for strStage in arrayStages) + f" {'total (ms)':>11}")
+arrayResults = []
+with tempfile.TemporaryDirectory() as strDirectory:
+    for intDevices in args.sizes:
+        dictResult = benchmarkSize(intDevices, args, strDirectory)
+        arrayResults.append(dictResult)
+        if ("error" in dictResult):
+            print(f"{dictResult['devices']:>8} {dictResult['error']}")
+            continue
+        print(f"{dictResult['devices']:>8} {dictResult['links']:>8} " + " ".join(f"{dictResult['stages'].get(strStage, 0.0) * 1000:>11.2f}" for strStage in arrayStages) + f" {dictResult['total'] * 1000:>11.2f}")
+
+if (args.json != None):
+    dictParameters = {strOption: getattr(args, strOption) for strOption in ("amount", "switches", "clustermode", "connectionmode", "cables", "layout", "compact", "repeat")}
+    with open(args.json, "w") as output:
+        json.dump({"version": int_RESULTS_VERSION, "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(), "platform": platform.platform(), "parameters": dictParameters, "results": arrayResults}, output, indent=4)
+    print("Saved the results to " + args.json + ".")
+
+if (args.compare != None):
+    arrayRegressions = compareResults(arrayResults, args.compare, args.tolerance)
+    for strRegression in arrayRegressions:
+        print("Regression: " + strRegression)
+    if (arrayRegressions):
+        exit(1)
+    print("No stage became more than " + f"{args.tolerance:.0%}" + " slower than in " + args.compare + ".")
@@ -0,0 +1,41 @@
+import argparse             # Required for argument passing
+import sys                  # Required for importing the NetworkNarcotic engine
+import os                   # Required for importing the NetworkNarcotic engine
+import timeit               # Required for timing both validators
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from nn_schema import getDesiredSchemaTotal, validateInputFast # Required for comparing both validators
+
+"""
+###################################################################################################################
+Benchmarking input file validation.
+
+This script compares the schema library against the compiled fast validator on input files of growing size. Both
+validators must produce the same normalized model, otherwise the benchmark aborts.
+###################################################################################################################
+"""
+def buildInputFile(intClusters) -> dict:
+    arrayConnections = []
+    arrayRouters = []
+    for intCurrent in range(intClusters):
+        arrayConnections.append({"tag": "conn_" + str(intCurrent), "connectionmode": "parallel", "cables": 2, "switches": {"tag": "swit_" + str(intCurrent), "amount": 4, "clustermode": "loop"}})
+        arrayRouters.append({"tag": "rout_" + str(intCurrent), "amount": 3, "clustermode": "line", "connectionshift": 1, "connectedto": ["conn_" + str(intCurrent), "conn_" + str((intCurrent + 1) % intClusters)]})
+
+    return {"input": {"connections": arrayConnections, "routers": arrayRouters}}
+
+parser = argparse.ArgumentParser(description="Compares the schema library against the fast validator.")
+parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000], help="the amounts of router clusters to benchmark")
+parser.add_argument("--repeat", type=int, default=3, help="the amount of timed repetitions per size, the best one is kept")
+args = parser.parse_args()
+
+print(f"{'clusters':>10} {'schema (ms)':>14} {'fast (ms)':>12} {'speedup':>10}")
+objectDesiredSchemaTotal = getDesiredSchemaTotal()
+for intClusters in args.sizes:
+    object_INPUT_FILE = buildInputFile(intClusters)
+    if (validateInputFast(object_INPUT_FILE) != objectDesiredSchemaTotal.validate(object_INPUT_FILE)["input"]):
+        print("Both validators disagree on an input file with " + str(intClusters) + " clusters. Aborting.")
+        exit(1)
+
+    floatSchema = min(timeit.repeat(lambda: objectDesiredSchemaTotal.validate(object_INPUT_FILE), number=1, repeat=args.repeat)) * 1000
+    floatFast = min(timeit.repeat(lambda: validateInputFast(object_INPUT_FILE), number=1, repeat=args.repeat)) * 1000
+    print(f"{intClusters:>10} {floatSchema:>14.2f} {floatFast:>12.2f} {floatSchema / floatFast:>9.1f}x")
@@ -1,34 +1,27 @@
 import argparse             # Required for argument passing
-import yaml                 # Required for reading input files
-import networkx as nx       # Required for drawing topologies
-import numpy as np          # Required for drawing topologies
 import json                 # Required for writing output files
-import copy                 # Required for creating shallow copies in for loops
-from schema import Schema, SchemaError, Optional, And, Or, Regex # Required for reading input files
-from uuid import uuid4      # Required for generating GNS3-compatible randoms
-from collections import deque # Required for shifting connections
-import psutil               # Required for finding which interface on the system has internet access
+from nn_schema import validateInput, InvalidInputError # Required for reading input files
+from nn_layout import computeLayout, EdgeList, LayoutMemo, dict_LAYOUT_ENGINES, int_DEFAULT_SEED, int_MEMO_VERSION # Required for drawing topologies
+from nn_topology import Topology, TopologyPlan, PortLimitError, int_ROUTER, int_SWITCH, int_CLOUD, int_PORT_LIMIT, array_DEVICE_TYPES, tuple_ADAPTERS # Required for building topologies
+from nn_links import defineClusterLinks, defineConnectionLinks, getShiftedPoints, writeLinks # Required for building topologies
+from nn_profile import Profile # Required for profiling builds
+from uuid import uuid4, uuid5, UUID # Required for generating GNS3-compatible randoms
+from array import array     # Required for numbering routers
+from itertools import accumulate # Required for numbering routers
+from collections.abc import Sequence # Required for emitting nodes and links lazily
 import subprocess           # Required for finding which interface on the system has internet access
+import socket               # Required for finding which interface on the system has internet access
+import platform             # Required for finding which interface on the system has internet access
+import os                   # Required for caching which interface on the system has internet access
+import time                 # Required for caching which interface on the system has internet access
+import glob                 # Required for building many input files in parallel
+import io                   # Required for writing .gns3project archives
+import zipfile              # Required for writing .gns3project archives
 
 # DISCLAIMER: the code is currently very messy, repetitive and probably contains many bugs.
 
-"""
-###################################################################################################################
-Setting up argument parsing.
-
-This section allows the user to specify arguments when calling the script from the CLI, such as --help.
-###################################################################################################################
-"""
-parser = argparse.ArgumentParser(
-    prog="nn.py",
-    description="Converts a NetworkNarcotic input file into a .gns3 project file.",
-    epilog="https://github.com/pieter2501/NetworkNarcotic")
-
-parser.add_argument("-n", "--name", default="My NetworkNarcotic generated network", help="the name of this project")
-parser.add_argument("-i", "--input", required=True, help="the input file")
-parser.add_argument("-o", "--output", required=True, help="the output file")
-
-args = parser.parse_args()
+# Heavy modules (yaml, psutil, networkx, numpy and the process pool) are only imported by the stage that needs
+# them, so small networks, networks without a gateway and networks without a layout don't pay for them.
 
 """
 ###################################################################################################################
@@ -41,175 +34,27 @@ str_IMAGE = "c2600-adventerprisek9-mz.124-15.T14.image"
 str_IMAGE_MD5 = "483e3a579a5144ec23f2f160d4b0c0e2"
 str_IMAGE_PLATFORM = "c2600"
 str_IMAGE_DEFAULT_SLOT = "C2600-MB-1E"
-object_INPUT_FILE = None
-object_GNS3_PROJECT = {
-    "name": args.name + " (ID: " + str(uuid4()) + ")",
-    "project_id": str(uuid4()),
-    "revision": 5,
-    "topology": {},
-    "type": "topology",
-    "version": "2.0.0"
-}
-
-"""
-###################################################################################################################
-Defining functions.
-
-- getGatewayInterface():
-  Looks up the first available system interface with internet access.
-
-- addNodeToLink():
-  Adds a node (router or switch) to a link, meaning one of its two endpoints.
-
-- writeClusterLinks():
-  Write out the internal links of a cluster, influenced by the clustermode variable.
-
-- standardizeConnection():
-  Looks up if a connection definition belongs with a certain tag specified in a router cluster's connectedto variable.
-
-- standardizeConnectionMinimal():
-  Looks up if a connection definition belongs with a certain tag specified in a router cluster's connectedto variable without checking existence.
-###################################################################################################################
-"""
-def getGatewayInterface() -> str:
-    dictAddresses = psutil.net_if_addrs()
-    arrayInterfaces = list(dictAddresses.keys())
-
-    for strInterface in arrayInterfaces:
-        strAddress = dictAddresses[strInterface][1].address
-        ping_process = subprocess.Popen(["ping", "-n", "1", "-S", strAddress, "8.8.8.8"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        ping_process.wait()
-        if ping_process.returncode == 0:
-            return strInterface
-    
-    print("You are trying to create a gateway while your own system doesn't seem to have access to the internet. Aborting.")
-    exit()
-
-def addNodeToLink(tupleDesiredLink, objectLinkConstruction, arrayDesiredRouterClusters, arrayDesiredSwitchClusters) -> None:
-    for arrayDesiredRouterCluster in arrayDesiredRouterClusters:
-        for arrayDesiredRouter in arrayDesiredRouterCluster[1]:
-            if (arrayDesiredRouter[0] == tupleDesiredLink[0]):
-                if (arrayDesiredRouter[1] > 16):
-                    print("One of your router clusters exceeds the 16-port limit on one of its devices. Aborting.") # Depends on NM-16ESW's 16 slot limit
-                    exit()
-
-                objectLinkConstruction["nodes"].append({"adapter_number": tupleDesiredLink[1], "port_number": arrayDesiredRouter[1], "node_id": arrayDesiredRouter[0]})
-                arrayDesiredRouter[1] += 1
-                break
-    
-    for arrayDesiredSwitchCluster in arrayDesiredSwitchClusters:
-        for arrayDesiredSwitch in arrayDesiredSwitchCluster[1]:
-            if (arrayDesiredSwitch[0] == tupleDesiredLink[0]):
-                if (arrayDesiredSwitch[1] > 16):
-                    print("One of your switch clusters exceeds the 16-port limit on one of its devices. Aborting.") # Arbitrarily set to 16 to equal routers
-                    exit()
-
-                objectLinkConstruction["nodes"].append({"adapter_number": tupleDesiredLink[1], "port_number": arrayDesiredSwitch[1], "node_id": arrayDesiredSwitch[0]})
-                arrayDesiredSwitch[1] += 1
-                break
-
-def writeClusterLinks(arrayDesiredLinks, objectGNS3LinkScaffold, arrayDesiredRouterClusters, arrayDesiredSwitchClusters, objectTemporaryGNS3Topology) -> None:
-    for tupleDesiredLink in arrayDesiredLinks:
-        objectLinkConstruction = copy.deepcopy(objectGNS3LinkScaffold)
-        objectLinkConstruction["link_id"] = str(uuid4())
-        addNodeToLink(tupleDesiredLink[0], objectLinkConstruction, arrayDesiredRouterClusters, arrayDesiredSwitchClusters)
-        addNodeToLink(tupleDesiredLink[1], objectLinkConstruction, arrayDesiredRouterClusters, arrayDesiredSwitchClusters)
-        objectTemporaryGNS3Topology["links"].append(objectLinkConstruction)
-
-def standardizeConnection(connection, objectConnections, objectRouterCluster) -> dict:
-    returnValue = connection
-
-    booleanFoundConnection = False
-    for objectConnection in objectConnections:
-        if (objectConnection["tag"] == connection):
-            returnValue = objectConnection
-            booleanFoundConnection = True
-            break
-    if (booleanFoundConnection == False):
-        print("Router cluster with tag '" + objectRouterCluster["tag"] + "' is referring to a non-existent connection. Aborting.")
-        exit()
-
-    return returnValue
-
-def standardizeConnectionMinimal(connection, objectConnections) -> dict:
-    returnValue = connection
-
-    for objectConnection in objectConnections:
-        if (objectConnection["tag"] == connection):
-            returnValue = objectConnection
-            break
-
-    return returnValue
-
-"""
-###################################################################################################################
-Setting up input file parsing.
-
-This section checks whether or not the input .yml file is correctly formatted.
-###################################################################################################################
-"""
-with open(args.input, "r") as stream:
-    try:
-        object_INPUT_FILE = yaml.safe_load(stream)
-    except yaml.YAMLError as err:
-        print("Invalid .yml file. There is a syntax error.")
-        exit()
-
-objectDesiredSchemaBase = Schema({
-    "tag": str,    
-    Optional("cables", default=1): And(int, lambda value: 1 <= value <= 3)
-    #Optional("ipclass", default="A"): Or("A", "B", "C"),
-    #Optional("ipsummary", default="auto"): Or("auto", Regex("^(?:\d{1,3}\.){3}\d{1,3}\/(?:[1-9]|[1-2][0-9]|3[0-2])$"))
-})
-
-objectDesiredSchemaSwitchCluster = Schema({**objectDesiredSchemaBase.schema, **Schema({
-    Optional("amount", default=1): And(int, lambda value: 1 <= value <= 255),
-    Optional("clustermode", default="full"): Or("full", "loop", "line", "hubspoke"),
-    Optional("connectionshift", default=0): And(int, lambda value: 1 <= value <= 255)
-}).schema})
-
-objectDesiredSchemaConnection = Schema({**objectDesiredSchemaBase.schema, **Schema({
-    Optional("connectionmode", default="single"): Or("single", "full", "parallel"),
-    Optional("shiftable", default=True): bool,
-    Optional("switches", default=None): objectDesiredSchemaSwitchCluster
-}).schema})
-
-objectDesiredSchemaRouterCluster = Schema({**objectDesiredSchemaSwitchCluster.schema, **Schema({
-    Optional("routing", default="static"): Or("static"),
-    Optional("gateway", default=False): bool,
-    Optional("connectedto", default=None): [Or(str, objectDesiredSchemaConnection)]
-}).schema})
-
-objectDesiredSchemaTotal = Schema({
-    "input": {
-        "routers": [objectDesiredSchemaRouterCluster],
-        Optional("connections", default=None): [objectDesiredSchemaConnection]
-    }
-})
-
-try:
-    objectDesiredSchemaTotal.validate(object_INPUT_FILE)
-    print("Input file is valid! Moving on.")
-except SchemaError as err:
-    print("Invalid input file. Did you follow the schema correctly? Check the following:\n\n" + str(err))
-    exit()
+str_GATEWAY_PROBE_TARGET = "8.8.8.8"
+str_CACHE_DIRECTORY = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "networknarcotic")
+str_GATEWAY_CACHE = os.path.join(str_CACHE_DIRECTORY, "gateway.json")
+str_BUILD_CACHE_DIRECTORY = os.path.join(str_CACHE_DIRECTORY, "builds")
+str_DEFAULT_NAME = "My NetworkNarcotic generated network"
+str_DEFAULT_LAYOUT = "fruchterman-reingold"
+uuid_NAMESPACE = UUID("3a024bd1-1178-4e20-8a87-ebbb6b633b77") # Every seeded identifier derives from this namespace
+float_WATCH_INTERVAL = 0.1  # Seconds between checking whether the input file changed in watch mode
+float_WATCH_DEBOUNCE = 0.2  # Seconds the input file must stay unchanged before it's rebuilt, editors often save in several steps
+int_STREAM_DEPTH = 3 # The project, its topology and the lists in it are written piece by piece, anything deeper at once
+array_LAYOUTS = list(dict_LAYOUT_ENGINES)
 
 """
 ###################################################################################################################
-Building the topology in-memory.
+Defining the GNS3 scaffolds.
 
-This is where the input file actually gets translated into a network design using the NetworkNarcotic algorithm.
+This section specifies the GNS3 objects every node and link in a .gns3 project file is created from. They're shared
+by all nodes and links and must never be modified: a node or link only stores what sets it apart, and is merged with
+its scaffold when it's emitted.
 ###################################################################################################################
 """
-objectRouterClusters = objectDesiredSchemaTotal.validate(object_INPUT_FILE).get("input").get("routers")
-objectSwitchClusters = []
-objectConnections = objectDesiredSchemaTotal.validate(object_INPUT_FILE).get("input").get("connections")
-objectTemporaryGNS3Topology = {
-    "computes": [],
-    "drawings": [],
-    "links": [],
-    "nodes": []
-}
 objectGNS3RouterNodeScaffold = {
     "compute_id": "local",
     "name": None,
@@ -239,15 +84,15 @@ objectGNS3CloudNodeScaffold = {
     "properties": {
         "interfaces": [
             {
-                "name": getGatewayInterface(),
+                "name": None,
                 "special": True,
                 "type": "ethernet"
             },
         ],
         "ports_mapping": [
             {
-                "interface": getGatewayInterface(),
-                "name": getGatewayInterface(),
+                "interface": None,
+                "name": None,
                 "port_number": 0,
                 "type": "ethernet"
             }
@@ -378,475 +223,1036 @@ objectGNS3LinkScaffold = {
     "nodes": [],
     "suspend": False
 }
+tuple_SCAFFOLDS = (objectGNS3RouterNodeScaffold, objectGNS3SwitchNodeScaffold, objectGNS3CloudNodeScaffold) # Indexed by device type
+
+"""
+###################################################################################################################
+Defining functions.
+
+- pingProbe():
+  Checks whether a system interface has internet access by pinging from its address. Default prober of getGatewayInterface().
+
+- readGatewayCache():
+  Reads a previously detected gateway interface from disk, as long as it hasn't expired.
+
+- writeGatewayCache():
+  Writes a detected gateway interface to disk.
+
+- getGatewayInterface():
+  Looks up the first available system interface with internet access, probing all interfaces concurrently.
+
+- loadInputFile():
+  Reads an input .yml file into a dictionary.
+
+- recordTiming():
+  Adds the time since the start of a stage to its timing, when timings are being recorded, and starts the next stage.
+
+- readProjectLayout():
+  Reads the coordinates of every node in an existing .gns3 file or .gns3project archive, keyed by node name.
+
+- getBuildCachePath():
+  Returns where the build cache of an output file is kept: every output file has its own.
+
+- readBuildCache():
+  Reads the layouts remembered by the previous build of an output file, or an empty memo when there are none or the
+  file isn't a build cache.
+
+- writeBuildCache():
+  Writes the most recently used layouts to disk, for the next build of the same output file. The file is a line of
+  JSON with the key and length of every layout, followed by the coordinates of all of them as raw float64 values, so
+  reading it back never runs anything.
+
+- GNS3Items:
+  A list of nodes or links that only emits complete GNS3 objects when it's read.
+
+- GNS3Emitter:
+  Turns the devices and links of a topology into GNS3 nodes and links. node_ids and link_ids are only assigned here:
+  every project draws two random numbers and the identifiers of its devices and links are derived from them, or, when
+  seeded, they're derived with uuid5 from the seed, the project name and the name of the device (or the devices and
+  ports on both ends of the link). Routers get a dynamips_id counting up from 1, and refer to their startup-config
+  once those are rendered.
+
+- GNS3Emitter.emitNode(), GNS3Emitter.emitLink():
+  Emits a device as a GNS3 node that shares every unchanged part with its scaffold, or a link as a GNS3 link.
+
+- indexConnections():
+  Indexes the connection definitions by their tag.
 
-# Collect switch clusters
-if (objectConnections is not None):
-    for objectConnection in objectConnections:
-        if (objectConnection["switches"] != None):
-            objectSwitchClusters.append(objectConnection["switches"])
-
-# Handle switch clusters
-arrayDesiredSwitchClusters = [] # Holds per cluster tag an array of arrays, the latter containing a node_id and currently available port number
-for objectSwitchCluster in objectSwitchClusters:
-    for intCurrent in range(objectSwitchCluster["amount"]):
-        # For each switch cluster, mutiplied by the "amount" in that cluster, create a switch
-        objectSwitchNodeConstruction = copy.deepcopy(objectGNS3SwitchNodeScaffold)
-        objectSwitchNodeConstruction["name"] = objectSwitchCluster["tag"] + "-id" + str(intCurrent + 1)
-        objectSwitchNodeConstruction["node_id"] = str(uuid4())
-
-        # Add the switch router to the topology
-        booleanSwitchClusterIsKnown = False
-        for arrayDesiredSwitchCluster in arrayDesiredSwitchClusters:
-            if (arrayDesiredSwitchCluster[0] == objectSwitchCluster["tag"]):
-                booleanSwitchClusterIsKnown = True
+- standardizeConnection():
+  Looks up if a connection definition belongs with a certain tag specified in a router cluster's connectedto variable.
+
+- standardizeConnectionMinimal():
+  Looks up if a connection definition belongs with a certain tag specified in a router cluster's connectedto variable without checking existence.
+###################################################################################################################
+"""
+class NetworkNarcoticError(Exception):
+    pass # Raised whenever an input file can't be turned into a network; its message is meant for the user
+
+def pingProbe(strInterface, strAddress, floatTimeout) -> bool:
+    match platform.system():
+        case "Windows":
+            arrayCommand = ["ping", "-n", "1", "-w", str(int(floatTimeout * 1000)), "-S", strAddress, str_GATEWAY_PROBE_TARGET]
+        case "Darwin":
+            arrayCommand = ["ping", "-c", "1", "-t", str(max(1, round(floatTimeout))), "-S", strAddress, str_GATEWAY_PROBE_TARGET]
+        case _:
+            arrayCommand = ["ping", "-c", "1", "-W", str(max(1, round(floatTimeout))), "-I", strAddress, str_GATEWAY_PROBE_TARGET]
+
+    try:
+        return subprocess.run(arrayCommand, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=floatTimeout + 1).returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+
+def readGatewayCache(strCachePath, intCacheTTL) -> str:
+    if (intCacheTTL <= 0):
+        return None
+
+    try:
+        with open(strCachePath, "r") as stream:
+            objectCache = json.load(stream)
+        if (time.time() - objectCache["timestamp"] < intCacheTTL):
+            return objectCache["interface"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    return None
+
+def writeGatewayCache(strCachePath, strInterface) -> None:
+    try:
+        os.makedirs(os.path.dirname(strCachePath), exist_ok=True)
+        with open(strCachePath, "w") as stream:
+            json.dump({"interface": strInterface, "timestamp": time.time()}, stream)
+    except OSError:
+        pass # Caching is a courtesy, failing to write it shouldn't stop the build
+
+def getGatewayInterface(functionProbe=pingProbe, floatTimeout=1.0, intCacheTTL=3600, strCachePath=str_GATEWAY_CACHE) -> str:
+    import psutil # Required for finding which interface on the system has internet access
+    from concurrent.futures import ThreadPoolExecutor # Required for probing system interfaces concurrently
+
+    dictAddresses = psutil.net_if_addrs()
+
+    strCachedInterface = readGatewayCache(strCachePath, intCacheTTL)
+    if (strCachedInterface in dictAddresses):
+        return strCachedInterface
+
+    arrayCandidates = [] # Holds per interface a tuple containing its name and IPv4 address
+    for strInterface in dictAddresses:
+        for objectAddress in dictAddresses[strInterface]:
+            if (objectAddress.family == socket.AF_INET):
+                arrayCandidates.append((strInterface, objectAddress.address))
                 break
-        
-        if (booleanSwitchClusterIsKnown == False):
-            arrayDesiredSwitchClusters.append([objectSwitchCluster["tag"], [[objectSwitchNodeConstruction["node_id"], 0]]])
+
+    if (len(arrayCandidates) > 0):
+        with ThreadPoolExecutor(max_workers=len(arrayCandidates)) as executor:
+            arrayResults = list(executor.map(lambda tupleCandidate: functionProbe(tupleCandidate[0], tupleCandidate[1], floatTimeout), arrayCandidates))
+
+        for tupleCandidate, booleanResult in zip(arrayCandidates, arrayResults):
+            if (booleanResult == True):
+                writeGatewayCache(strCachePath, tupleCandidate[0])
+                return tupleCandidate[0]
+    
+    raise NetworkNarcoticError("You are trying to create a gateway while your own system doesn't seem to have access to the internet. Aborting.")
+
+class GNS3Items(Sequence):
+    def __init__(self, functionEmit, arrayRecords):
+        self.functionEmit = functionEmit
+        self.arrayRecords = arrayRecords
+
+    def __len__(self) -> int:
+        return len(self.arrayRecords)
+
+    def __getitem__(self, index):
+        if (isinstance(index, slice)):
+            return [self.functionEmit(record) for record in self.arrayRecords[index]]
+        return self.functionEmit(self.arrayRecords[index])
+
+    def __iter__(self):
+        return map(self.functionEmit, self.arrayRecords)
+
+class GNS3Emitter:
+    __slots__ = ("objectTopology", "strGatewayInterface", "uuidNamespace", "intNodeBase", "intLinkBase", "arrayDynamipsIds", "strStartupConfig")
+
+    def __init__(self, objectTopology, strGatewayInterface, uuidNamespace=None):
+        self.objectTopology = objectTopology
+        self.strGatewayInterface = strGatewayInterface
+        self.uuidNamespace = uuidNamespace
+        self.intNodeBase = uuid4().int
+        self.intLinkBase = uuid4().int
+        self.arrayDynamipsIds = array("I", accumulate(intType == int_ROUTER for intType in objectTopology.arrayDeviceTypes)) # Routers are numbered from 1
+        self.strStartupConfig = None # Where every router finds its startup-config, formatted with its dynamips_id, once they're rendered
+
+    def getNodeId(self, intDevice) -> str:
+        if (self.uuidNamespace != None):
+            return str(uuid5(self.uuidNamespace, "node/" + self.objectTopology.getDeviceName(intDevice)))
+
+        # A random UUID stays a valid random UUID when its lowest 62 bits change, so devices and links simply flip those
+        strHex = "%032x" % (self.intNodeBase ^ intDevice)
+        return strHex[:8] + "-" + strHex[8:12] + "-" + strHex[12:16] + "-" + strHex[16:20] + "-" + strHex[20:]
+
+    def getLinkId(self, intLink) -> str:
+        if (self.uuidNamespace != None):
+            # A link is identified by the device and port on both of its ends
+            objectTopology = self.objectTopology
+            return str(uuid5(self.uuidNamespace, "link/" + objectTopology.getDeviceName(objectTopology.arrayLinkStarts[intLink]) + ":" + str(objectTopology.arrayLinkStartPorts[intLink]) + "/" + objectTopology.getDeviceName(objectTopology.arrayLinkEnds[intLink]) + ":" + str(objectTopology.arrayLinkEndPorts[intLink])))
+
+        strHex = "%032x" % (self.intLinkBase ^ intLink)
+        return strHex[:8] + "-" + strHex[8:12] + "-" + strHex[12:16] + "-" + strHex[16:20] + "-" + strHex[20:]
+
+    def emitNode(self, intDevice) -> dict:
+        objectTopology = self.objectTopology
+        intType = objectTopology.arrayDeviceTypes[intDevice]
+        objectScaffold = tuple_SCAFFOLDS[intType]
+        objectNode = {**objectScaffold, "name": objectTopology.getDeviceName(intDevice), "node_id": self.getNodeId(intDevice), "x": objectTopology.arrayX[intDevice], "y": objectTopology.arrayY[intDevice]}
+        if (intType == int_ROUTER):
+            objectNode["properties"] = {**objectScaffold["properties"], "dynamips_id": self.arrayDynamipsIds[intDevice]}
+            if (self.strStartupConfig != None):
+                objectNode["properties"]["startup_config"] = self.strStartupConfig.format(self.arrayDynamipsIds[intDevice])
+        elif (intType == int_CLOUD):
+            objectNode["properties"] = {
+                **objectScaffold["properties"],
+                "interfaces": [{**objectScaffold["properties"]["interfaces"][0], "name": self.strGatewayInterface}],
+                "ports_mapping": [{**objectScaffold["properties"]["ports_mapping"][0], "interface": self.strGatewayInterface, "name": self.strGatewayInterface}]
+            }
+        return objectNode
+
+    def emitLink(self, intLink) -> dict:
+        objectTopology = self.objectTopology
+        intStart = objectTopology.arrayLinkStarts[intLink]
+        intEnd = objectTopology.arrayLinkEnds[intLink]
+        return {**objectGNS3LinkScaffold, "link_id": self.getLinkId(intLink), "nodes": [
+            {"adapter_number": tuple_ADAPTERS[objectTopology.arrayDeviceTypes[intStart]], "port_number": objectTopology.arrayLinkStartPorts[intLink], "node_id": self.getNodeId(intStart)},
+            {"adapter_number": tuple_ADAPTERS[objectTopology.arrayDeviceTypes[intEnd]], "port_number": objectTopology.arrayLinkEndPorts[intLink], "node_id": self.getNodeId(intEnd)}
+        ]}
+
+def indexConnections(objectConnections) -> dict:
+    dictConnections = {}
+    if (objectConnections is not None):
+        for objectConnection in objectConnections:
+            dictConnections[objectConnection["tag"]] = objectConnection # Tags are unique, validateInput() makes sure of that
+    
+    return dictConnections
+
+def standardizeConnection(connection, dictConnections, objectRouterCluster) -> dict:
+    returnValue = standardizeConnectionMinimal(connection, dictConnections)
+
+    if (returnValue is connection):
+        raise NetworkNarcoticError("Router cluster with tag '" + objectRouterCluster["tag"] + "' is referring to a non-existent connection. Aborting.")
+
+    return returnValue
+
+def standardizeConnectionMinimal(connection, dictConnections) -> dict:
+    returnValue = connection
+
+    if (isinstance(connection, str) and connection in dictConnections):
+        returnValue = dictConnections[connection]
+
+    return returnValue
+
+def loadInputFile(strInput) -> dict:
+    import yaml # Required for reading input files
+
+    with open(strInput, "r") as stream:
+        try:
+            return yaml.load(stream, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)) # libyaml is a lot faster, when it's available
+        except yaml.YAMLError as err:
+            raise NetworkNarcoticError("Invalid .yml file. There is a syntax error.")
+
+def recordTiming(dictTimings, strStage, floatStart) -> float:
+    floatNow = time.perf_counter()
+    if (dictTimings != None):
+        dictTimings[strStage] = dictTimings.get(strStage, 0.0) + floatNow - floatStart
+    return floatNow
+
+def readProjectLayout(strProject) -> dict:
+    try:
+        if (zipfile.is_zipfile(strProject)):
+            with zipfile.ZipFile(strProject) as archive:
+                objectNodes = json.loads(archive.read("project.gns3"))["topology"]["nodes"]
         else:
-            for arrayDesiredSwitchCluster in arrayDesiredSwitchClusters:
-                if (arrayDesiredSwitchCluster[0] == objectSwitchCluster["tag"]):
-                    arrayDesiredSwitchCluster[1].append([objectSwitchNodeConstruction["node_id"], 0])
-
-        objectTemporaryGNS3Topology["nodes"].append(objectSwitchNodeConstruction)
-       
-    # Do the magic
-    if (objectSwitchCluster["amount"] > 1):
-        # For each switch cluster, apply cables in case necessary
-        match objectSwitchCluster["clustermode"]:
-            case "full":
-                # Define the links
-                arrayDesiredLinks = []
-                for arrayDesiredSwitchCluster in arrayDesiredSwitchClusters:
-                    if (arrayDesiredSwitchCluster[0] == objectSwitchCluster["tag"]):
-                        for arrayDesiredSwitchSTART in arrayDesiredSwitchCluster[1]:
-                            for arrayDesiredSwitchEND in arrayDesiredSwitchCluster[1]:
-                                if (arrayDesiredSwitchSTART[0] != arrayDesiredSwitchEND[0]):
-                                    if (not ((arrayDesiredSwitchEND[0], 0), (arrayDesiredSwitchSTART[0], 0)) in arrayDesiredLinks):
-                                        for intCurrent in range (objectSwitchCluster["cables"]):
-                                            arrayDesiredLinks.append(((arrayDesiredSwitchSTART[0], 0), (arrayDesiredSwitchEND[0], 0)))
-                        break
-
-                # Write the links
-                writeClusterLinks(arrayDesiredLinks, objectGNS3LinkScaffold, [], arrayDesiredSwitchClusters, objectTemporaryGNS3Topology)
-            case "loop":
-                # Define the links
-                arrayDesiredLinks = []
-                stringEndPoint = arrayDesiredSwitchCluster[1]
-                intCounter = 0
-                for arrayDesiredSwitchCluster in arrayDesiredSwitchClusters:
-                    if (arrayDesiredSwitchCluster[0] == objectSwitchCluster["tag"]):
-                        for stringNode in arrayDesiredSwitchCluster[1]:
-                            if (intCounter != len(arrayDesiredSwitchCluster[1])):
-                                for intCurrent in range (objectSwitchCluster["cables"]):
-                                    arrayDesiredLinks.append(((stringNode[0], 0), (arrayDesiredSwitchCluster[1][(intCounter + 1) % len(arrayDesiredSwitchCluster[1])][0], 0)))
-                                intCounter += 1
-                        break
-                
-                # Write the links
-                writeClusterLinks(arrayDesiredLinks, objectGNS3LinkScaffold, [], arrayDesiredSwitchClusters, objectTemporaryGNS3Topology)
-            case "line":
-                # Define the links
-                arrayDesiredLinks = []
-                stringEndPoint = arrayDesiredSwitchCluster[1]
-                intCounter = 0
-                for arrayDesiredSwitchCluster in arrayDesiredSwitchClusters:
-                    if (arrayDesiredSwitchCluster[0] == objectSwitchCluster["tag"]):
-                        for stringNode in arrayDesiredSwitchCluster[1]:
-                            if (intCounter != len(arrayDesiredSwitchCluster[1]) -1): # Notice the -1; the "cut" in the loop
-                                for intCurrent in range (objectSwitchCluster["cables"]):
-                                    arrayDesiredLinks.append(((stringNode[0], 0), (arrayDesiredSwitchCluster[1][(intCounter + 1) % len(arrayDesiredSwitchCluster[1])][0], 0)))
-                                intCounter += 1
-                        break
-
-                # Write the links
-                writeClusterLinks(arrayDesiredLinks, objectGNS3LinkScaffold, [], arrayDesiredSwitchClusters, objectTemporaryGNS3Topology)
-            case "hubspoke":
-                # Define the links
-                arrayDesiredLinks = []
-                for arrayDesiredSwitchCluster in arrayDesiredSwitchClusters:
-                    if (arrayDesiredSwitchCluster[0] == objectSwitchCluster["tag"]):
-                        stringHubNode = arrayDesiredSwitchCluster[1][0][0]
-                        for stringNode in arrayDesiredSwitchCluster[1]:
-                            if (stringNode[0] != stringHubNode):
-                                for intCurrent in range (objectSwitchCluster["cables"]):
-                                    arrayDesiredLinks.append(((stringHubNode, 0), (stringNode[0], 0)))
-                        break
-
-                # Write the links
-                writeClusterLinks(arrayDesiredLinks, objectGNS3LinkScaffold, [], arrayDesiredSwitchClusters, objectTemporaryGNS3Topology)
-
-# Handle router clusters
-arrayDesiredRouterClusters = [] # Holds per cluster tag an array of arrays, the latter containing a node_id and currently available port number
-for objectRouterCluster in objectRouterClusters:
-    for intCurrent in range(objectRouterCluster["amount"]):
-        # For each router cluster, mutiplied by the "amount" in that cluster, create a router
-        objectRouterNodePropertiesConstruction = copy.deepcopy(objectGNS3RouterNodeScaffold["properties"])
-        objectRouterNodePropertiesConstruction["dynamips_id"] = uuid4().int
-        objectRouterNodeConstruction = copy.deepcopy(objectGNS3RouterNodeScaffold)
-        objectRouterNodeConstruction["properties"] = objectRouterNodePropertiesConstruction
-        objectRouterNodeConstruction["name"] = objectRouterCluster["tag"] + "-id" + str(intCurrent + 1)
-        objectRouterNodeConstruction["node_id"] = str(uuid4())
-        objectRouterNodeConstruction["x"] = 0
-        objectRouterNodeConstruction["y"] = 0
-
-        # Add the created router to the topology
-        booleanRouterClusterIsKnown = False
-        for arrayDesiredRouterCluster in arrayDesiredRouterClusters:
-            if (arrayDesiredRouterCluster[0] == objectRouterCluster["tag"]):
-                booleanRouterClusterIsKnown = True
-                break
-        
-        if (booleanRouterClusterIsKnown == False):
-            arrayDesiredRouterClusters.append([objectRouterCluster["tag"], [[objectRouterNodeConstruction["node_id"], 0]]])
+            with open(strProject, "r") as stream:
+                objectNodes = json.load(stream)["topology"]["nodes"]
+        return {objectNode["name"]: (objectNode["x"], objectNode["y"]) for objectNode in objectNodes}
+    except (OSError, ValueError, KeyError, TypeError, zipfile.BadZipFile) as err:
+        raise NetworkNarcoticError("Can't reuse the layout of '" + strProject + "', it isn't a readable .gns3 file or .gns3project archive. Aborting.")
+
+def getBuildCachePath(strOutput, strCacheDirectory=str_BUILD_CACHE_DIRECTORY) -> str:
+    import hashlib # Required for caching builds
+
+    return os.path.join(strCacheDirectory, hashlib.sha256(os.path.abspath(strOutput).encode()).hexdigest()[:32] + ".layouts")
+
+def readBuildCache(strCachePath) -> LayoutMemo:
+    import sys # Required for caching builds
+
+    try:
+        with open(strCachePath, "rb") as stream:
+            objectHeader = json.loads(stream.readline())
+            if (objectHeader["version"] != int_MEMO_VERSION):
+                return LayoutMemo()
+            dictLayouts = {}
+            for strKey, intLength in objectHeader["layouts"]:
+                arrayCoordinates = array("d")
+                arrayCoordinates.frombytes(stream.read(intLength * arrayCoordinates.itemsize))
+                if (not isinstance(strKey, str) or len(arrayCoordinates) != intLength):
+                    return LayoutMemo() # Cut short or tampered with
+                if (sys.byteorder != "little"):
+                    arrayCoordinates.byteswap()
+                dictLayouts[strKey] = arrayCoordinates
+        return LayoutMemo(dictLayouts)
+    except (OSError, ValueError, KeyError, TypeError):
+        return LayoutMemo()
+
+def writeBuildCache(strCachePath, objectMemo) -> None:
+    import sys # Required for caching builds
+
+    dictLayouts = objectMemo.getRecentEntries()
+    strTemporary = strCachePath + "." + uuid4().hex[:8] + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(strCachePath), exist_ok=True)
+        with open(strTemporary, "wb") as stream:
+            stream.write(json.dumps({"version": int_MEMO_VERSION, "layouts": [[strKey, len(arrayCoordinates)] for strKey, arrayCoordinates in dictLayouts.items()]}).encode() + b"\n")
+            for arrayCoordinates in dictLayouts.values():
+                if (sys.byteorder != "little"):
+                    arrayCoordinates = array("d", arrayCoordinates)
+                    arrayCoordinates.byteswap() # Coordinates are always stored little-endian
+                stream.write(arrayCoordinates.tobytes())
+        os.replace(strTemporary, strCachePath)
+    except OSError:
+        pass # Caching is a courtesy, failing to write it shouldn't stop the build
+    finally:
+        if (os.path.exists(strTemporary)):
+            os.remove(strTemporary)
+
+"""
+###################################################################################################################
+Building the topology in-memory.
+
+This is where the input file actually gets translated into a network design using the NetworkNarcotic algorithm.
+buildTopology() takes the contents of an input file and returns a .gns3 project, both as dictionaries, without
+touching the filesystem, so it can be called from other Python code as often as needed. Given a LayoutMemo, it only
+computes layouts it hasn't computed before for the exact same devices, links and options, so an unchanged network is
+identical to a clean build. After an edit, the cluster engine only places the clusters again, which is still identical
+to a clean build, and the force-directed engines keep the coordinates of every unchanged cluster and only lay out the
+others around them. Given a dictionary of timings, it records how many seconds
+every stage took; given a Profile, also its memory and how much work it did.
+
+- fillTopology():
+  Creates the clusters, devices and links of a validated input file in a topology, stage by stage.
+
+- buildProject():
+  Validates an input file, fills a topology with it, lays it out and returns it as a .gns3 project whose nodes and
+  links are only emitted when they're written, together with the GNS3Emitter behind it, so other formats, addresses
+  and startup-configs can be made from the same topology.
+
+- buildTopology():
+  Returns the .gns3 project of buildProject() with its nodes and links as plain lists, ready for json.dumps().
+###################################################################################################################
+"""
+def fillTopology(objectTopology, objectInput, dictTimings=None) -> None:
+    floatStage = time.perf_counter()
+    objectRouterClusters = objectInput["routers"]
+    objectSwitchClusters = []
+    objectConnections = objectInput["connections"]
+    objectProfile = Profile.getProfile(dictTimings)
+
+    # Collect switch clusters
+    if (objectConnections is not None):
+        for objectConnection in objectConnections:
+            if (objectConnection["switches"] != None):
+                objectSwitchClusters.append(objectConnection["switches"])
+
+    # Handle switch clusters
+    dictSwitchClusterEntries = {} # Holds per cluster tag the switch clusters in the input file with that tag
+    for objectSwitchCluster in objectSwitchClusters:
+        dictSwitchClusterEntries.setdefault(objectSwitchCluster["tag"], []).append(objectSwitchCluster)
+        objectCluster = objectTopology.getCluster(int_SWITCH, objectSwitchCluster["tag"])
+        for intCurrent in range(objectSwitchCluster["amount"]):
+            # For each switch cluster, mutiplied by the "amount" in that cluster, create a switch
+            objectTopology.addDevice(objectCluster, intCurrent + 1)
+
+        # Do the magic
+        if (objectSwitchCluster["amount"] > 1):
+            # For each switch cluster, apply cables in case necessary
+            objectTopology.addLinkGroup("switch", objectSwitchCluster)
+            writeLinks(objectTopology, defineClusterLinks(objectCluster.arrayDevices, objectSwitchCluster["clustermode"], objectSwitchCluster["cables"]))
+
+    floatStage = recordTiming(dictTimings, "switches", floatStage)
+
+    # Handle router clusters
+    dictRouterClusterEntries = {} # Holds per cluster tag the router clusters in the input file with that tag
+    for objectRouterCluster in objectRouterClusters:
+        dictRouterClusterEntries.setdefault(objectRouterCluster["tag"], []).append(objectRouterCluster)
+        objectCluster = objectTopology.getCluster(int_ROUTER, objectRouterCluster["tag"])
+        for intCurrent in range(objectRouterCluster["amount"]):
+            # For each router cluster, mutiplied by the "amount" in that cluster, create a router
+            objectTopology.addDevice(objectCluster, intCurrent + 1)
+
+        # Handle gateways
+        if (objectRouterCluster["gateway"] == True):
+            # Create the cloud
+            intCloudDevice = objectTopology.addDevice(objectCluster, 0, int_CLOUD)
+
+            # Create the link
+            objectTopology.addLink(intCloudDevice, objectCluster.arrayDevices[0])
+
+        # Do the magic
+        if (objectRouterCluster["amount"] > 1):
+            # For each router cluster, apply cables in case necessary
+            objectTopology.addLinkGroup("router", objectRouterCluster)
+            writeLinks(objectTopology, defineClusterLinks(objectCluster.arrayDevices, objectRouterCluster["clustermode"], objectRouterCluster["cables"]))
+
+    floatStage = recordTiming(dictTimings, "routers", floatStage)
+
+    # Find connection elements
+    dictConnections = indexConnections(objectConnections)
+    dictConnectionElements = {} # Holds per connection tag the involved router cluster tags, in router cluster order
+    for objectRouterCluster in objectRouterClusters:
+        if (objectRouterCluster["connectedto"] != None):
+            setClusterConnections = set()
+            for connection in objectRouterCluster["connectedto"]:
+                objectDesiredConnection = standardizeConnection(connection, dictConnections, objectRouterCluster)
+
+                # Check if the connection tag hasn't been seen before in this router cluster
+                if (objectDesiredConnection["tag"] in setClusterConnections):
+                    raise NetworkNarcoticError("Router cluster with tag " + objectRouterCluster["tag"] + " is referring to the same connection more than once. Aborting.")
+                setClusterConnections.add(objectDesiredConnection["tag"])
+
+                # Register this router cluster with the connection; dict keys keep the order in which clusters were seen
+                dictConnectionElements.setdefault(objectDesiredConnection["tag"], {})[objectRouterCluster["tag"]] = None
+
+    arrayConnectionElements = [[stringConnectionTag, list(dictInvolvedRouterClusters)] for stringConnectionTag, dictInvolvedRouterClusters in dictConnectionElements.items()] # Holds per connection tag an array of involved router clusters
+
+    # Check for presence of switch cluster in case necessary, before any connection is cabled
+    for arrayConnectionElement in arrayConnectionElements:
+        if (len(arrayConnectionElement[1]) > 2 and standardizeConnectionMinimal(arrayConnectionElement[0], dictConnections)["switches"] == None):
+            raise NetworkNarcoticError("Hooking more than two router clusters to a connection (" + arrayConnectionElement[0] + ") requires a switch cluster. Aborting.")
+
+    floatStage = recordTiming(dictTimings, "elements", floatStage)
+
+    # Define and apply connections, one connection at a time so only the links of one connection are ever pending
+    for arrayConnectionElement in arrayConnectionElements:
+        objectDesiredConnection = standardizeConnectionMinimal(arrayConnectionElement[0], dictConnections)
+        objectInvolvedSwitchCluster = None
+
+        if (objectDesiredConnection["switches"] != None):
+            objectInvolvedSwitchCluster = objectTopology.dictClusters.get((int_SWITCH, objectDesiredConnection["switches"]["tag"]))
+
+        # Shift the involved clusters, in the order they were created in
+        arrayRouterPoints = [] # Holds per router cluster in the input file a tuple containing its tag and its shifted devices
+        for objectCluster in sorted((objectTopology.dictClusters[(int_ROUTER, stringRouterTag)] for stringRouterTag in arrayConnectionElement[1]), key=lambda objectCluster: objectCluster.intId):
+            for arrayShifted in getShiftedPoints(objectCluster.arrayDevices, dictRouterClusterEntries[objectCluster.strTag], objectDesiredConnection["shiftable"]):
+                arrayRouterPoints.append((objectCluster.strTag, arrayShifted))
+
+        arraySwitchPoints = [] # Holds per switch cluster in the input file with the involved tag its shifted devices
+        if (objectInvolvedSwitchCluster != None):
+            for objectSwitchCluster in dictSwitchClusterEntries[objectInvolvedSwitchCluster.strTag]:
+                arraySwitchPoints += getShiftedPoints(objectInvolvedSwitchCluster.arrayDevices, [objectSwitchCluster], objectDesiredConnection["shiftable"])
+
+        floatStage = recordTiming(dictTimings, "connections", floatStage)
+
+        # Do the magic, every link gets its ports as soon as it's generated
+        objectTopology.addLinkGroup("connection", objectDesiredConnection)
+        intLinks = writeLinks(objectTopology, defineConnectionLinks(objectDesiredConnection["connectionmode"], arrayRouterPoints, arraySwitchPoints, arrayConnectionElement[1], objectDesiredConnection["cables"], objectProfile))
+        if (objectProfile != None):
+            objectProfile.count("desired links", intLinks)
+        floatStage = recordTiming(dictTimings, "links", floatStage)
+
+def buildProject(objectInputFile, strName=str_DEFAULT_NAME, strGatewayInterface=None, floatGatewayTimeout=1.0, intGatewayCacheTTL=3600, strLayout=str_DEFAULT_LAYOUT, intLayoutSeed=int_DEFAULT_SEED, dictPreviousLayout=None, strSeed=None, objectLayoutMemo=None, dictTimings=None) -> tuple:
+    floatStage = time.perf_counter()
+    try:
+        objectInput = validateInput(objectInputFile) # Validated exactly once, with all defaults filled in
+    except InvalidInputError as err:
+        raise NetworkNarcoticError("Invalid input file. Did you follow the schema correctly? Check the following:\n\n" + str(err))
+    floatStage = recordTiming(dictTimings, "validate", floatStage)
+
+    # Seeded projects derive all their identifiers from the seed and their name, so the same input gives the same bytes
+    uuidNamespace = uuid5(uuid_NAMESPACE, strSeed + "/" + strName) if strSeed != None else None
+    objectGNS3Project = {
+        "name": strName + " (ID: " + str(uuid5(uuidNamespace, "name") if uuidNamespace != None else uuid4()) + ")",
+        "project_id": str(uuid5(uuidNamespace, "project") if uuidNamespace != None else uuid4()),
+        "revision": 5,
+        "topology": {},
+        "type": "topology",
+        "version": "2.0.0"
+    }
+
+    objectTopology = Topology()
+    try:
+        fillTopology(objectTopology, objectInput, dictTimings)
+    except PortLimitError:
+        # Only now work out every device that doesn't fit, so valid networks don't pay for it
+        raise NetworkNarcoticError(formatPortViolations(planTopology(objectInputFile)["violations"]))
+
+    # strGatewayInterface is only detected when the network has a gateway
+    floatStage = time.perf_counter()
+    if (strGatewayInterface == None and int_CLOUD in objectTopology.arrayDeviceTypes):
+        strGatewayInterface = getGatewayInterface(floatTimeout=floatGatewayTimeout, intCacheTTL=intGatewayCacheTTL)
+        floatStage = recordTiming(dictTimings, "gateway", floatStage)
+
+    # Handle coordinates
+    # Every device is drawn with its own cluster, gateway clouds with the router cluster they're connected to
+    objectEmitter = GNS3Emitter(objectTopology, strGatewayInterface, uuidNamespace)
+    arrayNodes = range(len(objectTopology.arrayDeviceTypes))
+    try:
+        # Nodes keep their coordinates from a previous layout by name, since node_ids change on every build
+        dictInitial = None
+        if (dictPreviousLayout):
+            dictInitial = {}
+            for intDevice in arrayNodes:
+                strDeviceName = objectTopology.getDeviceName(intDevice)
+                if (strDeviceName in dictPreviousLayout):
+                    dictInitial[intDevice] = dictPreviousLayout[strDeviceName]
+        dictCoordinates = computeLayout(strLayout, arrayNodes, EdgeList(objectTopology.arrayLinkStarts, objectTopology.arrayLinkEnds), dict(enumerate(objectTopology.arrayDeviceClusters)), intLayoutSeed, dictInitial, objectLayoutMemo, [objectTopology.getDeviceName(intDevice) for intDevice in arrayNodes] if objectLayoutMemo != None else None)
+    except ValueError as err:
+        raise NetworkNarcoticError(str(err) + " Aborting.")
+
+    for intDevice in arrayNodes:
+        objectTopology.arrayX[intDevice] = round(dictCoordinates[intDevice][0])
+        objectTopology.arrayY[intDevice] = round(dictCoordinates[intDevice][1])
+    recordTiming(dictTimings, "layout", floatStage)
+
+    if (Profile.getProfile(dictTimings) != None):
+        dictTimings.countTopology(objectTopology)
+
+    objectGNS3Project["topology"] = {
+        "computes": [],
+        "drawings": [],
+        "links": GNS3Items(objectEmitter.emitLink, range(len(objectTopology.arrayLinkStarts))),
+        "nodes": GNS3Items(objectEmitter.emitNode, arrayNodes)
+    }
+    return objectGNS3Project, objectEmitter
+
+def buildTopology(objectInputFile, strName=str_DEFAULT_NAME, strGatewayInterface=None, floatGatewayTimeout=1.0, intGatewayCacheTTL=3600, strLayout=str_DEFAULT_LAYOUT, intLayoutSeed=int_DEFAULT_SEED, dictPreviousLayout=None, strSeed=None, objectLayoutMemo=None, dictTimings=None) -> dict:
+    objectGNS3Project = buildProject(objectInputFile, strName, strGatewayInterface, floatGatewayTimeout, intGatewayCacheTTL, strLayout, intLayoutSeed, dictPreviousLayout, strSeed, objectLayoutMemo, dictTimings)[0]
+    objectGNS3Project["topology"]["links"] = list(objectGNS3Project["topology"]["links"])
+    objectGNS3Project["topology"]["nodes"] = list(objectGNS3Project["topology"]["nodes"])
+    return objectGNS3Project
+
+"""
+###################################################################################################################
+Planning the topology.
+
+This section works out, before anything is built, how many nodes and links an input file turns into and how many
+ports every device needs. It runs the exact same algorithm as buildTopology() on a TopologyPlan, which only counts the
+ports of every device instead of allocating them, so the plan is exact for every combination of clustermode,
+connectionmode, cables and connectionshift. A plan takes milliseconds even for networks that are far too large to
+build, and lists every device that exceeds the port limit instead of stopping at the first one.
+
+- planTopology():
+  Validates an input file and returns its plan: the amount of nodes and links, the port demand of every device and
+  cluster, and every device that exceeds the port limit.
+
+- formatPortViolations():
+  Returns the message of a network that exceeds the port limit, listing every device that doesn't fit.
+
+- planProjectAddresses():
+  Plans an IP address for every router interface of a built topology (see nn_addressing.py).
+
+- renderProjectConfigs():
+  Renders a startup-config for every router of an addressed project (see nn_configs.py) and has its nodes refer to
+  them. They're returned with their path in the project, for writeProject() to write together with the project.
+###################################################################################################################
+"""
+def planTopology(objectInputFile) -> dict:
+    try:
+        objectInput = validateInput(objectInputFile)
+    except InvalidInputError as err:
+        raise NetworkNarcoticError("Invalid input file. Did you follow the schema correctly? Check the following:\n\n" + str(err))
+
+    objectPlan = TopologyPlan()
+    fillTopology(objectPlan, objectInput)
+
+    arrayDevices = [{"name": objectPlan.getDeviceName(intDevice), "type": array_DEVICE_TYPES[objectPlan.arrayDeviceTypes[intDevice]], "ports": intPorts} for intDevice, intPorts in enumerate(objectPlan.arrayDevicePorts)]
+    arrayClusters = []
+    for objectCluster in objectPlan.arrayClusters:
+        arrayClusterPorts = [objectPlan.arrayDevicePorts[intDevice] for intDevice in objectCluster.arrayDevices]
+        arrayClusters.append({"tag": objectCluster.strTag, "type": array_DEVICE_TYPES[objectCluster.intType], "devices": len(arrayClusterPorts), "min_ports": min(arrayClusterPorts), "max_ports": max(arrayClusterPorts)})
+
+    return {
+        "nodes": len(objectPlan.arrayDeviceTypes),
+        "routers": objectPlan.arrayDeviceTypes.count(int_ROUTER),
+        "switches": objectPlan.arrayDeviceTypes.count(int_SWITCH),
+        "clouds": objectPlan.arrayDeviceTypes.count(int_CLOUD),
+        "links": objectPlan.intLinks,
+        "port_limit": int_PORT_LIMIT,
+        "clusters": arrayClusters,
+        "devices": arrayDevices,
+        "violations": [objectDevice for objectDevice in arrayDevices if objectDevice["ports"] > int_PORT_LIMIT]
+    }
+
+def formatPortViolations(arrayViolations) -> str:
+    # Depends on NM-16ESW's 16 slot limit, arbitrarily the same for switches
+    strMessage = str(len(arrayViolations)) + " of your devices exceed the " + str(int_PORT_LIMIT) + "-port limit. Lower the amount, cables or connections of their clusters. Aborting.\n"
+    for objectViolation in arrayViolations:
+        strMessage += "\n    " + objectViolation["name"] + " (" + objectViolation["type"] + ") needs " + str(objectViolation["ports"]) + " ports"
+    return strMessage
+
+def planProjectAddresses(objectTopology, intP2PPrefix=30) -> object:
+    from nn_addressing import planAddresses, AddressPlanError # Required for planning addresses
+
+    try:
+        return planAddresses(objectTopology, intP2PPrefix)
+    except AddressPlanError as err:
+        raise NetworkNarcoticError(str(err) + " Aborting.")
+
+def renderProjectConfigs(objectEmitter, objectAddressPlan, intWorkers=None) -> list:
+    from nn_configs import prepareConfigs, renderConfigs, str_STARTUP_CONFIG # Required for rendering startup-configs
+
+    arrayConfigs = renderConfigs(prepareConfigs(objectAddressPlan, objectEmitter), intWorkers)
+    objectEmitter.strStartupConfig = str_STARTUP_CONFIG
+    return arrayConfigs
+
+"""
+###################################################################################################################
+Building the .gns3 file.
+
+This is where the in-memory topology is converted into a usable .gns3 file by writeProject(). Nodes and links are
+serialized one at a time, so the entire project never exists as one big string. The output is first written to a
+temporary file next to the output file and only then renamed, so an existing .gns3 file is never left half-written.
+Project files (startup-configs) are written the same way, into the project directory next to a .gns3 file, and only
+renamed after the .gns3 file itself, so a project that fails to write leaves none of them behind.
+
+- streamJSON():
+  Writes a value as JSON, byte for byte the same as json.dumps(), without serializing large containers at once.
+
+- writeProject():
+  Writes a project to a .gns3 file, either indented or compact, or to a zipped .gns3project archive (by default
+  when the output file ends with .gns3project), together with the project files (startup-configs) of its nodes.
+
+- writeOutputs():
+  Writes a project to a .gns3 file and to every other format asked for (see nn_emitters.py), including its address
+  plan (see nn_addressing.py), all at the same time from the same topology.
+###################################################################################################################
+"""
+def streamJSON(stream, value, intIndent=4, intDepth=0) -> None:
+    if (intDepth >= int_STREAM_DEPTH or not isinstance(value, (dict, list, tuple, GNS3Items))):
+        strValue = json.dumps(value, indent=intIndent or None, separators=None if intIndent else (",", ":"))
+        stream.write(strValue.replace("\n", "\n" + " " * (intIndent * intDepth)) if intIndent else strValue) # JSON strings never contain raw newlines
+        return
+
+    booleanDict = isinstance(value, dict)
+    strNewline = "\n" + " " * (intIndent * (intDepth + 1)) if intIndent else ""
+    if (len(value) == 0):
+        stream.write("{}" if booleanDict else "[]")
+        return
+
+    stream.write("{" if booleanDict else "[")
+    for intIndex, item in enumerate(value.items() if booleanDict else value):
+        stream.write(("," if intIndex > 0 else "") + strNewline)
+        if (booleanDict):
+            stream.write(json.dumps(str(item[0])) + (": " if intIndent else ":"))
+            item = item[1]
+        streamJSON(stream, item, intIndent, intDepth + 1)
+    stream.write(("\n" + " " * (intIndent * intDepth) if intIndent else "") + ("}" if booleanDict else "]"))
+
+def writeProject(objectGNS3Project, strOutput, booleanCompact=False, booleanArchive=None, arrayFiles=None) -> None:
+    intIndent = 0 if booleanCompact else 4
+    if (booleanArchive == None):
+        booleanArchive = strOutput.endswith(".gns3project")
+    strDirectory = os.path.dirname(os.path.abspath(strOutput))
+    strSuffix = "." + uuid4().hex[:8] + ".tmp"
+    strTemporary = os.path.join(strDirectory, "." + os.path.basename(strOutput) + strSuffix)
+    arrayPaths = [] # Holds the path of every project file written next to the .gns3 file
+
+    try:
+        if (booleanArchive):
+            # GNS3 imports a portable project from a zip file with the project file at its root
+            objectMember = zipfile.ZipInfo("project.gns3", date_time=(1980, 1, 1, 0, 0, 0)) # A fixed timestamp keeps archives reproducible
+            objectMember.compress_type = zipfile.ZIP_DEFLATED
+            with zipfile.ZipFile(strTemporary, "x", zipfile.ZIP_DEFLATED) as archive:
+                with archive.open(objectMember, "w") as streamMember:
+                    with io.TextIOWrapper(streamMember, encoding="utf-8") as stream:
+                        streamJSON(stream, objectGNS3Project, intIndent)
+                for strPath, strContent in arrayFiles or []:
+                    objectMember = zipfile.ZipInfo(strPath, date_time=(1980, 1, 1, 0, 0, 0))
+                    objectMember.compress_type = zipfile.ZIP_DEFLATED
+                    archive.writestr(objectMember, strContent)
         else:
-            for arrayDesiredRouterCluster in arrayDesiredRouterClusters:
-                if (arrayDesiredRouterCluster[0] == objectRouterCluster["tag"]):
-                    arrayDesiredRouterCluster[1].append([objectRouterNodeConstruction["node_id"], 0])
-
-        objectTemporaryGNS3Topology["nodes"].append(objectRouterNodeConstruction)
-       
-    # Handle gateways
-    if (objectRouterCluster["gateway"] == True):
-        strCloudNode = str(uuid4())
-
-        # Create the cloud
-        objectCloudNodeConstruction = copy.deepcopy(objectGNS3CloudNodeScaffold)
-        objectCloudNodeConstruction["name"] = "INTERNET-" + objectRouterCluster["tag"]
-        objectCloudNodeConstruction["node_id"] = strCloudNode
-        objectCloudNodeConstruction["x"] = 0
-        objectCloudNodeConstruction["y"] = 0
-        objectTemporaryGNS3Topology["nodes"].append(objectCloudNodeConstruction)
-
-        # Create the link
-        tupleDesiredLink = None
-        for arrayDesiredRouterCluster in arrayDesiredRouterClusters:
-            if (arrayDesiredRouterCluster[0] == objectRouterCluster["tag"]):
-                tupleDesiredLink = (strCloudNode, arrayDesiredRouterCluster[1][0][0])
-
-        objectLinkConstruction = copy.deepcopy(objectGNS3LinkScaffold)
-        objectLinkConstruction["link_id"] = str(uuid4())
-        objectLinkConstruction["nodes"].append({"adapter_number": 0, "port_number": 0, "node_id": strCloudNode}) # No risk on exceeding port limit
-        addNodeToLink((tupleDesiredLink[1], 1), objectLinkConstruction, arrayDesiredRouterClusters, arrayDesiredSwitchClusters)
-        objectTemporaryGNS3Topology["links"].append(objectLinkConstruction)
-    
-    # Do the magic
-    if (objectRouterCluster["amount"] > 1):
-        # For each router cluster, apply cables in case necessary
-        match objectRouterCluster["clustermode"]:
-            case "full":
-                # Define the links
-                arrayDesiredLinks = []
-                for arrayDesiredRouterCluster in arrayDesiredRouterClusters:
-                    if (arrayDesiredRouterCluster[0] == objectRouterCluster["tag"]):
-                        for arrayDesiredRouterSTART in arrayDesiredRouterCluster[1]:
-                            for arrayDesiredRouterEND in arrayDesiredRouterCluster[1]:
-                                if (arrayDesiredRouterSTART[0] != arrayDesiredRouterEND[0]):
-                                    if (not ((arrayDesiredRouterEND[0], 1), (arrayDesiredRouterSTART[0], 1)) in arrayDesiredLinks):
-                                        for intCurrent in range (objectRouterCluster["cables"]):
-                                            arrayDesiredLinks.append(((arrayDesiredRouterSTART[0], 1), (arrayDesiredRouterEND[0], 1)))
-                        break
-
-                # Write the links
-                writeClusterLinks(arrayDesiredLinks, objectGNS3LinkScaffold, arrayDesiredRouterClusters, arrayDesiredSwitchClusters, objectTemporaryGNS3Topology)
-            case "loop":
-                # Define the links
-                arrayDesiredLinks = []
-                stringEndPoint = arrayDesiredRouterCluster[1]
-                intCounter = 0
-                for arrayDesiredRouterCluster in arrayDesiredRouterClusters:
-                    if (arrayDesiredRouterCluster[0] == objectRouterCluster["tag"]):
-                        for stringNode in arrayDesiredRouterCluster[1]:
-                            if (intCounter != len(arrayDesiredRouterCluster[1])):
-                                for intCurrent in range (objectRouterCluster["cables"]):
-                                    arrayDesiredLinks.append(((stringNode[0], 1), (arrayDesiredRouterCluster[1][(intCounter + 1) % len(arrayDesiredRouterCluster[1])][0], 1)))
-                                intCounter += 1
-                        break
-                
-                # Write the links
-                writeClusterLinks(arrayDesiredLinks, objectGNS3LinkScaffold, arrayDesiredRouterClusters, arrayDesiredSwitchClusters, objectTemporaryGNS3Topology)
-            case "line":
-                # Define the links
-                arrayDesiredLinks = []
-                stringEndPoint = arrayDesiredRouterCluster[1]
-                intCounter = 0
-                for arrayDesiredRouterCluster in arrayDesiredRouterClusters:
-                    if (arrayDesiredRouterCluster[0] == objectRouterCluster["tag"]):
-                        for stringNode in arrayDesiredRouterCluster[1]:
-                            if (intCounter != len(arrayDesiredRouterCluster[1]) -1): # Notice the -1; the "cut" in the loop
-                                for intCurrent in range (objectRouterCluster["cables"]):
-                                    arrayDesiredLinks.append(((stringNode[0], 1), (arrayDesiredRouterCluster[1][(intCounter + 1) % len(arrayDesiredRouterCluster[1])][0], 1)))
-                                intCounter += 1
-                        break
-
-                # Write the links
-                writeClusterLinks(arrayDesiredLinks, objectGNS3LinkScaffold, arrayDesiredRouterClusters, arrayDesiredSwitchClusters, objectTemporaryGNS3Topology)
-            case "hubspoke":
-                # Define the links
-                arrayDesiredLinks = []
-                for arrayDesiredRouterCluster in arrayDesiredRouterClusters:
-                    if (arrayDesiredRouterCluster[0] == objectRouterCluster["tag"]):
-                        stringHubNode = arrayDesiredRouterCluster[1][0][0]
-                        for stringNode in arrayDesiredRouterCluster[1]:
-                            if (stringNode[0] != stringHubNode):
-                                for intCurrent in range (objectRouterCluster["cables"]):
-                                    arrayDesiredLinks.append(((stringHubNode, 1), (stringNode[0], 1)))
-                        break
-
-                # Write the links
-                writeClusterLinks(arrayDesiredLinks, objectGNS3LinkScaffold, arrayDesiredRouterClusters, arrayDesiredSwitchClusters, objectTemporaryGNS3Topology)
-
-# Find connection elements
-arrayConnectionElements = [] # Holds per connection tag an array of involved router clusters
-for objectRouterCluster in objectRouterClusters:
-    if (objectRouterCluster["connectedto"] != None):
-        arrayClusterConnections = []
-        for connection in objectRouterCluster["connectedto"]:
-            objectDesiredConnection = standardizeConnection(connection, objectConnections, objectRouterCluster)
-
-            # Check if the connection tag hasn't been seen before in this router cluster
-            for arrayClusterConnection in arrayClusterConnections:
-                if (arrayClusterConnection == objectDesiredConnection["tag"]):
-                    print("Router cluster with tag " + objectRouterCluster["tag"] + " is referring to the same connection more than once. Aborting.")
-                    exit()
-
-            booleanConnectionIsKnown = False
-            for arrayConnectionElement in arrayConnectionElements:
-                if (arrayConnectionElement[0] == objectDesiredConnection["tag"]):
-                    booleanConnectionIsKnown = True
-                    break
-            if (booleanConnectionIsKnown == False):
-                arrayConnectionElements.append([objectDesiredConnection["tag"], [objectRouterCluster["tag"]]])
-
-            # Find all other router clusters that need this connection, if any
-            for objectRouterClusterNest in objectRouterClusters:
-                if (objectRouterClusterNest["tag"] != objectRouterCluster["tag"] and objectRouterClusterNest["connectedto"] != None):
-                    for connectionNest in objectRouterClusterNest["connectedto"]:
-                        objectDesiredConnectionNest = standardizeConnection(connectionNest, objectConnections, objectRouterClusterNest)
-                        if (objectDesiredConnectionNest["tag"] == objectDesiredConnection["tag"]):
-                            booleanConnectionIsKnown = False
-                            for arrayConnectionElement in arrayConnectionElements:
-                                if (arrayConnectionElement[0] == objectDesiredConnection["tag"]):
-                                    booleanConnectionIsKnown = True
-                                    break
-
-                            for arrayConnectionElement in arrayConnectionElements:
-                                if (arrayConnectionElement[0] == objectDesiredConnection["tag"]):
-                                    if (objectRouterCluster["tag"] not in arrayConnectionElement[1]):
-                                        arrayConnectionElement[1].append(objectRouterCluster["tag"])
-                                    if (objectRouterClusterNest["tag"] not in arrayConnectionElement[1]):
-                                        arrayConnectionElement[1].append(objectRouterClusterNest["tag"])
-
-# Define connections
-arrayDesiredConnections = [] # Holds per connection tag an array of tuples, the latter containing two tuples with a node_id and an adapter number
-for arrayConnectionElement in arrayConnectionElements:
-    objectDesiredConnection = standardizeConnectionMinimal(arrayConnectionElement[0], objectConnections)
-    arrayInvolvedSwitchCluster = None
-
-    # Check for presence of switch cluster in case necessary
-    if (objectDesiredConnection["switches"] == None and len(arrayConnectionElement[1]) > 2):
-        print("Hooking more than two router clusters to a connection (" + objectDesiredConnection["tag"] + ") requires a switch cluster. Aborting.")
-        exit()
-
-    for arrayDesiredSwitchCluster in arrayDesiredSwitchClusters:
-        if (objectDesiredConnection["switches"] != None and arrayDesiredSwitchCluster[0] == objectDesiredConnection["switches"]["tag"]):
-            arrayInvolvedSwitchCluster = arrayDesiredSwitchCluster
-
-    # Do the magic
-    match objectDesiredConnection["connectionmode"]:
-        case "single":
-            # Define the links
-            arrayDesiredLinks = []
-            arrayRouterPoints = []
-            arraySwitchPoints = []
-            for arrayDesiredRouterCluster in arrayDesiredRouterClusters:
-                arrayRouterShifted = deque(arrayDesiredRouterCluster[1])
-                for objectRouterCluster in objectRouterClusters:
-                    for stringRouterTag in arrayConnectionElement[1]:
-                        if (objectRouterCluster["tag"] == arrayDesiredRouterCluster[0] == stringRouterTag):
-                            if (objectDesiredConnection["shiftable"] == True):
-                                arrayRouterShifted.rotate(-objectRouterCluster["connectionshift"])
-                            arrayRouterPoints.append([objectRouterCluster["tag"], arrayRouterShifted[0]])
-                
-            # Put the switch cluster inbetween in case necessary
-            if (arrayInvolvedSwitchCluster != None):
-                for objectSwitchCluster in objectSwitchClusters:
-                    arraySwitchShifted = deque(arrayInvolvedSwitchCluster[1])
-                    if (objectSwitchCluster["tag"] == arrayInvolvedSwitchCluster[0]):
-                        if (objectDesiredConnection["shiftable"] == True):
-                            arraySwitchShifted.rotate(-objectSwitchCluster["connectionshift"])
-                        arraySwitchPoints.append(arraySwitchShifted[0])
-                        break
-                for arrayRouterPoint in arrayRouterPoints:
-                    for arraySwitchPoint in arraySwitchPoints:
-                        arrayDesiredLinks.append(((arrayRouterPoint[1][0], 1), (arraySwitchPoint[0], 0)))
-            else:
-                for arrayRouterPointSTART in arrayRouterPoints:
-                    for arrayRouterPointEND in arrayRouterPoints:
-                        if (arrayRouterPointSTART[0] != arrayRouterPointEND[0]):
-                            if (not ((arrayRouterPointEND[1][0], 1), (arrayRouterPointSTART[1][0], 1)) in arrayDesiredLinks):
-                                arrayDesiredLinks.append(((arrayRouterPointSTART[1][0], 1), (arrayRouterPointEND[1][0], 1)))
-
-            # Append the links
-            arrayDesiredConnections.append([arrayConnectionElement[0], arrayDesiredLinks])
-        case "full":
-            # Define the links
-            arrayDesiredLinks = []
-            arrayRouterPoints = []
-            arraySwitchPoints = []
-            for arrayDesiredRouterCluster in arrayDesiredRouterClusters:
-                arrayRouterShifted = deque(arrayDesiredRouterCluster[1])
-                for objectRouterCluster in objectRouterClusters:
-                    for stringRouterTag in arrayConnectionElement[1]:
-                        if (objectRouterCluster["tag"] == arrayDesiredRouterCluster[0] == stringRouterTag):
-                            if (objectDesiredConnection["shiftable"] == True):
-                                arrayRouterShifted.rotate(-objectRouterCluster["connectionshift"])
-                            arrayPointsToAdd = []
-                            for arrayRouter in arrayRouterShifted:
-                                arrayPointsToAdd.append(arrayRouter)
-                            arrayRouterPoints.append([objectRouterCluster["tag"], arrayPointsToAdd])
-
-            # Put the switch cluster inbetween in case necessary
-            if (arrayInvolvedSwitchCluster != None):
-                for objectSwitchCluster in objectSwitchClusters:
-                    arraySwitchShifted = deque(arrayInvolvedSwitchCluster[1])
-                    if (objectSwitchCluster["tag"] == arrayInvolvedSwitchCluster[0]):
-                        if (objectDesiredConnection["shiftable"] == True):
-                            arraySwitchShifted.rotate(-objectSwitchCluster["connectionshift"])
-                        arrayPointsToAdd = []
-                        for arraySwitch in arraySwitchShifted:
-                            arrayPointsToAdd.append(arraySwitch)
-                        arraySwitchPoints.append([objectSwitchCluster["tag"], arrayPointsToAdd])
-                for arrayRouterPoint in arrayRouterPoints:
-                    for arraySwitchPoint in arraySwitchPoints:
-                        for arrayRouterDetails in arrayRouterPoint[1]:
-                            for arraySwitchDetails in arraySwitchPoint[1]:
-                                if (not ((arraySwitchDetails[0], 0), (arrayRouterDetails[0], 1)) in arrayDesiredLinks):
-                                    arrayDesiredLinks.append(((arrayRouterDetails[0], 1), (arraySwitchDetails[0], 0)))
+            with open(strTemporary, "x", encoding="utf-8", buffering=1 << 20) as stream:
+                streamJSON(stream, objectGNS3Project, intIndent)
+            for strPath, strContent in arrayFiles or []:
+                strFullPath = os.path.join(strDirectory, *strPath.split("/"))
+                os.makedirs(os.path.dirname(strFullPath), exist_ok=True)
+                arrayPaths.append(strFullPath)
+                with open(strFullPath + strSuffix, "x", encoding="utf-8", newline="\n") as stream:
+                    stream.write(strContent)
+        os.replace(strTemporary, strOutput)
+        for strFullPath in arrayPaths:
+            os.replace(strFullPath + strSuffix, strFullPath)
+    except OSError as err:
+        raise NetworkNarcoticError("Can't write '" + strOutput + "': " + str(err.strerror or err) + ". Aborting.")
+    finally:
+        for strPath in [strTemporary] + [strFullPath + strSuffix for strFullPath in arrayPaths]:
+            if (os.path.exists(strPath)):
+                os.remove(strPath)
+
+def writeOutputs(objectGNS3Project, strOutput=None, dictOutputs=None, strName=str_DEFAULT_NAME, booleanCompact=False, booleanArchive=None, objectAddressPlan=None, arrayFiles=None, objectEmitter=None) -> None:
+    if (not dictOutputs):
+        if (strOutput != None):
+            writeProject(objectGNS3Project, strOutput, booleanCompact, booleanArchive, arrayFiles)
+        return
+
+    from concurrent.futures import ThreadPoolExecutor # Required for writing every format at the same time
+    from nn_emitters import dict_EMITTERS, writeOutput # Required for writing other formats
+    from nn_addressing import dict_PLAN_EMITTERS # Required for writing address plans
+
+    with ThreadPoolExecutor(len(dictOutputs) + 1) as executor:
+        arrayFutures = []
+        for strFormat, strPath in dictOutputs.items():
+            if (strFormat in dict_PLAN_EMITTERS):
+                arrayFutures.append((strPath, executor.submit(writeOutput, strPath, dict_PLAN_EMITTERS[strFormat], objectAddressPlan)))
             else:
-                for arrayRouterPointSTART in arrayRouterPoints:
-                    for arrayRouterPointEND in arrayRouterPoints:
-                        if (arrayRouterPointSTART[0] != arrayRouterPointEND[0]):
-                            for arrayRouterPointDetailsSTART in arrayRouterPointSTART[1]:
-                                for arrayRouterPointDetailsEND in arrayRouterPointEND[1]:
-                                    if (not ((arrayRouterPointDetailsEND[0], 1), (arrayRouterPointDetailsSTART[0], 1)) in arrayDesiredLinks):
-                                        arrayDesiredLinks.append(((arrayRouterPointDetailsSTART[0], 1), (arrayRouterPointDetailsEND[0], 1)))
-
-            # Append the links
-            arrayDesiredConnections.append([arrayConnectionElement[0], arrayDesiredLinks])
-        case "parallel":
-            # Define the links
-            arrayDesiredLinks = []
-
-            intRouterClusterLengthA = None
-            intRouterClusterLengthB = None
-            intSwitchClusterLength = None
-            for arrayDesiredRouterCluster in arrayDesiredRouterClusters:
-                if (arrayDesiredRouterCluster[0] == arrayConnectionElement[1][0]): # FAULTY, assumes 2 nodes!!!
-                    intClusterLengthA = len(arrayDesiredRouterCluster[1])
-                if (arrayDesiredRouterCluster[0] == arrayConnectionElement[1][1]):
-                    intClusterLengthB = len(arrayDesiredRouterCluster[1])
-            if (arrayInvolvedSwitchCluster != None):
-                intSwitchClusterLength = len(arrayInvolvedSwitchCluster[1])
-
-            arrayRouterPoints = []
-            arraySwitchPoints = []
-            for arrayDesiredRouterCluster in arrayDesiredRouterClusters:
-                arrayRouterShifted = deque(arrayDesiredRouterCluster[1])
-                for objectRouterCluster in objectRouterClusters:
-                    for stringRouterTag in arrayConnectionElement[1]:
-                        if (objectRouterCluster["tag"] == arrayDesiredRouterCluster[0] == stringRouterTag):
-                            if (objectDesiredConnection["shiftable"] == True):
-                                arrayRouterShifted.rotate(-objectRouterCluster["connectionshift"])
-                            arrayPointsToAdd = []
-                            for arrayRouter in arrayRouterShifted:
-                                arrayPointsToAdd.append(arrayRouter)
-                            arrayRouterPoints.append([objectRouterCluster["tag"], arrayPointsToAdd])
-
-            # Put the switch cluster inbetween in case necessary
-            if (arrayInvolvedSwitchCluster != None):
-                for objectSwitchCluster in objectSwitchClusters:
-                    arraySwitchShifted = deque(arrayInvolvedSwitchCluster[1])
-                    if (objectSwitchCluster["tag"] == arrayInvolvedSwitchCluster[0]):
-                        if (objectDesiredConnection["shiftable"] == True):
-                            arraySwitchShifted.rotate(-objectSwitchCluster["connectionshift"])
-                        arrayPointsToAdd = []
-                        for arraySwitch in arraySwitchShifted:
-                            arrayPointsToAdd.append(arraySwitch)
-                        arraySwitchPoints.append([objectSwitchCluster["tag"], arrayPointsToAdd])
-                for arrayRouterPoint in arrayRouterPoints:
-                    for arraySwitchPoint in arraySwitchPoints:
-                        intSmallestCluster = min(len(arrayRouterPoint[1]), len(arraySwitchPoint[1]))
-                        for intCurrent in range(intSmallestCluster):
-                            if (not ((arraySwitchPoint[1][intCurrent][0], 0), (arrayRouterPoint[1][intCurrent][0], 1)) in arrayDesiredLinks):
-                                arrayDesiredLinks.append(((arrayRouterPoint[1][intCurrent][0], 1), (arraySwitchPoint[1][intCurrent][0], 0)))
-            else:
-                # Messy and can be shortened based on the if-case up above
-                arrayStartPoints = []
-                arrayEndPoints = []
-                for arrayDesiredRouterCluster in arrayDesiredRouterClusters:
-                    arrayShifted = deque(arrayDesiredRouterCluster[1])
-                    for objectRouterCluster in objectRouterClusters:
-                        if (objectRouterCluster["tag"] == arrayDesiredRouterCluster[0] and objectDesiredConnection["shiftable"] == True):
-                            arrayShifted.rotate(-objectRouterCluster["connectionshift"])
-
-                    intCounter = 0
-                    if (arrayDesiredRouterCluster[0] == arrayConnectionElement[1][0]):
-                        for arrayDesiredRouter in arrayShifted:
-                            if (intCounter < min(intClusterLengthA, intClusterLengthB)):
-                                arrayStartPoints.append(arrayDesiredRouter[0])
-                                intCounter += 1
-                    if (arrayDesiredRouterCluster[0] == arrayConnectionElement[1][1]):
-                        for arrayDesiredRouter in arrayShifted:
-                            if (intCounter < min(intClusterLengthA, intClusterLengthB)):
-                                arrayEndPoints.append(arrayDesiredRouter[0])
-                                intCounter += 1
-                for intCurrent in range(min(intClusterLengthA, intClusterLengthB)):
-                    arrayDesiredLinks.append(((arrayStartPoints[intCurrent], 1), (arrayEndPoints[intCurrent], 1)))
-
-            # Append the links
-            arrayDesiredConnections.append([arrayConnectionElement[0], arrayDesiredLinks])
-
-# Apply connections
-for arrayDesiredConnection in arrayDesiredConnections:
-    for objectConnection in objectConnections:
-        if (objectConnection["tag"] == arrayDesiredConnection[0]):
-            for tupleDesiredLink in arrayDesiredConnection[1]:
-                for intCurrent in range(objectConnection["cables"]):
-                    #print(tupleDesiredLink)
-                    objectLinkConstruction = copy.deepcopy(objectGNS3LinkScaffold)
-                    objectLinkConstruction["link_id"] = str(uuid4())
-                    addNodeToLink(tupleDesiredLink[0], objectLinkConstruction, arrayDesiredRouterClusters, arrayDesiredSwitchClusters)
-                    addNodeToLink(tupleDesiredLink[1], objectLinkConstruction, arrayDesiredRouterClusters, arrayDesiredSwitchClusters)
-                    objectTemporaryGNS3Topology["links"].append(objectLinkConstruction)
-
-# Handle coordinates
-graphCoordinateSource = nx.Graph()
-objectLinks = objectTemporaryGNS3Topology["links"]
-for objectLink in objectLinks:
-    objectNodes = objectLink["nodes"]
-    graphCoordinateSource.add_edge(objectNodes[0]["node_id"], objectNodes[1]["node_id"])
-dictCoordinates = nx.fruchterman_reingold_layout(graphCoordinateSource)
-
-for arrayCoordinate in dictCoordinates:
-    for objectNode in objectTemporaryGNS3Topology["nodes"]:
-        if (objectNode["node_id"] == arrayCoordinate):
-            objectNode["x"] = round(dictCoordinates.get(arrayCoordinate)[0] * 700)
-            objectNode["y"] = round(dictCoordinates.get(arrayCoordinate)[1] * 700)
-
-print("Done building in-memory topology.")
+                arrayFutures.append((strPath, executor.submit(writeOutput, strPath, dict_EMITTERS[strFormat], objectEmitter.objectTopology, objectEmitter, strName)))
+        if (strOutput != None):
+            arrayFutures.append((strOutput, executor.submit(writeProject, objectGNS3Project, strOutput, booleanCompact, booleanArchive, arrayFiles)))
+        for strPath, future in arrayFutures:
+            try:
+                future.result()
+            except OSError as err:
+                raise NetworkNarcoticError("Can't write '" + strPath + "': " + str(err.strerror or err) + ". Aborting.")
 
 """
 ###################################################################################################################
-Building the .gns3 file.
+Building many .gns3 files.
+
+This is where a batch of input files is spread over a pool of worker processes. Every input file is built
+independently: a failing input file is reported in the summary instead of aborting the entire batch.
+
+- buildProjectFile():
+  Builds one input file into one .gns3 file and reports how it went. Runs inside a worker process.
+
+- expandBatchPatterns():
+  Turns glob patterns into pairs of input and output files.
+
+- readManifest():
+  Reads pairs of input and output files from a .yml (or .json) manifest.
 
-This is where the in-memory topology is converted into a usable .gns3 file.
+- runBatch():
+  Builds all pairs of input and output files in a process pool and returns a summary per file.
 ###################################################################################################################
 """
-object_GNS3_PROJECT["topology"] = objectTemporaryGNS3Topology
-file = open(args.output, "a")
-file.truncate(0)
-file.write(json.dumps(object_GNS3_PROJECT, indent=4))
-file.close()
+def buildProjectFile(strInput, strOutput, strName=str_DEFAULT_NAME, strGatewayInterface=None, floatGatewayTimeout=1.0, intGatewayCacheTTL=3600, strLayout=str_DEFAULT_LAYOUT, intLayoutSeed=int_DEFAULT_SEED, booleanCompact=False, booleanArchive=None, strSeed=None, booleanCache=False) -> dict:
+    floatStart = time.perf_counter()
+    objectResult = {"input": strInput, "output": strOutput, "status": "ok", "error": None}
+
+    try:
+        objectLayoutMemo = readBuildCache(getBuildCachePath(strOutput)) if booleanCache else None
+        writeProject(buildProject(loadInputFile(strInput), strName, strGatewayInterface, floatGatewayTimeout, intGatewayCacheTTL, strLayout, intLayoutSeed, strSeed=strSeed, objectLayoutMemo=objectLayoutMemo)[0], strOutput, booleanCompact, booleanArchive)
+        if (booleanCache):
+            writeBuildCache(getBuildCachePath(strOutput), objectLayoutMemo)
+    except NetworkNarcoticError as err:
+        objectResult["status"] = "error"
+        objectResult["error"] = str(err)
+    except Exception as err: # Unreadable files and the like shouldn't take down the other builds
+        objectResult["status"] = "error"
+        objectResult["error"] = type(err).__name__ + ": " + str(err)
+
+    objectResult["seconds"] = round(time.perf_counter() - floatStart, 4)
+    return objectResult
+
+def expandBatchPatterns(arrayPatterns, strOutputDirectory=None, strExtension=".gns3") -> list:
+    arrayJobs = [] # Holds per input file a tuple containing the input file, the output file and the project name (None is the default)
+    for strPattern in arrayPatterns:
+        arrayMatches = sorted(glob.glob(strPattern, recursive=True))
+        if (len(arrayMatches) == 0):
+            arrayJobs.append((strPattern, None, None)) # Reported as an error instead of silently ignored
+
+        for strInput in arrayMatches:
+            strOutput = os.path.splitext(strInput)[0] + strExtension
+            if (strOutputDirectory != None):
+                strOutput = os.path.join(strOutputDirectory, os.path.basename(strOutput))
+            arrayJobs.append((strInput, strOutput, None))
+
+    return arrayJobs
+
+def readManifest(strManifest) -> list:
+    objectManifest = loadInputFile(strManifest)
+    if (not isinstance(objectManifest, list)):
+        raise NetworkNarcoticError("The manifest should be a list of entries containing an input and an output file. Aborting.")
+
+    strBaseDirectory = os.path.dirname(os.path.abspath(strManifest))
+    arrayJobs = []
+    for objectEntry in objectManifest:
+        if (not isinstance(objectEntry, dict) or not isinstance(objectEntry.get("input"), str) or not isinstance(objectEntry.get("output"), str)):
+            raise NetworkNarcoticError("Every manifest entry needs an input and an output file, but found: " + str(objectEntry) + ". Aborting.")
+        arrayJobs.append((os.path.join(strBaseDirectory, objectEntry["input"]), os.path.join(strBaseDirectory, objectEntry["output"]), objectEntry.get("name")))
+
+    return arrayJobs
+
+def runBatch(arrayJobs, intWorkers=None, strName=str_DEFAULT_NAME, strGatewayInterface=None, floatGatewayTimeout=1.0, intGatewayCacheTTL=3600, strLayout=str_DEFAULT_LAYOUT, intLayoutSeed=int_DEFAULT_SEED, booleanCompact=False, booleanArchive=None, strSeed=None, booleanCache=False) -> list:
+    from concurrent.futures import ProcessPoolExecutor # Required for building many input files in parallel
+
+    arrayResults = [None] * len(arrayJobs) # Kept in the same order as the jobs, regardless of which one finishes first
+    dictFutures = {}
+
+    with ProcessPoolExecutor(max_workers=intWorkers) as executor:
+        for intIndex, (strInput, strOutput, strJobName) in enumerate(arrayJobs):
+            if (strOutput == None):
+                arrayResults[intIndex] = {"input": strInput, "output": None, "status": "error", "error": "No input files match this pattern.", "seconds": 0.0}
+                continue
+
+            if (os.path.dirname(strOutput) != ""):
+                os.makedirs(os.path.dirname(strOutput), exist_ok=True)
+            dictFutures[executor.submit(buildProjectFile, strInput, strOutput, strJobName or strName, strGatewayInterface, floatGatewayTimeout, intGatewayCacheTTL, strLayout, intLayoutSeed, booleanCompact, booleanArchive, strSeed, booleanCache)] = intIndex
+
+        for future in dictFutures:
+            intIndex = dictFutures[future]
+            try:
+                arrayResults[intIndex] = future.result()
+            except Exception as err: # A crashed worker process only fails its own input file
+                arrayResults[intIndex] = {"input": arrayJobs[intIndex][0], "output": arrayJobs[intIndex][1], "status": "error", "error": type(err).__name__ + ": " + str(err), "seconds": 0.0}
+
+    return arrayResults
+
+"""
+###################################################################################################################
+Setting up the CLI.
+
+This section allows the user to specify arguments when calling the script from the CLI, such as --help, and ties the
+functions above together.
 
-print("Done building .gns3 file. Open it in GNS3, but make sure the following router image is installed: " + str_IMAGE)
\ No newline at end of file
+- watchInputFile():
+  Rebuilds the output file every time the input file changes, in the same process, so imports and remembered layouts
+  stay warm. Polls the input file, so it works the same everywhere without extra dependencies.
+
+- pushProjectFromCLI():
+  Pushes a project to a GNS3 server, printing how many of its nodes and links were created so far.
+###################################################################################################################
+"""
+def main(arrayArguments=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="nn.py",
+        description="Converts a NetworkNarcotic input file into a .gns3 project file.",
+        epilog="https://github.com/pieter2501/NetworkNarcotic")
+
+    parser.add_argument("-n", "--name", default=str_DEFAULT_NAME, help="the name of this project")
+    parser.add_argument("-i", "--input", help="the input file")
+    parser.add_argument("-o", "--output", help="the output file")
+    parser.add_argument("--gateway-interface", default=None, help="the system interface with internet access, skips detection")
+    parser.add_argument("--gateway-timeout", type=float, default=1.0, help="seconds to wait for each interface while detecting the gateway interface")
+    parser.add_argument("--gateway-cache-ttl", type=int, default=3600, help="seconds a detected gateway interface stays cached, 0 disables the cache")
+
+    parser.add_argument("--layout", choices=array_LAYOUTS, default=str_DEFAULT_LAYOUT, help="how nodes are positioned: fruchterman-reingold (default), barnes-hut or multilevel for large networks, cluster to draw every cluster on its own, a grid, or none at all")
+    parser.add_argument("--reuse-layout", metavar="PROJECT", help="keep the coordinates of every node that already exists in this .gns3 file and only lay out new nodes")
+    parser.add_argument("--layout-seed", type=int, default=int_DEFAULT_SEED, help="the seed of the layout engine, the same seed always gives the same layout")
+    parser.add_argument("--seed", help="derive every identifier from this seed and the project name instead of randomly, so the same input always gives the same bytes")
+    parser.add_argument("--cache", action="store_true", help="remember layouts in ~/.cache/networknarcotic/builds, so rebuilding the same output file only lays out the clusters that changed")
+    parser.add_argument("--compact", action="store_true", help="write the .gns3 file without indentation, which makes it a lot smaller")
+    parser.add_argument("--archive", action="store_true", help="write a zipped .gns3project archive instead, which GNS3 can import directly (implied by a .gns3project output file)")
+    parser.add_argument("--batch", nargs="+", metavar="PATTERN", help="build every input file matching these glob patterns, each into a .gns3 file with the same name")
+    parser.add_argument("--manifest", help="build every pair of input and output files listed in this .yml or .json file")
+    parser.add_argument("--output-dir", help="the directory to write .gns3 files to in batch mode, instead of next to each input file")
+    parser.add_argument("--workers", type=int, default=None, help="the amount of worker processes in batch mode or for --configs, defaults to the amount of CPUs")
+    parser.add_argument("--summary", help="write the per-file results and timings of batch mode to this .json file")
+    parser.add_argument("--watch", action="store_true", help="keep running and rebuild the output file whenever the input file changes, printing how long every stage took")
+    parser.add_argument("--plan", action="store_true", help="don't build anything, but report how many nodes and links the input file turns into and how many ports every device needs")
+    parser.add_argument("--ansible", metavar="FILE", help="also write an Ansible inventory with a group per router and switch cluster to this .yml file")
+    parser.add_argument("--graphml", metavar="FILE", help="also write the network as a GraphML graph to this file, for networkx, Gephi or yEd")
+    parser.add_argument("--edgelist", metavar="FILE", help="also write every link with the devices and ports on both ends to this tab separated file")
+    parser.add_argument("--containerlab", metavar="FILE", help="also write a containerlab topology to this .clab.yml file")
+    parser.add_argument("--addresses", metavar="FILE", help="also plan an IP address for every router interface and write the plan to this .json file")
+    parser.add_argument("--addresses-csv", metavar="FILE", help="also write the IP address plan to this .csv file")
+    parser.add_argument("--configs", action="store_true", help="also plan IP addresses and write a startup-config for every router into the project directory of -o (or into the .gns3project archive)")
+    parser.add_argument("--p2p-prefix", type=int, choices=[30, 31], default=30, help="the prefix length of point-to-point subnets in the address plan, 30 (default) or 31")
+    parser.add_argument("--push", metavar="SERVER", help="create the project directly on this GNS3 server through its REST API, such as http://localhost:3080, instead of (or next to) writing an output file")
+    parser.add_argument("--push-concurrency", type=int, default=None, help="the amount of requests sent to the GNS3 server at the same time, 8 by default")
+    parser.add_argument("--profile", action="store_true", help="print the time, peak memory and counters of every stage of the build")
+    parser.add_argument("--profile-json", metavar="FILE", help="also write the profile to this .json file (implies --profile)")
+    parser.add_argument("--profile-dump", metavar="FILE", help="also run the build under cProfile and dump its statistics to this file, for pstats or snakeviz (implies --profile)")
+
+    args = parser.parse_args(arrayArguments)
+
+    args.profile = args.profile or args.profile_json != None or args.profile_dump != None
+    dictOutputs = {strFormat: getattr(args, strFormat.replace("-", "_")) for strFormat in ("ansible", "graphml", "edgelist", "containerlab", "addresses", "addresses-csv") if getattr(args, strFormat.replace("-", "_")) != None} # Holds per other format its output file
+    if (dictOutputs and (args.watch or args.plan or args.batch != None or args.manifest != None)):
+        parser.error("--ansible, --graphml, --edgelist, --containerlab and --addresses(-csv) can only be combined with a single build, not --watch, --batch, --manifest or --plan")
+    if (args.watch and (args.batch != None or args.manifest != None)):
+        parser.error("--watch can't be combined with --batch or --manifest")
+    if (args.profile and (args.watch or args.batch != None or args.manifest != None)):
+        parser.error("--profile can only be combined with a single build, not --watch, --batch or --manifest")
+    if (args.push != None and (args.watch or args.plan or args.batch != None or args.manifest != None)):
+        parser.error("--push can't be combined with --watch, --batch, --manifest or --plan")
+    if (args.configs and (args.output == None or args.push != None or args.watch or args.plan or args.batch != None or args.manifest != None)):
+        parser.error("--configs needs -o/--output and can only be combined with a single build, not --push, --watch, --batch, --manifest or --plan")
+    if (args.batch != None or args.manifest != None):
+        runBatchFromCLI(args)
+        return
+    if (args.plan):
+        if (args.input == None or args.watch or args.profile or args.batch != None or args.manifest != None):
+            parser.error("--plan only takes an input file, -i/--input")
+        planInputFile(args.input)
+        return
+    if (args.input == None or (args.output == None and args.push == None and not dictOutputs)):
+        parser.error("the following arguments are required: -i/--input, -o/--output, --push or another output format (or --batch/--manifest)")
+    if (args.watch):
+        watchInputFile(args)
+        return
+
+    objectProfile = Profile() if args.profile else None
+    objectProfiler = None
+    if (args.profile_dump != None):
+        import cProfile # Required for dumping the statistics of every function
+        objectProfiler = cProfile.Profile()
+        objectProfiler.enable()
+    if (objectProfile != None):
+        objectProfile.start()
+
+    try:
+        dictPreviousLayout = readProjectLayout(args.reuse_layout) if args.reuse_layout != None else None
+        objectLayoutMemo = readBuildCache(getBuildCachePath(args.output)) if args.cache and args.output != None else None
+        floatStage = time.perf_counter()
+        objectInputFile = loadInputFile(args.input)
+        recordTiming(objectProfile, "load", floatStage)
+        objectGNS3Project, objectEmitter = buildProject(objectInputFile, args.name, args.gateway_interface, args.gateway_timeout, args.gateway_cache_ttl, args.layout, args.layout_seed, dictPreviousLayout, args.seed, objectLayoutMemo, objectProfile)
+        print("Input file is valid! Moving on.")
+        print("Done building in-memory topology.")
+        objectAddressPlan = None
+        if ("addresses" in dictOutputs or "addresses-csv" in dictOutputs or args.configs):
+            floatStage = time.perf_counter()
+            objectAddressPlan = planProjectAddresses(objectEmitter.objectTopology, args.p2p_prefix)
+            recordTiming(objectProfile, "addressing", floatStage)
+        arrayFiles = None
+        if (args.configs):
+            floatStage = time.perf_counter()
+            arrayFiles = renderProjectConfigs(objectEmitter, objectAddressPlan, args.workers)
+            recordTiming(objectProfile, "configs", floatStage)
+            print("Done rendering the startup-config of every router.")
+        if (args.output != None or dictOutputs):
+            floatStage = time.perf_counter()
+            writeOutputs(objectGNS3Project, args.output, dictOutputs, args.name, args.compact, args.archive or None, objectAddressPlan, arrayFiles, objectEmitter)
+            recordTiming(objectProfile, "write", floatStage)
+        if (objectLayoutMemo != None):
+            writeBuildCache(getBuildCachePath(args.output), objectLayoutMemo)
+        if (args.push != None):
+            floatStage = time.perf_counter()
+            pushProjectFromCLI(objectGNS3Project, args.push, args.push_concurrency)
+            recordTiming(objectProfile, "push", floatStage)
+    except NetworkNarcoticError as err:
+        print(str(err))
+        exit(1)
+    finally:
+        if (objectProfiler != None):
+            objectProfiler.disable()
+            objectProfiler.dump_stats(args.profile_dump)
+        if (objectProfile != None):
+            objectProfile.stop()
+
+    if (objectProfile != None):
+        if (args.output != None):
+            objectProfile.count("bytes written", os.path.getsize(args.output))
+        print(objectProfile.formatReport())
+        if (args.profile_json != None):
+            with open(args.profile_json, "w") as output:
+                json.dump(objectProfile.getReport(), output, indent=4)
+
+    for strFormat, strPath in dictOutputs.items():
+        print("Done writing the " + strFormat + " output to " + strPath + ".")
+    if (args.output != None):
+        print("Done building .gns3 file. Open it in GNS3, but make sure the following router image is installed: " + str_IMAGE)
+
+def pushProjectFromCLI(objectGNS3Project, strServer, intConcurrency=None) -> None:
+    from nn_push import pushProject, PushError, int_PUSH_CONCURRENCY # Required for pushing projects
+
+    def printProgress(intNodesDone, intNodes, intLinksDone, intLinks) -> None:
+        print("\rPushing to " + strServer + ": " + str(intNodesDone) + "/" + str(intNodes) + " nodes, " + str(intLinksDone) + "/" + str(intLinks) + " links", end="", flush=True)
+
+    try:
+        strProjectId = pushProject(objectGNS3Project, strServer, intConcurrency or int_PUSH_CONCURRENCY, printProgress)
+    except PushError as err:
+        print()
+        raise NetworkNarcoticError("Can't push the project to " + strServer + ". " + str(err) + " Aborting.")
+    print()
+    print("Done pushing project " + strProjectId + " to " + strServer + ". Open it in GNS3, but make sure the following router image is installed on the server: " + str_IMAGE)
+
+def planInputFile(strInput) -> None:
+    floatStart = time.perf_counter()
+    try:
+        objectPlan = planTopology(loadInputFile(strInput))
+    except NetworkNarcoticError as err:
+        print(str(err))
+        exit(1)
+
+    print(f"{'cluster':<24} {'type':<8} {'devices':>8} {'ports':>8}")
+    for objectCluster in objectPlan["clusters"]:
+        strPorts = str(objectCluster["min_ports"]) if objectCluster["min_ports"] == objectCluster["max_ports"] else str(objectCluster["min_ports"]) + "-" + str(objectCluster["max_ports"])
+        print(f"{objectCluster['tag']:<24} {objectCluster['type']:<8} {objectCluster['devices']:>8} {strPorts:>8}")
+    print("\n" + strInput + " turns into " + str(objectPlan["nodes"]) + " nodes (" + str(objectPlan["routers"]) + " routers, " + str(objectPlan["switches"]) + " switches and " + str(objectPlan["clouds"]) + " clouds) and " + str(objectPlan["links"]) + " links, planned in " + f"{(time.perf_counter() - floatStart) * 1000:.1f}ms.")
+
+    if (objectPlan["violations"]):
+        print(formatPortViolations(objectPlan["violations"]))
+        exit(1)
+    print("Every device fits in the " + str(objectPlan["port_limit"]) + "-port limit.")
+
+def watchInputFile(args) -> None:
+    objectLayoutMemo = readBuildCache(getBuildCachePath(args.output)) if args.cache else LayoutMemo() # A warm process always remembers its layouts
+    tupleBuilt = None # The modification time and size of the input file that was built last
+    print("Watching " + args.input + ", press Ctrl+C to stop.")
+
+    try:
+        while True:
+            # Wait for a change, then until the input file stops changing
+            try:
+                tupleCurrent = (os.stat(args.input).st_mtime_ns, os.stat(args.input).st_size)
+            except OSError:
+                tupleCurrent = None # Editors may replace the file instead of writing it
+            if (tupleCurrent == None or tupleCurrent == tupleBuilt):
+                time.sleep(float_WATCH_INTERVAL)
+                continue
+            time.sleep(float_WATCH_DEBOUNCE)
+            try:
+                if ((os.stat(args.input).st_mtime_ns, os.stat(args.input).st_size) != tupleCurrent):
+                    continue
+            except OSError:
+                continue
+            tupleBuilt = tupleCurrent
+
+            # Rebuild
+            dictTimings = {}
+            floatStart = time.perf_counter()
+            try:
+                dictPreviousLayout = readProjectLayout(args.reuse_layout) if args.reuse_layout != None else None
+                objectInputFile = loadInputFile(args.input)
+                floatStage = recordTiming(dictTimings, "load", floatStart)
+                objectGNS3Project = buildProject(objectInputFile, args.name, args.gateway_interface, args.gateway_timeout, args.gateway_cache_ttl, args.layout, args.layout_seed, dictPreviousLayout, args.seed, objectLayoutMemo, dictTimings)[0]
+                floatStage = time.perf_counter()
+                writeProject(objectGNS3Project, args.output, args.compact, args.archive or None)
+                floatStage = recordTiming(dictTimings, "write", floatStage)
+                objectLayoutMemo = LayoutMemo(objectLayoutMemo.getRecentEntries())
+                if (args.cache):
+                    writeBuildCache(getBuildCachePath(args.output), objectLayoutMemo)
+                    recordTiming(dictTimings, "cache", floatStage)
+            except (NetworkNarcoticError, OSError) as err:
+                print(time.strftime("%H:%M:%S") + " Building failed, waiting for the next change. " + str(err))
+                continue
+
+            print(time.strftime("%H:%M:%S") + " Rebuilt " + args.output + " in " + f"{time.perf_counter() - floatStart:.3f}s (" + ", ".join(f"{strStage} {floatSeconds:.3f}s" for strStage, floatSeconds in dictTimings.items()) + "), " + str(len(objectGNS3Project["topology"]["nodes"])) + " nodes and " + str(len(objectGNS3Project["topology"]["links"])) + " links.")
+    except KeyboardInterrupt:
+        print("Stopped watching " + args.input + ".")
+
+def runBatchFromCLI(args) -> None:
+    try:
+        arrayJobs = expandBatchPatterns(args.batch or [], args.output_dir, ".gns3project" if args.archive else ".gns3")
+        if (args.manifest != None):
+            arrayJobs += readManifest(args.manifest)
+    except NetworkNarcoticError as err:
+        print(str(err))
+        exit(1)
+
+    floatStart = time.perf_counter()
+    arrayResults = runBatch(arrayJobs, args.workers, args.name, args.gateway_interface, args.gateway_timeout, args.gateway_cache_ttl, args.layout, args.layout_seed, args.compact, args.archive or None, args.seed, args.cache)
+    floatTotal = time.perf_counter() - floatStart
+    intFailed = sum(1 for objectResult in arrayResults if objectResult["status"] != "ok")
+
+    for objectResult in arrayResults:
+        print(f"{objectResult['status']:<6} {objectResult['seconds']:>8.3f}s  {objectResult['input']} -> {objectResult['output']}")
+        if (objectResult["error"] != None):
+            print("       " + objectResult["error"].replace("\n", "\n       "))
+    print("Built " + str(len(arrayResults) - intFailed) + " of " + str(len(arrayResults)) + " input files in " + str(round(floatTotal, 3)) + "s.")
+
+    if (args.summary != None):
+        with open(args.summary, "w") as stream:
+            json.dump({"seconds": round(floatTotal, 4), "built": len(arrayResults) - intFailed, "failed": intFailed, "files": arrayResults}, stream, indent=4)
+
+    if (intFailed > 0):
+        exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+import ipaddress            # Required for parsing and formatting addresses
+from array import array     # Required for storing addresses compactly
+from nn_topology import int_ROUTER, int_SWITCH, int_CLOUD # Required for addressing topologies
+
+"""
+###################################################################################################################
+Defining global variables.
+
+This section specifies variables that display repeated use throughout the addressing planner.
+###################################################################################################################
+"""
+dict_IP_CLASSES = {"A": ipaddress.IPv4Network("10.0.0.0/8"), "B": ipaddress.IPv4Network("172.16.0.0/12"), "C": ipaddress.IPv4Network("192.168.0.0/16")} # The private range every ipclass allocates its automatic summaries from
+int_DEFAULT_P2P_PREFIX = 30 # Point-to-point subnets are /30 by default, /31 (RFC 3021) halves the addresses they take
+str_ROUTER_INTERFACE = "FastEthernet1/" # A router's NM-16ESW sits in slot 1
+
+"""
+###################################################################################################################
+Planning addresses.
+
+This section gives every router interface of a built topology an IPv4 address. Every router cluster and every
+connection gets a summary prefix that all of its point-to-point subnets are taken from, and every switch cluster is a
+single LAN that every router connected to it gets one address in, shared by all of its links to that LAN. Links
+between switches are layer 2 only, and gateway links get their address from the cloud (DHCP), so neither is addressed.
+
+A summary is either the ipsummary of the cluster or connection in the input file, or, with "auto", the smallest block
+that fits its subnets, taken from the private range of its ipclass (A: 10.0.0.0/8, B: 172.16.0.0/12, C: 192.168.0.0/16)
+by a buddy allocator. A buddy allocator keeps a list of free blocks per prefix length and splits a larger block in
+halves when no block of the right size is free, so taking a block costs at most 32 steps however full the range is.
+Inside a summary, subnets and LAN addresses are handed out by a counter, so addressing a link takes constant time.
+Addresses are kept as integers in typed arrays, like the topology itself, and only formatted when they're emitted.
+
+- AddressPlanError:
+  Raised when a topology can't be addressed, because an ipsummary is invalid, too small or overlaps another one, or
+  because the private range of an ipclass ran out.
+
+- BuddyAllocator:
+  Hands out aligned blocks of any prefix length from a network.
+
+- BuddyAllocator.allocate():
+  Takes the lowest free block of a prefix length, splitting a larger free block when necessary.
+
+- BuddyAllocator.reserve():
+  Takes a specific block, so it's never allocated.
+
+- AddressPlan:
+  The address of both ends of every link, its prefix length, and the summary it was taken from.
+
+- AddressPlan.iterateInterfaces():
+  Generates every addressed interface: its device, port, address and prefix length, and the link and summary it
+  belongs to.
+
+- planAddresses():
+  Plans the addresses of a built topology.
+
+- formatAddress():
+  Formats an integer as a dotted IPv4 address, much faster than ipaddress does for the many addresses of a plan.
+
+- emitAddressPlanJSON(), emitAddressPlanCSV():
+  Write an address plan as JSON, with the summaries and every interface on a line of its own, or as a CSV table of
+  every interface.
+###################################################################################################################
+"""
+class AddressPlanError(Exception):
+    pass
+
+class BuddyAllocator:
+    __slots__ = ("intNetwork", "intPrefix", "arrayFree")
+
+    def __init__(self, objectNetwork):
+        self.intNetwork = int(objectNetwork.network_address)
+        self.intPrefix = objectNetwork.prefixlen
+        self.arrayFree = [{} for intPrefix in range(33)] # Holds per prefix length its free blocks, as ordered sets of network addresses
+        self.arrayFree[self.intPrefix][int(objectNetwork.network_address)] = None
+
+    def allocate(self, intPrefix) -> int:
+        intFound = intPrefix
+        while (intFound >= self.intPrefix and not self.arrayFree[intFound]):
+            intFound -= 1
+        if (intFound < self.intPrefix):
+            return None
+
+        intNetwork = min(self.arrayFree[intFound])
+        del self.arrayFree[intFound][intNetwork]
+        while (intFound < intPrefix):
+            intFound += 1
+            self.arrayFree[intFound][intNetwork + (1 << (32 - intFound))] = None # Keep the lower half, free the upper one
+        return intNetwork
+
+    def reserve(self, intNetwork, intPrefix) -> bool:
+        if (intPrefix <= self.intPrefix):
+            if ((self.intNetwork ^ intNetwork) >> (32 - intPrefix) != 0):
+                return False # The block lies outside of the network
+            booleanFree = any(self.arrayFree)
+            self.arrayFree = [{} for intCurrent in range(33)] # The block covers the entire network
+            return booleanFree
+
+        for intFound in range(intPrefix, self.intPrefix - 1, -1):
+            intBlock = intNetwork & ~((1 << (32 - intFound)) - 1)
+            if (intBlock in self.arrayFree[intFound]):
+                del self.arrayFree[intFound][intBlock]
+                while (intFound < intPrefix):
+                    intFound += 1
+                    intHalf = 1 << (32 - intFound)
+                    # Free the half that doesn't contain the reserved block, carry on splitting the half that does
+                    if (intNetwork & intHalf):
+                        self.arrayFree[intFound][intBlock] = None
+                        intBlock += intHalf
+                    else:
+                        self.arrayFree[intFound][intBlock + intHalf] = None
+                return True
+        return False
+
+class AddressPlan:
+    __slots__ = ("objectTopology", "intP2PPrefix", "arraySummaries", "arrayStartAddresses", "arrayEndAddresses", "arrayPrefixes", "arraySummaryIndices")
+
+    def __init__(self, objectTopology, intP2PPrefix):
+        intLinks = len(objectTopology.arrayLinkStarts)
+        self.objectTopology = objectTopology
+        self.intP2PPrefix = intP2PPrefix
+        self.arraySummaries = [] # Holds per summary a tuple of its kind, tag, network and ipclass (None when it comes from the input file)
+        self.arrayStartAddresses = array("I", [0]) * intLinks # 0 when that end isn't addressed
+        self.arrayEndAddresses = array("I", [0]) * intLinks
+        self.arrayPrefixes = array("B", [0]) * intLinks # 0 when the link isn't addressed
+        self.arraySummaryIndices = array("I", [0]) * intLinks
+
+    def iterateInterfaces(self):
+        objectTopology = self.objectTopology
+        for intLink in range(len(self.arrayPrefixes)):
+            if (self.arrayPrefixes[intLink] == 0):
+                continue
+            for intDevice, intPort, intAddress in ((objectTopology.arrayLinkStarts[intLink], objectTopology.arrayLinkStartPorts[intLink], self.arrayStartAddresses[intLink]), (objectTopology.arrayLinkEnds[intLink], objectTopology.arrayLinkEndPorts[intLink], self.arrayEndAddresses[intLink])):
+                if (intAddress != 0):
+                    yield intDevice, intPort, intAddress, self.arrayPrefixes[intLink], intLink, self.arraySummaryIndices[intLink]
+
+def planAddresses(objectTopology, intP2PPrefix=int_DEFAULT_P2P_PREFIX) -> AddressPlan:
+    objectPlan = AddressPlan(objectTopology, intP2PPrefix)
+    arrayTypes = objectTopology.arrayDeviceTypes
+    arrayStarts = objectTopology.arrayLinkStarts
+    arrayEnds = objectTopology.arrayLinkEnds
+    intP2PSize = 1 << (32 - intP2PPrefix)
+
+    # Every cluster or connection owns the links of its groups; a tag that occurs more than once keeps its first definition
+    dictOwners = {} # Holds per tuple of kind and tag the owner's definition, its amount of subnets or LAN addresses and, later, its summary
+    arrayBounds = [tupleGroup[0] for tupleGroup in objectTopology.arrayLinkGroups[1:]] + [len(arrayStarts)]
+    arrayRanges = [] # Holds per group its owner and range of links
+    for tupleGroup, intBound in zip(objectTopology.arrayLinkGroups, arrayBounds):
+        intFirst, strKind, objectDefinition = tupleGroup
+        arrayRanges.append((dictOwners.setdefault((strKind, objectDefinition["tag"]), [objectDefinition, 0, None, None]), intFirst, intBound))
+
+    # Count what every owner needs: routers on both ends take a point-to-point subnet, a router a LAN address per LAN
+    dictLANAddresses = {} # Holds per tuple of a router and a LAN the router's address in it, 0 until it's handed out
+    for arrayOwner, intFirst, intBound in arrayRanges:
+        for intLink in range(intFirst, intBound):
+            intStartType = arrayTypes[arrayStarts[intLink]]
+            intEndType = arrayTypes[arrayEnds[intLink]]
+            if (intStartType == int_ROUTER and intEndType == int_ROUTER):
+                arrayOwner[1] += 1
+            elif (int_CLOUD not in (intStartType, intEndType) and int_ROUTER in (intStartType, intEndType)):
+                intSwitch = arrayEnds[intLink] if intEndType == int_SWITCH else arrayStarts[intLink]
+                objectCluster = objectTopology.arrayClusters[objectTopology.arrayDeviceClusters[intSwitch]]
+                arrayLAN = dictOwners.get(("switch", objectCluster.strTag))
+                if (arrayLAN == None):
+                    # A switch cluster of a single switch has no links of its own, and no group
+                    arrayLAN = dictOwners[("switch", objectCluster.strTag)] = [{"tag": objectCluster.strTag, "ipclass": "A", "ipsummary": "auto"}, 0, None, None]
+                    for objectSwitchCluster in (tupleGroup[2].get("switches") for tupleGroup in objectTopology.arrayLinkGroups if tupleGroup[1] == "connection"):
+                        if (objectSwitchCluster != None and objectSwitchCluster["tag"] == objectCluster.strTag):
+                            arrayLAN[0] = objectSwitchCluster
+                            break
+                intRouter = arrayStarts[intLink] if intStartType == int_ROUTER else arrayEnds[intLink]
+                if ((intRouter, id(arrayLAN)) not in dictLANAddresses):
+                    dictLANAddresses[(intRouter, id(arrayLAN))] = 0
+                    arrayLAN[1] += 1
+
+    def getNeeded(strKind, arrayOwner) -> int:
+        return arrayOwner[1] + 2 if strKind == "switch" else arrayOwner[1] * intP2PSize # A LAN needs a network and broadcast address too
+
+    # Input summaries are taken first, so automatic ones are allocated around them
+    dictAllocators = {strClass: BuddyAllocator(objectNetwork) for strClass, objectNetwork in dict_IP_CLASSES.items()}
+    arrayTaken = [] # Holds a tuple of the first and last address and the description of every input summary
+    for (strKind, strTag), arrayOwner in dictOwners.items():
+        strSummary = arrayOwner[0]["ipsummary"]
+        if (strSummary == "auto"):
+            continue
+        strOwner = "the " + strKind + (" cluster" if strKind != "connection" else "") + " with tag " + strTag
+        try:
+            objectNetwork = ipaddress.IPv4Network(strSummary)
+            if (objectNetwork.network_address.is_unspecified):
+                raise ValueError("0.0.0.0 can't be given to an interface")
+        except ValueError as err:
+            raise AddressPlanError("The ipsummary " + strSummary + " of " + strOwner + " isn't a valid network (" + str(err) + ").")
+        if (arrayOwner[1] > 0 and getNeeded(strKind, arrayOwner) > objectNetwork.num_addresses):
+            raise AddressPlanError("The ipsummary " + strSummary + " of " + strOwner + " is too small for its " + str(arrayOwner[1]) + (" routers." if strKind == "switch" else " point-to-point links."))
+        arrayOwner[2] = objectNetwork
+        arrayTaken.append((int(objectNetwork.network_address), int(objectNetwork.broadcast_address), strOwner))
+        for objectAllocator in dictAllocators.values():
+            objectAllocator.reserve(int(objectNetwork.network_address), objectNetwork.prefixlen)
+
+    arrayTaken.sort()
+    for tuplePrevious, tupleCurrent in zip(arrayTaken, arrayTaken[1:]):
+        if (tupleCurrent[0] <= tuplePrevious[1]):
+            raise AddressPlanError("The ipsummary of " + tuplePrevious[2] + " overlaps with the one of " + tupleCurrent[2] + ".")
+
+    # Then the largest automatic summaries first, which keeps the ranges of every ipclass tightly packed
+    arrayAutomatic = [(getNeeded(strKind, arrayOwner), strKind, strTag, arrayOwner) for (strKind, strTag), arrayOwner in dictOwners.items() if arrayOwner[2] == None and arrayOwner[1] > 0]
+    arrayAutomatic.sort(key=lambda tupleOwner: -tupleOwner[0]) # Stable, so equally large summaries keep the order of the topology
+    for intNeeded, strKind, strTag, arrayOwner in arrayAutomatic:
+        intPrefix = 32 - (intNeeded - 1).bit_length()
+        strClass = arrayOwner[0]["ipclass"]
+        intNetwork = dictAllocators[strClass].allocate(intPrefix)
+        if (intNetwork == None):
+            raise AddressPlanError("The class " + strClass + " range " + str(dict_IP_CLASSES[strClass]) + " has no room left for the " + str(arrayOwner[1]) + (" routers" if strKind == "switch" else " point-to-point links") + " of the " + strKind + (" cluster" if strKind != "connection" else "") + " with tag " + strTag + ". Use another ipclass or an ipsummary.")
+        arrayOwner[2] = ipaddress.IPv4Network((intNetwork, intPrefix))
+        arrayOwner[3] = strClass
+
+    # Every owner with a summary becomes one, and hands out its addresses with a counter
+    dictSummaryIndices = {}
+    dictCounters = {}
+    for (strKind, strTag), arrayOwner in dictOwners.items():
+        if (arrayOwner[2] != None):
+            dictSummaryIndices[id(arrayOwner)] = len(objectPlan.arraySummaries)
+            objectPlan.arraySummaries.append((strKind, strTag, arrayOwner[2], arrayOwner[3]))
+            dictCounters[id(arrayOwner)] = int(arrayOwner[2].network_address) + (1 if strKind == "switch" else 0) # A LAN starts after its network address
+
+    for arrayOwner, intFirst, intBound in arrayRanges:
+        for intLink in range(intFirst, intBound):
+            intStartType = arrayTypes[arrayStarts[intLink]]
+            intEndType = arrayTypes[arrayEnds[intLink]]
+            if (intStartType == int_ROUTER and intEndType == int_ROUTER):
+                intSubnet = dictCounters[id(arrayOwner)]
+                dictCounters[id(arrayOwner)] = intSubnet + intP2PSize
+                intHost = 1 if intP2PSize > 2 else 0 # A /31 has no network and broadcast address
+                objectPlan.arrayStartAddresses[intLink] = intSubnet + intHost
+                objectPlan.arrayEndAddresses[intLink] = intSubnet + intHost + 1
+                objectPlan.arrayPrefixes[intLink] = intP2PPrefix
+                objectPlan.arraySummaryIndices[intLink] = dictSummaryIndices[id(arrayOwner)]
+            elif (int_CLOUD not in (intStartType, intEndType) and int_ROUTER in (intStartType, intEndType)):
+                intSwitch = arrayEnds[intLink] if intEndType == int_SWITCH else arrayStarts[intLink]
+                arrayLAN = dictOwners[("switch", objectTopology.arrayClusters[objectTopology.arrayDeviceClusters[intSwitch]].strTag)]
+                intRouter = arrayStarts[intLink] if intStartType == int_ROUTER else arrayEnds[intLink]
+                intAddress = dictLANAddresses[(intRouter, id(arrayLAN))]
+                if (intAddress == 0):
+                    # Every other link between the same router and LAN, more cables or another switch, reuses this address
+                    intAddress = dictLANAddresses[(intRouter, id(arrayLAN))] = dictCounters[id(arrayLAN)]
+                    dictCounters[id(arrayLAN)] = intAddress + 1
+                if (intStartType == int_ROUTER):
+                    objectPlan.arrayStartAddresses[intLink] = intAddress
+                else:
+                    objectPlan.arrayEndAddresses[intLink] = intAddress
+                objectPlan.arrayPrefixes[intLink] = arrayLAN[2].prefixlen
+                objectPlan.arraySummaryIndices[intLink] = dictSummaryIndices[id(arrayLAN)]
+
+    return objectPlan
+
+def formatAddress(intAddress) -> str:
+    return str(intAddress >> 24) + "." + str((intAddress >> 16) & 255) + "." + str((intAddress >> 8) & 255) + "." + str(intAddress & 255)
+
+def emitAddressPlanJSON(stream, objectPlan) -> None:
+    import json # Required for writing address plans
+
+    objectTopology = objectPlan.objectTopology
+    stream.write('{\n    "p2p_prefix": ' + str(objectPlan.intP2PPrefix) + ',\n    "summaries": [')
+    for intSummary, tupleSummary in enumerate(objectPlan.arraySummaries):
+        strKind, strTag, objectNetwork, strClass = tupleSummary
+        stream.write(("," if intSummary > 0 else "") + "\n        " + json.dumps({"kind": strKind, "tag": strTag, "summary": str(objectNetwork), "ipclass": strClass}))
+    stream.write('\n    ],\n    "interfaces": [')
+    # Interfaces are written one per line, json.dump() takes seconds to indent tens of thousands of them
+    for intInterface, tupleInterface in enumerate(objectPlan.iterateInterfaces()):
+        intDevice, intPort, intAddress, intPrefix, intLink, intSummary = tupleInterface
+        stream.write(("," if intInterface > 0 else "") + '\n        {"device": ' + json.dumps(objectTopology.getDeviceName(intDevice)) + ', "interface": "' + str_ROUTER_INTERFACE + str(intPort)
+                     + '", "address": "' + formatAddress(intAddress) + '", "prefix": ' + str(intPrefix) + ', "link": ' + str(intLink) + ', "summary": ' + str(intSummary) + '}')
+    stream.write("\n    ]\n}\n")
+
+def emitAddressPlanCSV(stream, objectPlan) -> None:
+    import csv # Required for writing address plans
+
+    objectTopology = objectPlan.objectTopology
+    writer = csv.writer(stream, lineterminator="\n")
+    writer.writerow(["device", "interface", "address", "prefix", "subnet", "link", "kind", "tag"])
+    for intDevice, intPort, intAddress, intPrefix, intLink, intSummary in objectPlan.iterateInterfaces():
+        strKind, strTag, objectNetwork, strClass = objectPlan.arraySummaries[intSummary]
+        intMask = (0xFFFFFFFF << (32 - intPrefix)) & 0xFFFFFFFF
+        writer.writerow([objectTopology.getDeviceName(intDevice), str_ROUTER_INTERFACE + str(intPort), formatAddress(intAddress), intPrefix, formatAddress(intAddress & intMask) + "/" + str(intPrefix), intLink, strKind, strTag])
+
+dict_PLAN_EMITTERS = {
+    "addresses": emitAddressPlanJSON,
+    "addresses-csv": emitAddressPlanCSV
+}
@@ -0,0 +1,239 @@
+import os                   # Required for rendering startup-configs in parallel
+from collections import Counter # Required for choosing default routes
+from itertools import repeat # Required for rendering startup-configs in parallel
+from nn_topology import int_ROUTER, int_SWITCH, int_CLOUD # Required for configuring topologies
+from nn_addressing import formatAddress, str_ROUTER_INTERFACE # Required for configuring addresses
+
+"""
+###################################################################################################################
+Defining global variables.
+
+This section specifies variables that display repeated use throughout the startup-configs.
+###################################################################################################################
+"""
+str_STARTUP_CONFIG = "configs/i{}_startup-config.cfg" # Where a dynamips router with a certain dynamips_id looks for its startup-config, relative to its node directory
+str_NODE_DIRECTORY = "project-files/dynamips/" # Where the directory of every dynamips node lives, relative to the project directory
+int_VLAN_BASE = 100 # The ports of an NM-16ESW are switchports, so every subnet gets a VLAN interface: the VLAN of a port is this plus its number
+int_PARALLEL_THRESHOLD = 64 # Routers a project needs before starting worker processes pays off
+object_WORKER_PLAN = None # The ConfigPlan of a worker process, handed over once when it starts
+
+tuple_MASKS = tuple(formatAddress((0xFFFFFFFF << (32 - intPrefix)) & 0xFFFFFFFF) for intPrefix in range(33)) # Holds per prefix length its netmask
+
+# The templates every startup-config is rendered from, already bound to their format() method
+function_HEADER = "!\nhostname {hostname}\n!\nno ip domain-lookup\nip cef\n!\n".format
+function_PORT = "interface {interface}\n description {description}\n switchport access vlan {vlan}\n no shutdown\n!\n".format
+function_VLAN = "interface Vlan{vlan}\n ip address {address}\n no shutdown\n!\n".format
+function_ROUTE = "ip route {network} {mask} {hop}\n".format
+str_FOOTER = "!\nline con 0\n logging synchronous\n!\nend\n"
+
+"""
+###################################################################################################################
+Configuring routers.
+
+This section renders a startup-config for every router of an addressed topology (see nn_addressing.py), so routers
+boot with their hostname, addresses and routes instead of unconfigured. Every port of the NM-16ESW in slot 1 that has
+a link is put in a VLAN of its own, whose VLAN interface gets the planned address; a router that's connected to the
+same switch cluster more than once puts all of those ports in one VLAN. The port towards a gateway cloud gets its
+address from DHCP, which also gives the gateway router its default route.
+
+Routers with routing "static" get a static route to every subnet they aren't connected to. Every router searches the
+network breadth first from itself, so the next hop of every route is the first router on a shortest path. When every
+subnet of a summary that isn't connected has the same next hop, a single route to the summary replaces them. Finally,
+a default route towards the nearest gateway router (or, without one, through the most common next hop) replaces every
+route through the same next hop, so a router at the edge of the network only needs a few routes.
+
+Everything a router's config needs is collected once into a ConfigPlan, and the templates are format strings that
+are bound once, when the module is imported, and reused for every router. Large projects are rendered by a pool of
+worker processes, which each get the ConfigPlan once and then render a range of routers at a time. Nothing is written
+here: the startup-configs are returned with their path in the project, so they're written together with the project
+file itself.
+
+- ConfigPlan:
+  Per router its name, config file, ports, VLAN interfaces and routing, plus the graph of routers and LANs, the
+  subnets and the summaries the routes are computed from. Routers and LANs are nodes in the graph: routers are
+  numbered from 0, LANs after the last router.
+
+- prepareConfigs():
+  Collects the ConfigPlan of an addressed topology and the GNS3Emitter it's written with.
+
+- findRoutes():
+  Returns the static routes of a router, as tuples of a network, prefix length and next hop.
+
+- renderConfig():
+  Renders the startup-config of a router.
+
+- renderConfigs():
+  Renders the startup-config of every router, in worker processes for large projects, and returns them with their
+  path in the project.
+
+- renderRange():
+  Renders the startup-configs of a range of routers.
+
+- initializeWorker(), renderRangeInWorker():
+  Keep the ConfigPlan in a worker process, and render a range of routers with it.
+###################################################################################################################
+"""
+class ConfigPlan:
+    __slots__ = ("arrayNames", "arrayPaths", "arrayPorts", "arrayVLANs", "arrayStatic", "arrayAdjacency", "arraySubnets", "arraySummaries", "arrayGateways")
+
+    def __init__(self):
+        self.arrayNames = []
+        self.arrayPaths = [] # Holds per router its startup-config, relative to the project directory
+        self.arrayPorts = [] # Holds per router a list of its used ports, as a tuple of the port, a description and its VLAN
+        self.arrayVLANs = [] # Holds per router a list of its VLAN interfaces, as a tuple of the VLAN and its address
+        self.arrayStatic = [] # Holds per router whether it's routed statically
+        self.arrayAdjacency = [] # Holds per node a list of its neighbours, as a tuple of the neighbour and the address to reach it (0 from a router to a LAN)
+        self.arraySubnets = [] # Holds per subnet a tuple of its network, prefix length and the two nodes it's reached through (the same LAN twice for a LAN)
+        self.arraySummaries = [] # Holds per summary a tuple of its network, prefix length and subnets
+        self.arrayGateways = [] # Holds every router connected to a gateway cloud
+
+def prepareConfigs(objectAddressPlan, objectEmitter) -> ConfigPlan:
+    objectTopology = objectAddressPlan.objectTopology
+    objectConfigPlan = ConfigPlan()
+    arrayTypes = objectTopology.arrayDeviceTypes
+
+    # Only "static" exists, which is also the default of a router cluster without links of its own (and so without a group)
+    dictRouting = {tupleGroup[2]["tag"]: tupleGroup[2]["routing"] for tupleGroup in reversed(objectTopology.arrayLinkGroups) if tupleGroup[1] == "router"}
+    dictRouters = {} # Holds per router device its number in the ConfigPlan
+    for intDevice, intType in enumerate(arrayTypes):
+        if (intType == int_ROUTER):
+            dictRouters[intDevice] = len(objectConfigPlan.arrayNames)
+            objectConfigPlan.arrayNames.append(objectTopology.getDeviceName(intDevice))
+            objectConfigPlan.arrayPaths.append(str_NODE_DIRECTORY + objectEmitter.getNodeId(intDevice) + "/" + str_STARTUP_CONFIG.format(objectEmitter.arrayDynamipsIds[intDevice]))
+            objectConfigPlan.arrayStatic.append(dictRouting.get(objectTopology.arrayClusters[objectTopology.arrayDeviceClusters[intDevice]].strTag, "static") == "static")
+    intRouters = len(dictRouters)
+    objectConfigPlan.arrayPorts = [[] for intRouter in range(intRouters)]
+    objectConfigPlan.arrayVLANs = [[] for intRouter in range(intRouters)]
+    objectConfigPlan.arrayAdjacency = [[] for intRouter in range(intRouters)]
+    objectConfigPlan.arraySummaries = [(int(tupleSummary[2].network_address), tupleSummary[2].prefixlen, []) for tupleSummary in objectAddressPlan.arraySummaries]
+
+    dictLANs = {} # Holds per summary of a switch cluster its node
+    dictLANVLANs = {} # Holds per tuple of a router and a LAN the VLAN the router put the LAN in
+    for intLink in range(len(objectTopology.arrayLinkStarts)):
+        arrayEnds = ((objectTopology.arrayLinkStarts[intLink], objectTopology.arrayLinkStartPorts[intLink], objectAddressPlan.arrayStartAddresses[intLink]), (objectTopology.arrayLinkEnds[intLink], objectTopology.arrayLinkEndPorts[intLink], objectAddressPlan.arrayEndAddresses[intLink]))
+        intPrefix = objectAddressPlan.arrayPrefixes[intLink]
+        intSummary = objectAddressPlan.arraySummaryIndices[intLink]
+        intMask = (0xFFFFFFFF << (32 - intPrefix)) & 0xFFFFFFFF
+        for intSide, tupleEnd in enumerate(arrayEnds):
+            intDevice, intPort, intAddress = tupleEnd
+            if (arrayTypes[intDevice] != int_ROUTER):
+                continue
+            intRouter = dictRouters[intDevice]
+            intPeer, intPeerPort, intPeerAddress = arrayEnds[1 - intSide]
+            intPeerType = arrayTypes[intPeer]
+            intVLAN = int_VLAN_BASE + intPort
+            strDescription = "to " + objectTopology.getDeviceName(intPeer) + (" " + str_ROUTER_INTERFACE + str(intPeerPort) if intPeerType == int_ROUTER else " Ethernet" + str(intPeerPort) if intPeerType == int_SWITCH else "")
+
+            if (intPeerType == int_CLOUD):
+                objectConfigPlan.arrayVLANs[intRouter].append((intVLAN, "dhcp"))
+                objectConfigPlan.arrayGateways.append(intRouter)
+            elif (intPeerType == int_ROUTER and intPrefix != 0):
+                if (intSide == 0):
+                    # A point-to-point subnet is added once, reached through the routers on both ends
+                    objectConfigPlan.arraySummaries[intSummary][2].append(len(objectConfigPlan.arraySubnets))
+                    objectConfigPlan.arraySubnets.append((intAddress & intMask, intPrefix, intRouter, dictRouters[intPeer]))
+                objectConfigPlan.arrayAdjacency[intRouter].append((dictRouters[intPeer], intPeerAddress))
+                objectConfigPlan.arrayVLANs[intRouter].append((intVLAN, formatAddress(intAddress) + " " + tuple_MASKS[intPrefix]))
+            elif (intPeerType == int_SWITCH and intPrefix != 0):
+                if (intSummary not in dictLANs):
+                    # A LAN is a node of its own, so its routers don't need a link to one another
+                    dictLANs[intSummary] = intRouters + len(dictLANs)
+                    objectConfigPlan.arraySummaries[intSummary][2].append(len(objectConfigPlan.arraySubnets))
+                    objectConfigPlan.arraySubnets.append((intAddress & intMask, intPrefix, dictLANs[intSummary], dictLANs[intSummary]))
+                    objectConfigPlan.arrayAdjacency.append([])
+                intLAN = dictLANs[intSummary]
+                if ((intRouter, intLAN) in dictLANVLANs):
+                    intVLAN = dictLANVLANs[(intRouter, intLAN)] # Every other port to the same LAN joins the VLAN of the first one
+                else:
+                    dictLANVLANs[(intRouter, intLAN)] = intVLAN
+                    objectConfigPlan.arrayAdjacency[intRouter].append((intLAN, 0))
+                    objectConfigPlan.arrayAdjacency[intLAN].append((intRouter, intAddress))
+                    objectConfigPlan.arrayVLANs[intRouter].append((intVLAN, formatAddress(intAddress) + " " + tuple_MASKS[intPrefix]))
+            objectConfigPlan.arrayPorts[intRouter].append((intPort, strDescription, intVLAN))
+
+    for intRouter in range(intRouters):
+        objectConfigPlan.arrayPorts[intRouter].sort()
+        objectConfigPlan.arrayVLANs[intRouter].sort()
+    return objectConfigPlan
+
+def findRoutes(objectConfigPlan, intRouter) -> list:
+    # Search breadth first: every node remembers the next hop that leads to it, and the order it was found in
+    arrayAdjacency = objectConfigPlan.arrayAdjacency
+    arrayHops = [0] * len(arrayAdjacency) # 0 until found, and for the router itself and the LANs it's on
+    arrayOrders = [-1] * len(arrayAdjacency)
+    arrayOrders[intRouter] = 0
+    arrayFrontier = [intRouter]
+    intOrder = 1
+    while (arrayFrontier):
+        arrayNext = []
+        for intNode in arrayFrontier:
+            for intNeighbour, intAddress in arrayAdjacency[intNode]:
+                if (arrayOrders[intNeighbour] == -1):
+                    arrayOrders[intNeighbour] = intOrder
+                    arrayHops[intNeighbour] = arrayHops[intNode] or intAddress # Only nodes next to the router (or to a LAN it's on) pick their own address
+                    intOrder += 1
+                    arrayNext.append(intNeighbour)
+        arrayFrontier = arrayNext
+
+    # Every subnet is reached through the nearest of its nodes; connected (and unreachable) subnets have no next hop
+    arraySubnetHops = [arrayHops[intFirst] if arrayOrders[intFirst] <= arrayOrders[intSecond] else arrayHops[intSecond] for intNetwork, intPrefix, intFirst, intSecond in objectConfigPlan.arraySubnets]
+    arrayRoutes = []
+    for intNetwork, intPrefix, arraySummarySubnets in objectConfigPlan.arraySummaries:
+        setHops = {arraySubnetHops[intSubnet] for intSubnet in arraySummarySubnets}
+        setHops.discard(0)
+        if (len(setHops) == 1):
+            arrayRoutes.append((intNetwork, intPrefix, setHops.pop())) # Connected subnets inside the summary are more specific, so they still win
+        elif (setHops):
+            arrayRoutes += [(objectConfigPlan.arraySubnets[intSubnet][0], objectConfigPlan.arraySubnets[intSubnet][1], arraySubnetHops[intSubnet]) for intSubnet in arraySummarySubnets if arraySubnetHops[intSubnet] != 0]
+
+    # The default route leads to the nearest gateway router, or else takes the most common next hop; the routes it covers are left out
+    if (intRouter in objectConfigPlan.arrayGateways):
+        return arrayRoutes # DHCP gives gateway routers their default route
+    arrayReachable = [(arrayOrders[intGateway], arrayHops[intGateway]) for intGateway in objectConfigPlan.arrayGateways if arrayOrders[intGateway] != -1]
+    if (arrayReachable):
+        intDefault = min(arrayReachable)[1]
+    elif (arrayRoutes):
+        intDefault = Counter(tupleRoute[2] for tupleRoute in arrayRoutes).most_common(1)[0][0]
+    else:
+        return arrayRoutes
+    return [tupleRoute for tupleRoute in arrayRoutes if tupleRoute[2] != intDefault] + [(0, 0, intDefault)]
+
+def renderConfig(objectConfigPlan, intRouter) -> str:
+    arrayParts = [function_HEADER(hostname=objectConfigPlan.arrayNames[intRouter])]
+    for intPort, strDescription, intVLAN in objectConfigPlan.arrayPorts[intRouter]:
+        arrayParts.append(function_PORT(interface=str_ROUTER_INTERFACE + str(intPort), description=strDescription, vlan=intVLAN))
+    for intVLAN, strAddress in objectConfigPlan.arrayVLANs[intRouter]:
+        arrayParts.append(function_VLAN(vlan=intVLAN, address=strAddress))
+    if (objectConfigPlan.arrayStatic[intRouter]):
+        dictHops = {} # A router only has a few next hops, each is formatted once
+        for intNetwork, intPrefix, intHop in findRoutes(objectConfigPlan, intRouter):
+            if (intHop not in dictHops):
+                dictHops[intHop] = formatAddress(intHop)
+            arrayParts.append(function_ROUTE(network=formatAddress(intNetwork), mask=tuple_MASKS[intPrefix], hop=dictHops[intHop]))
+    arrayParts.append(str_FOOTER)
+    return "".join(arrayParts)
+
+def renderConfigs(objectConfigPlan, intWorkers=None) -> list:
+    intRouters = len(objectConfigPlan.arrayNames)
+    intWorkers = intWorkers or os.cpu_count() or 1
+    if (intRouters < int_PARALLEL_THRESHOLD or intWorkers <= 1):
+        return renderRange(objectConfigPlan, 0, intRouters)
+
+    from concurrent.futures import ProcessPoolExecutor # Required for rendering startup-configs in parallel
+
+    intChunk = max(16, -(-intRouters // (intWorkers * 4))) # A few ranges per worker, so a slow range doesn't hold up the others
+    arrayResults = []
+    with ProcessPoolExecutor(max_workers=intWorkers, initializer=initializeWorker, initargs=(objectConfigPlan,)) as executor:
+        for arrayRendered in executor.map(renderRangeInWorker, range(0, intRouters, intChunk), repeat(intChunk)):
+            arrayResults += arrayRendered
+    return arrayResults
+
+def renderRange(objectConfigPlan, intFirst, intBound) -> list:
+    return [(objectConfigPlan.arrayPaths[intRouter], renderConfig(objectConfigPlan, intRouter)) for intRouter in range(intFirst, min(intBound, len(objectConfigPlan.arrayNames)))]
+
+def initializeWorker(objectConfigPlan) -> None:
+    global object_WORKER_PLAN
+    object_WORKER_PLAN = objectConfigPlan
+
+def renderRangeInWorker(intFirst, intLength) -> list:
+    return renderRange(object_WORKER_PLAN, intFirst, intFirst + intLength)
@@ -0,0 +1,135 @@
+import os                   # Required for writing output files
+import re                   # Required for naming Ansible groups and containerlab labs
+from hashlib import sha1    # Required for naming containerlab bridges
+from uuid import uuid4      # Required for writing output files
+from xml.sax.saxutils import escape, quoteattr # Required for writing GraphML files
+from nn_topology import int_ROUTER, int_SWITCH, int_CLOUD, array_DEVICE_TYPES # Required for emitting topologies
+
+"""
+###################################################################################################################
+Defining global variables.
+
+This section specifies variables that display repeated use throughout the emitters.
+###################################################################################################################
+"""
+str_CONTAINERLAB_ROUTER_IMAGE = "frrouting/frr:latest" # containerlab can't run the c2600 image, routers become FRR containers
+int_INTERFACE_NAME_LIMIT = 15 # Linux interface names, and so the names of containerlab bridges, are at most 15 characters
+regex_INTERFACE_NAME = re.compile(r"[A-Za-z0-9_.-]{1,15}")
+
+"""
+###################################################################################################################
+Emitting other formats.
+
+This section turns a built topology into formats other than a .gns3 project, for tools that never open GNS3. Every
+emitter reads the same in-memory topology the .gns3 file is written from, and the GNS3Emitter it was written with,
+so node_ids match the .gns3 file. Every emitter writes to a stream; writeOutput() takes care of writing it to a
+temporary file first, just like the .gns3 file.
+
+- getGroupName():
+  Turns a cluster tag into a valid Ansible group name, prefixed by the device type of the cluster.
+
+- emitAnsibleInventory():
+  Writes a YAML Ansible inventory: a group per router and switch cluster tag, in a routers and switches group.
+
+- emitGraphML():
+  Writes the devices and links as a GraphML graph, for networkx, Gephi or yEd.
+
+- emitEdgeList():
+  Writes every link as a tab separated line with the names and ports of the devices on both ends.
+
+- getBridgeName():
+  Returns the name of the Linux bridge of a switch: the name of the switch when it's a valid interface name, otherwise
+  the start of it followed by a hash of all of it, so it stays unique within int_INTERFACE_NAME_LIMIT characters.
+
+- emitContainerlab():
+  Writes a containerlab topology. Routers become FRR containers and switches Linux bridges, which have to exist on
+  the containerlab host. Gateway clouds and their links are left out.
+
+- writeOutput():
+  Writes the output of an emitter (or any function writing to a stream) to a temporary file next to the output file
+  and only then renames it.
+###################################################################################################################
+"""
+def getGroupName(intType, strTag) -> str:
+    return array_DEVICE_TYPES[intType] + "_" + re.sub(r"\W", "_", strTag) # Ansible group names may only contain letters, digits and underscores
+
+def emitAnsibleInventory(stream, objectTopology, objectEmitter, strName) -> None:
+    import yaml # Required for writing Ansible inventories
+
+    dictGroups = {"routers": {"children": {}}, "switches": {"children": {}}}
+    for objectCluster in objectTopology.arrayClusters:
+        strParent = "routers" if objectCluster.intType == int_ROUTER else "switches"
+        dictHosts = dictGroups[strParent]["children"].setdefault(getGroupName(objectCluster.intType, objectCluster.strTag), {"hosts": {}})["hosts"]
+        for intDevice in objectCluster.arrayDevices:
+            dictHosts[objectTopology.getDeviceName(intDevice)] = {"gns3_node_id": objectEmitter.getNodeId(intDevice), "gns3_cluster": objectCluster.strTag}
+    yaml.safe_dump({"all": {"vars": {"gns3_project": strName}, "children": dictGroups}}, stream, sort_keys=False, explicit_start=True)
+
+def emitGraphML(stream, objectTopology, objectEmitter, strName) -> None:
+    stream.write('<?xml version="1.0" encoding="UTF-8"?>\n<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+    for strKey, strFor, strType in (("name", "node", "string"), ("type", "node", "string"), ("cluster", "node", "string"), ("x", "node", "int"), ("y", "node", "int"), ("start_port", "edge", "int"), ("end_port", "edge", "int")):
+        stream.write('  <key id="' + strKey + '" for="' + strFor + '" attr.name="' + strKey + '" attr.type="' + strType + '"/>\n')
+    stream.write('  <graph id=' + quoteattr(strName) + ' edgedefault="undirected">\n')
+
+    for intDevice in range(len(objectTopology.arrayDeviceTypes)):
+        stream.write('    <node id="' + objectEmitter.getNodeId(intDevice) + '">'
+                     + '<data key="name">' + escape(objectTopology.getDeviceName(intDevice)) + '</data>'
+                     + '<data key="type">' + array_DEVICE_TYPES[objectTopology.arrayDeviceTypes[intDevice]] + '</data>'
+                     + '<data key="cluster">' + escape(objectTopology.arrayClusters[objectTopology.arrayDeviceClusters[intDevice]].strTag) + '</data>'
+                     + '<data key="x">' + str(objectTopology.arrayX[intDevice]) + '</data><data key="y">' + str(objectTopology.arrayY[intDevice]) + '</data></node>\n')
+    for intLink in range(len(objectTopology.arrayLinkStarts)):
+        stream.write('    <edge id="' + objectEmitter.getLinkId(intLink) + '" source="' + objectEmitter.getNodeId(objectTopology.arrayLinkStarts[intLink]) + '" target="' + objectEmitter.getNodeId(objectTopology.arrayLinkEnds[intLink]) + '">'
+                     + '<data key="start_port">' + str(objectTopology.arrayLinkStartPorts[intLink]) + '</data><data key="end_port">' + str(objectTopology.arrayLinkEndPorts[intLink]) + '</data></edge>\n')
+    stream.write('  </graph>\n</graphml>\n')
+
+def emitEdgeList(stream, objectTopology, objectEmitter, strName) -> None:
+    # Tags may contain spaces, so columns are separated by tabs: networkx.read_edgelist(path, delimiter="\t", create_using=networkx.MultiGraph, data=(("start_port", int), ("end_port", int)))
+    stream.write("# start\tend\tstart_port\tend_port\n")
+    for intLink in range(len(objectTopology.arrayLinkStarts)):
+        stream.write(objectTopology.getDeviceName(objectTopology.arrayLinkStarts[intLink]) + "\t" + objectTopology.getDeviceName(objectTopology.arrayLinkEnds[intLink]) + "\t"
+                     + str(objectTopology.arrayLinkStartPorts[intLink]) + "\t" + str(objectTopology.arrayLinkEndPorts[intLink]) + "\n")
+
+def getBridgeName(strName) -> str:
+    if (regex_INTERFACE_NAME.fullmatch(strName)):
+        return strName
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", strName)[:int_INTERFACE_NAME_LIMIT - 9] + "-" + sha1(strName.encode("utf-8")).hexdigest()[:8]
+
+def emitContainerlab(stream, objectTopology, objectEmitter, strName) -> None:
+    import yaml # Required for writing containerlab topologies
+
+    def getEndpoint(intDevice, intPort) -> str:
+        if (objectTopology.arrayDeviceTypes[intDevice] == int_SWITCH):
+            return getBridgeName(objectTopology.getDeviceName(intDevice)) + ":nn" + str(intDevice) + "p" + str(intPort) # Bridge ports live on the host, so their names must be unique there and at most 15 characters
+        return objectTopology.getDeviceName(intDevice) + ":eth" + str(intPort + 1) # eth0 is the management interface
+
+    dictNodes = {}
+    for intDevice, intType in enumerate(objectTopology.arrayDeviceTypes):
+        if (intType == int_ROUTER):
+            dictNodes[objectTopology.getDeviceName(intDevice)] = {"kind": "linux", "image": str_CONTAINERLAB_ROUTER_IMAGE}
+        elif (intType == int_SWITCH):
+            strBridge = getBridgeName(objectTopology.getDeviceName(intDevice))
+            dictNodes[strBridge] = {"kind": "bridge"} if strBridge == objectTopology.getDeviceName(intDevice) else {"kind": "bridge", "labels": {"gns3-name": objectTopology.getDeviceName(intDevice)}}
+
+    arrayLinks = []
+    for intLink in range(len(objectTopology.arrayLinkStarts)):
+        intStart = objectTopology.arrayLinkStarts[intLink]
+        intEnd = objectTopology.arrayLinkEnds[intLink]
+        if (objectTopology.arrayDeviceTypes[intStart] != int_CLOUD and objectTopology.arrayDeviceTypes[intEnd] != int_CLOUD):
+            arrayLinks.append({"endpoints": [getEndpoint(intStart, objectTopology.arrayLinkStartPorts[intLink]), getEndpoint(intEnd, objectTopology.arrayLinkEndPorts[intLink])]})
+    yaml.safe_dump({"name": re.sub(r"[^\w-]+", "-", strName).strip("-") or "networknarcotic", "topology": {"nodes": dictNodes, "links": arrayLinks}}, stream, sort_keys=False, explicit_start=True)
+
+def writeOutput(strOutput, functionEmit, *arrayArguments) -> None:
+    strTemporary = os.path.join(os.path.dirname(os.path.abspath(strOutput)), "." + os.path.basename(strOutput) + "." + uuid4().hex[:8] + ".tmp")
+    try:
+        with open(strTemporary, "x", encoding="utf-8", buffering=1 << 20) as stream:
+            functionEmit(stream, *arrayArguments)
+        os.replace(strTemporary, strOutput)
+    finally:
+        if (os.path.exists(strTemporary)):
+            os.remove(strTemporary)
+
+dict_EMITTERS = {
+    "ansible": emitAnsibleInventory,
+    "graphml": emitGraphML,
+    "edgelist": emitEdgeList,
+    "containerlab": emitContainerlab
+}
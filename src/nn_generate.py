@@ -0,0 +1,111 @@
+import argparse             # Required for argument passing
+import sys                  # Required for writing input files to standard output
+
+"""
+###################################################################################################################
+Defining global variables.
+
+This section specifies variables that display repeated use throughout the generator.
+###################################################################################################################
+"""
+array_CLUSTER_MODES = ["full", "loop", "line", "hubspoke"]
+array_CONNECTION_MODES = ["single", "full", "parallel"]
+array_SHAPES = ["loop", "line"]
+str_MIXED = "mixed" # Cycles through every mode, one cluster or connection at a time
+
+"""
+###################################################################################################################
+Generating input files.
+
+This section produces synthetic input files of any size, for benchmarking and testing the engine. Router clusters are
+chained together, every connection joining one router cluster to the next, and the last one back to the first in
+loop shape. That way every connection involves exactly two router clusters, which every connectionmode supports, with
+or without a switch cluster in between. Connections and clusters each get their own amount of cables. The generated
+input files are always valid, but whether the network fits in the port limit of its devices depends on the amount,
+modes and cables chosen.
+
+- getMode():
+  Returns the mode of the n-th cluster or connection, cycling through every mode when the mode is mixed.
+
+- generateInputFile():
+  Returns an input file with a certain amount of router clusters, as the dictionary loadInputFile() returns.
+
+- countDevices():
+  Returns the amount of devices (routers and switches) an input file of generateInputFile() contains.
+###################################################################################################################
+"""
+def getMode(strMode, arrayModes, intIndex) -> str:
+    return arrayModes[intIndex % len(arrayModes)] if strMode == str_MIXED else strMode
+
+def generateInputFile(intClusters, intAmount=1, strClusterMode="full", strConnectionMode="single", intConnectionCables=1, intSwitches=0, strShape="loop", intConnectionShift=0, intClusterCables=1) -> dict:
+    intConnections = intClusters if strShape == "loop" and intClusters > 2 else intClusters - 1
+    arrayConnections = []
+    for intCurrent in range(intConnections):
+        objectConnection = {"tag": "conn_" + str(intCurrent), "connectionmode": getMode(strConnectionMode, array_CONNECTION_MODES, intCurrent), "cables": intConnectionCables}
+        if (intSwitches > 0):
+            objectConnection["switches"] = {"tag": "swit_" + str(intCurrent), "amount": intSwitches, "clustermode": getMode(strClusterMode, array_CLUSTER_MODES, intCurrent)}
+            if (intClusterCables > 1):
+                objectConnection["switches"]["cables"] = intClusterCables
+        arrayConnections.append(objectConnection)
+
+    arrayRouters = []
+    for intCurrent in range(intClusters):
+        objectRouterCluster = {"tag": "rout_" + str(intCurrent), "amount": intAmount, "clustermode": getMode(strClusterMode, array_CLUSTER_MODES, intCurrent)}
+        if (intClusterCables > 1):
+            objectRouterCluster["cables"] = intClusterCables
+        if (intConnectionShift > 0):
+            objectRouterCluster["connectionshift"] = intConnectionShift
+        arrayConnectedTo = ["conn_" + str(intConnection % intClusters) for intConnection in (intCurrent - 1, intCurrent) if intConnections == intClusters or 0 <= intConnection < intConnections]
+        if (arrayConnectedTo):
+            objectRouterCluster["connectedto"] = arrayConnectedTo
+        arrayRouters.append(objectRouterCluster)
+
+    if (not arrayConnections):
+        return {"input": {"routers": arrayRouters}}
+    return {"input": {"connections": arrayConnections, "routers": arrayRouters}}
+
+def countDevices(objectInputFile) -> int:
+    objectInput = objectInputFile["input"]
+    return sum(objectRouterCluster["amount"] for objectRouterCluster in objectInput["routers"]) + sum(objectConnection["switches"]["amount"] for objectConnection in objectInput.get("connections", []) if "switches" in objectConnection)
+
+"""
+###################################################################################################################
+Running the generator.
+
+This section allows the generator to be used from the command line, writing the input file to a .yml file or to the
+standard output.
+###################################################################################################################
+"""
+def getIntegerBetween(intMinimum, intMaximum):
+    def checkIntegerBetween(strValue):
+        intValue = int(strValue)
+        if (not intMinimum <= intValue <= intMaximum):
+            raise argparse.ArgumentTypeError("must be between " + str(intMinimum) + " and " + str(intMaximum))
+        return intValue
+    return checkIntegerBetween
+
+def main(arrayArguments=None) -> None:
+    parser = argparse.ArgumentParser(description="Generates a synthetic NetworkNarcotic input file of any size.")
+    parser.add_argument("-o", "--output", help="the .yml file to write, defaults to the standard output")
+    parser.add_argument("--clusters", type=getIntegerBetween(1, 1000000), required=True, help="the amount of router clusters")
+    parser.add_argument("--amount", type=getIntegerBetween(1, 255), default=1, help="the amount of routers in every router cluster")
+    parser.add_argument("--switches", type=getIntegerBetween(0, 255), default=0, help="the amount of switches in the switch cluster of every connection, 0 connects router clusters directly")
+    parser.add_argument("--clustermode", choices=array_CLUSTER_MODES + [str_MIXED], default="full", help="the clustermode of every cluster, mixed cycles through all of them")
+    parser.add_argument("--connectionmode", choices=array_CONNECTION_MODES + [str_MIXED], default="single", help="the connectionmode of every connection, mixed cycles through all of them")
+    parser.add_argument("--connection-cables", type=getIntegerBetween(1, 3), default=1, help="the amount of cables of every connection, between router clusters or between a router cluster and a switch cluster")
+    parser.add_argument("--cluster-cables", type=getIntegerBetween(1, 3), default=1, help="the amount of cables between the devices of every router and switch cluster")
+    parser.add_argument("--connectionshift", type=getIntegerBetween(0, 255), default=0, help="the connectionshift of every router cluster")
+    parser.add_argument("--shape", choices=array_SHAPES, default="loop", help="whether the last router cluster is connected back to the first one")
+    args = parser.parse_args(arrayArguments)
+
+    import yaml # Required for writing input files
+    objectInputFile = generateInputFile(args.clusters, args.amount, args.clustermode, args.connectionmode, args.connection_cables, args.switches, args.shape, args.connectionshift, args.cluster_cables)
+    if (args.output == None):
+        yaml.safe_dump(objectInputFile, sys.stdout, sort_keys=False, explicit_start=True)
+        return
+    with open(args.output, "w") as output:
+        yaml.safe_dump(objectInputFile, output, sort_keys=False, explicit_start=True)
+    print("Generated " + args.output + " with " + str(countDevices(objectInputFile)) + " devices.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,582 @@
+import math                 # Required for drawing topologies
+from array import array     # Required for remembering layouts
+from collections.abc import Sequence # Required for handing edges to the layout engines without copying them
+
+"""
+###################################################################################################################
+Defining global variables.
+
+This section specifies variables that display repeated use throughout the layout engines. Coordinates returned by
+every engine are GNS3 pixels.
+###################################################################################################################
+"""
+int_LAYOUT_SCALE = 700      # Pixels per unit of normalized layout coordinates, for small topologies
+int_NODE_SPACING = 150      # Pixels between neighbouring nodes, roughly
+int_DEFAULT_SEED = 42       # Every engine is seeded, so the same topology always gets the same layout
+int_DIRECT_LIMIT = 256      # Up to this amount of nodes, repulsion is computed exactly
+int_LEAF_OCCUPANCY = 32     # Maximum amount of nodes in a finest-level cell before the quadtree gets deeper
+int_MAX_DEPTH = 14          # Maximum depth of the quadtree, which is never more than one level below the cells a node would get in a uniform spread
+int_NEAR_FIELD_PAIRS = 1 << 20 # Pairs of nodes the near field computes at once, which bounds its memory when many nodes share a cell
+int_COARSEST_SIZE = 32      # The multilevel engine stops coarsening at this amount of nodes
+int_MEMO_VERSION = 1        # Part of every memo key: bump it whenever an engine's output changes, so old layouts aren't reused
+int_MEMO_ENTRIES = 16       # The amount of layouts of earlier builds a memo keeps next to the ones of the current build
+tuple_REUSE_ENGINES = ("fruchterman-reingold", "barnes-hut", "multilevel") # Engines whose unchanged clusters keep their coordinates from a memo
+
+"""
+###################################################################################################################
+Defining functions.
+
+- EdgeList:
+  The edges of a topology as pairs of nodes, read straight from its arrays of start and end nodes instead of being
+  copied into a list of tuples. Memo keys hash the arrays themselves.
+
+- LayoutMemo:
+  Remembers layouts by a hash of everything they depend on. It starts from the entries of a previous build, and keeps
+  every entry of the current build plus the int_MEMO_ENTRIES most recently used older ones, so it doesn't keep growing.
+
+- getMemoKey():
+  Hashes everything a layout (or part of one) depends on into a memo key.
+
+- computeLayout():
+  Computes pixel coordinates for every node with the chosen layout engine, or takes them from a memo when the exact
+  same layout was computed before. Given the names of the nodes, the force-directed engines also remember every
+  cluster on its own: after an edit, clusters whose devices and links didn't change keep their coordinates, and only
+  the other nodes are laid out, around them.
+
+- getClusterKeys():
+  Hashes the names and internal links of every cluster into a memo key per cluster, by name rather than by node, so
+  the key survives nodes being renumbered by an edit elsewhere.
+
+- toPixels():
+  Centers coordinates and converts them to pixels, so that the median edge is int_NODE_SPACING pixels long.
+
+- placeNewNodes():
+  Starts a warm layout: nodes with a previous position keep it, new nodes are put next to their placed neighbours.
+
+- anchorLayout():
+  Moves a freshly computed layout onto previous positions, for engines that can't start from them.
+
+- getQuadtreeDepth():
+  Returns how deep the quadtree of a set of nodes goes: deep enough for the finest cells to hold a handful of nodes,
+  but never to more than about 16 cells per node, however close together the nodes are.
+
+- getRepulsion():
+  Computes the repulsive displacement of every node, exactly for small topologies, otherwise with a Barnes-Hut style
+  quadtree: far away nodes are approximated by the center of mass of their quadtree cell.
+
+- getAttraction():
+  Computes the attractive displacement of every node along its edges.
+
+- runForceIterations():
+  Moves nodes according to the Fruchterman-Reingold force model, with a cooling temperature.
+
+- coarsenGraph():
+  Merges pairs of neighbouring nodes (heavy edge matching) into one node of a coarser graph.
+
+- layoutWarm():
+  Only moves the new nodes of a warm layout, for the barnes-hut and multilevel engines.
+
+- layoutFruchtermanReingold(), layoutGrid(), layoutNone(), layoutBarnesHut(), layoutMultilevel(), layoutCluster():
+  The layout engines. Each takes the nodes, the edges (as pairs of nodes), the cluster of every node, a seed, the
+  previous pixel coordinates of some nodes, which those nodes keep, and a memo (or None). The cluster engine
+  remembers where it put its clusters, so changing the inside of a cluster doesn't move the others around.
+###################################################################################################################
+"""
+class EdgeList(Sequence):
+    __slots__ = ("arrayStarts", "arrayEnds")
+
+    def __init__(self, arrayStarts, arrayEnds):
+        self.arrayStarts = arrayStarts
+        self.arrayEnds = arrayEnds
+
+    def __len__(self) -> int:
+        return len(self.arrayStarts)
+
+    def __getitem__(self, intIndex) -> tuple:
+        if (isinstance(intIndex, slice)):
+            return list(zip(self.arrayStarts[intIndex], self.arrayEnds[intIndex]))
+        return (self.arrayStarts[intIndex], self.arrayEnds[intIndex])
+
+    def __iter__(self):
+        return zip(self.arrayStarts, self.arrayEnds)
+
+class LayoutMemo:
+    __slots__ = ("dictPrevious", "dictCurrent")
+
+    def __init__(self, dictPrevious=None):
+        self.dictPrevious = dictPrevious or {}
+        self.dictCurrent = {}
+
+    def get(self, strKey):
+        value = self.dictCurrent.get(strKey, self.dictPrevious.get(strKey))
+        if (value is not None):
+            self.dictCurrent[strKey] = value
+        return value
+
+    def set(self, strKey, value) -> None:
+        self.dictCurrent[strKey] = value
+
+    def getRecentEntries(self) -> dict:
+        dictEntries = dict(reversed(self.dictCurrent.items())) # Entries used by this build come first, the last one used first
+        intOlder = 0
+        for strKey, value in self.dictPrevious.items():
+            if (intOlder >= int_MEMO_ENTRIES):
+                break
+            if (strKey not in dictEntries):
+                dictEntries[strKey] = value
+                intOlder += 1
+        return dictEntries
+
+def getMemoKey(*arrayParts) -> str:
+    import hashlib # Required for remembering layouts
+
+    objectHash = hashlib.sha256(str(int_MEMO_VERSION).encode())
+    for part in arrayParts:
+        if (isinstance(part, EdgeList)):
+            part = part.arrayStarts.tobytes() + b"\0" + part.arrayEnds.tobytes()
+        objectHash.update(b"\0" + (part if isinstance(part, bytes) else repr(part).encode()))
+    return objectHash.hexdigest()
+
+def computeLayout(strLayout, arrayNodes, arrayEdges, dictClusters=None, intSeed=int_DEFAULT_SEED, dictInitial=None, objectMemo=None, arrayNames=None) -> dict:
+    if (strLayout not in dict_LAYOUT_ENGINES):
+        raise ValueError("Unknown layout '" + strLayout + "', choose one of: " + ", ".join(dict_LAYOUT_ENGINES) + ".")
+
+    dictInitial = {node: tuple(dictInitial[node]) for node in arrayNodes if node in dictInitial} if dictInitial else {}
+    if (len(arrayNodes) > 0 and len(dictInitial) == len(arrayNodes)):
+        return dictInitial # Nothing new to place
+
+    if (objectMemo != None):
+        # Coordinates are remembered as one flat array of x and y, in the order of the nodes
+        strKey = getMemoKey(strLayout, intSeed, arrayNodes, arrayEdges, dictClusters, dictInitial)
+        arrayRemembered = objectMemo.get(strKey)
+        if (arrayRemembered != None):
+            return {node: (arrayRemembered[intIndex * 2], arrayRemembered[intIndex * 2 + 1]) for intIndex, node in enumerate(arrayNodes)}
+
+    dictClusterKeys = {}
+    dictPlaced = dictInitial
+    if (objectMemo != None and arrayNames != None and dictClusters and not dictInitial and strLayout in tuple_REUSE_ENGINES):
+        # Clusters that are exactly the same as in an earlier build keep their coordinates, the engine places the rest
+        dictClusterKeys = getClusterKeys(strLayout, arrayNodes, arrayEdges, dictClusters, intSeed, arrayNames)
+        dictPlaced = {}
+        for strClusterKey, arrayMembers in dictClusterKeys.items():
+            arrayRemembered = objectMemo.get(strClusterKey)
+            if (arrayRemembered != None and len(arrayRemembered) == 2 * len(arrayMembers)):
+                for intIndex, node in enumerate(arrayMembers):
+                    dictPlaced[node] = (arrayRemembered[intIndex * 2], arrayRemembered[intIndex * 2 + 1])
+
+    if (len(arrayNodes) > 0 and len(dictPlaced) == len(arrayNodes)):
+        dictCoordinates = dictPlaced
+    else:
+        dictCoordinates = dict_LAYOUT_ENGINES[strLayout](arrayNodes, arrayEdges, dictClusters or {}, intSeed, dictPlaced, objectMemo)
+    if (objectMemo != None):
+        objectMemo.set(strKey, array("d", (floatCoordinate for node in arrayNodes for floatCoordinate in dictCoordinates[node])))
+        for strClusterKey, arrayMembers in dictClusterKeys.items():
+            objectMemo.set(strClusterKey, array("d", (floatCoordinate for node in arrayMembers for floatCoordinate in dictCoordinates[node])))
+    return dictCoordinates
+
+def getClusterKeys(strLayout, arrayNodes, arrayEdges, dictClusters, intSeed, arrayNames) -> dict:
+    dictMembers = {} # Holds per cluster its nodes, in creation order
+    dictPositions = {} # Holds per node its cluster and position within it
+    for node in arrayNodes:
+        arrayMembers = dictMembers.setdefault(dictClusters.get(node, node), [])
+        dictPositions[node] = (dictClusters.get(node, node), len(arrayMembers))
+        arrayMembers.append(node)
+
+    dictLinks = {cluster: [] for cluster in dictMembers} # Holds per cluster its internal links, by position
+    for nodeStart, nodeEnd in arrayEdges:
+        clusterStart, intStart = dictPositions[nodeStart]
+        clusterEnd, intEnd = dictPositions[nodeEnd]
+        if (clusterStart == clusterEnd):
+            dictLinks[clusterStart].append((intStart, intEnd))
+
+    return {getMemoKey("cluster", strLayout, intSeed, [arrayNames[node] for node in arrayMembers], dictLinks[cluster]): arrayMembers for cluster, arrayMembers in dictMembers.items()}
+
+def toPixels(np, arrayNodes, arrayPositions, arrayStarts, arrayEnds) -> dict:
+    if (len(arrayNodes) == 0):
+        return {}
+
+    arrayPositions = arrayPositions - arrayPositions.mean(axis=0)
+    arrayLengths = np.sqrt(((arrayPositions[arrayStarts] - arrayPositions[arrayEnds]) ** 2).sum(axis=1))
+    floatLength = float(np.median(arrayLengths)) if len(arrayLengths) > 0 else 1 / math.sqrt(len(arrayNodes)) # Without edges, use the natural spacing
+    arrayPositions = arrayPositions * (int_NODE_SPACING / max(floatLength, 1e-12))
+
+    return {node: (round(float(arrayPosition[0])), round(float(arrayPosition[1]))) for node, arrayPosition in zip(arrayNodes, arrayPositions)}
+
+def placeNewNodes(np, arrayNodes, arrayStarts, arrayEnds, dictInitial, floatFactor, floatJitter, objectRandom) -> tuple:
+    arrayPositions = np.zeros((len(arrayNodes), 2))
+    arrayFixed = np.zeros(len(arrayNodes), dtype=bool)
+    for intIndex, node in enumerate(arrayNodes):
+        if (node in dictInitial):
+            arrayPositions[intIndex] = dictInitial[node]
+            arrayFixed[intIndex] = True
+    arrayPositions *= floatFactor
+
+    # Breadth first from the placed nodes, every new node starts at the average of its already placed neighbours
+    arrayNeighbours = [[] for node in arrayNodes]
+    for intStart, intEnd in zip(arrayStarts.tolist(), arrayEnds.tolist()):
+        arrayNeighbours[intStart].append(intEnd)
+        arrayNeighbours[intEnd].append(intStart)
+
+    arrayPlaced = arrayFixed.copy()
+    arrayQueue = np.nonzero(arrayFixed)[0].tolist()
+    intCurrent = 0
+    while (intCurrent < len(arrayQueue)):
+        for intNeighbour in arrayNeighbours[arrayQueue[intCurrent]]:
+            if (not arrayPlaced[intNeighbour]):
+                arrayPlacedNeighbours = [intOther for intOther in arrayNeighbours[intNeighbour] if arrayPlaced[intOther]]
+                arrayPositions[intNeighbour] = arrayPositions[arrayPlacedNeighbours].mean(axis=0) + (objectRandom.random(2) - 0.5) * floatJitter
+                arrayPlaced[intNeighbour] = True
+                arrayQueue.append(intNeighbour)
+        intCurrent += 1
+
+    # New nodes that aren't connected to any placed node start anywhere within the previous layout
+    arrayUnplaced = np.nonzero(~arrayPlaced)[0]
+    arrayLow = arrayPositions[arrayFixed].min(axis=0)
+    arrayHigh = np.maximum(arrayPositions[arrayFixed].max(axis=0), arrayLow + floatJitter)
+    arrayPositions[arrayUnplaced] = arrayLow + objectRandom.random((len(arrayUnplaced), 2)) * (arrayHigh - arrayLow)
+
+    return arrayPositions, arrayFixed
+
+def anchorLayout(dictCoordinates, dictInitial, dictClusters) -> dict:
+    # New nodes move along with the previous nodes of their cluster, or with all previous nodes if their cluster is new
+    dictOffsets = {} # Holds per cluster the summed offset from fresh to previous coordinates and the amount of nodes
+    for node, tupleInitial in dictInitial.items():
+        for key in (dictClusters.get(node, node), None):
+            arrayOffset = dictOffsets.setdefault(key, [0, 0, 0])
+            arrayOffset[0] += tupleInitial[0] - dictCoordinates[node][0]
+            arrayOffset[1] += tupleInitial[1] - dictCoordinates[node][1]
+            arrayOffset[2] += 1
+
+    dictAnchored = {}
+    for node, tupleCoordinate in dictCoordinates.items():
+        if (node in dictInitial):
+            dictAnchored[node] = dictInitial[node]
+        else:
+            arrayOffset = dictOffsets.get(dictClusters.get(node, node), dictOffsets[None])
+            dictAnchored[node] = (round(tupleCoordinate[0] + arrayOffset[0] / arrayOffset[2]), round(tupleCoordinate[1] + arrayOffset[1] / arrayOffset[2]))
+
+    return dictAnchored
+
+def getEdgeIndices(np, arrayNodes, arrayEdges) -> tuple:
+    dictIndices = {node: intIndex for intIndex, node in enumerate(arrayNodes)}
+    dictWeights = {} # Holds per unordered pair of node indices the amount of edges between them
+    for nodeStart, nodeEnd in arrayEdges:
+        intStart = dictIndices[nodeStart]
+        intEnd = dictIndices[nodeEnd]
+        if (intStart != intEnd):
+            tupleKey = (intStart, intEnd) if intStart < intEnd else (intEnd, intStart)
+            dictWeights[tupleKey] = dictWeights.get(tupleKey, 0) + 1
+
+    arrayStarts = np.fromiter((tupleKey[0] for tupleKey in dictWeights), dtype=np.int64, count=len(dictWeights))
+    arrayEnds = np.fromiter((tupleKey[1] for tupleKey in dictWeights), dtype=np.int64, count=len(dictWeights))
+    arrayWeights = np.fromiter(dictWeights.values(), dtype=float, count=len(dictWeights))
+    return arrayStarts, arrayEnds, arrayWeights
+
+def getQuadtreeDepth(np, arrayUnit) -> int:
+    # Every level has 4 ** depth cells, so this keeps every level of the quadtree within about 16 cells per node
+    intNodes = len(arrayUnit)
+    intMaxDepth = max(2, min(int_MAX_DEPTH, math.ceil(math.log(max(intNodes, 1), 4)) + 1))
+    intDepth = max(2, min(intMaxDepth, math.ceil(math.log(max(intNodes / 4, 1), 4))))
+    while (intDepth < intMaxDepth):
+        intGrid = 1 << intDepth
+        arrayCells = np.minimum((arrayUnit * intGrid).astype(np.int64), intGrid - 1)
+        if (np.bincount(arrayCells[:, 0] * intGrid + arrayCells[:, 1]).max() <= int_LEAF_OCCUPANCY):
+            break
+        intDepth += 1
+    return intDepth
+
+def getRepulsion(np, arrayPositions, floatK2, arrayTargets=None) -> object:
+    intNodes = len(arrayPositions)
+    arrayDisplacement = np.zeros_like(arrayPositions)
+    if (arrayTargets is None):
+        arrayTargets = np.arange(intNodes)
+    if (intNodes < 2 or len(arrayTargets) == 0):
+        return arrayDisplacement
+
+    if (intNodes <= int_DIRECT_LIMIT):
+        arrayDelta = arrayPositions[arrayTargets, None, :] - arrayPositions[None, :, :]
+        arrayDistance2 = np.maximum((arrayDelta ** 2).sum(axis=2), 1e-12)
+        arrayDistance2[np.arange(len(arrayTargets)), arrayTargets] = np.inf
+        arrayDisplacement[arrayTargets] = (arrayDelta * (floatK2 / arrayDistance2)[:, :, None]).sum(axis=1)
+        return arrayDisplacement
+
+    # Normalize the positions into the unit square, which is the root of the quadtree
+    arrayLow = arrayPositions.min(axis=0)
+    floatSize = float((arrayPositions.max(axis=0) - arrayLow).max()) * (1 + 1e-9) + 1e-12
+    arrayUnit = (arrayPositions - arrayLow) / floatSize
+
+    intDepth = getQuadtreeDepth(np, arrayUnit)
+
+    # Far field: on every level, interact with the cells that are children of the parent's neighbours, but aren't
+    # neighbours themselves. Together with the near field below, every pair of nodes is accounted for exactly once.
+    arrayOffsets = np.array([[(intX - 2 - intParityX, intY - 2 - intParityY) for intX in range(6) for intY in range(6) if abs(intX - 2 - intParityX) > 1 or abs(intY - 2 - intParityY) > 1] for intParityX in (0, 1) for intParityY in (0, 1)], dtype=np.int64)
+    for intLevel in range(2, intDepth + 1):
+        intGrid = 1 << intLevel
+        arrayCells = np.minimum((arrayUnit * intGrid).astype(np.int64), intGrid - 1)
+        arrayFlat = arrayCells[:, 0] * intGrid + arrayCells[:, 1]
+        arrayMass = np.bincount(arrayFlat, minlength=intGrid * intGrid).astype(float)
+        arrayCentroids = np.stack([np.bincount(arrayFlat, weights=arrayPositions[:, 0], minlength=intGrid * intGrid), np.bincount(arrayFlat, weights=arrayPositions[:, 1], minlength=intGrid * intGrid)], axis=1)
+        arrayCentroids /= np.maximum(arrayMass, 1)[:, None]
+
+        # The 27 cells to interact with only depend on whether a cell is the left or right, upper or lower child
+        arrayTargetCells = arrayCells[arrayTargets]
+        arrayNodeOffsets = arrayOffsets[(arrayTargetCells[:, 0] & 1) * 2 + (arrayTargetCells[:, 1] & 1)]
+        arrayNeighbourX = arrayTargetCells[:, 0, None] + arrayNodeOffsets[:, :, 0]
+        arrayNeighbourY = arrayTargetCells[:, 1, None] + arrayNodeOffsets[:, :, 1]
+        arrayNode, arraySlot = np.nonzero((arrayNeighbourX >= 0) & (arrayNeighbourX < intGrid) & (arrayNeighbourY >= 0) & (arrayNeighbourY < intGrid))
+        arrayCell = arrayNeighbourX[arrayNode, arraySlot] * intGrid + arrayNeighbourY[arrayNode, arraySlot]
+        arrayUsed = arrayMass[arrayCell] > 0
+        arrayNode = arrayTargets[arrayNode[arrayUsed]]
+        arrayCell = arrayCell[arrayUsed]
+
+        arrayDelta = arrayPositions[arrayNode] - arrayCentroids[arrayCell]
+        arrayForce = arrayDelta * (floatK2 * arrayMass[arrayCell] / np.maximum((arrayDelta ** 2).sum(axis=1), 1e-12))[:, None]
+        arrayDisplacement[:, 0] += np.bincount(arrayNode, weights=arrayForce[:, 0], minlength=intNodes)
+        arrayDisplacement[:, 1] += np.bincount(arrayNode, weights=arrayForce[:, 1], minlength=intNodes)
+
+    # Near field: exact interactions with every node in the same or a neighbouring finest-level cell. Only occupied
+    # cells get a row in the table of their nodes, and nodes are handled a chunk at a time, so a crowded cell costs
+    # time but never more memory than int_NEAR_FIELD_PAIRS pairs
+    intGrid = 1 << intDepth
+    arrayCells = np.minimum((arrayUnit * intGrid).astype(np.int64), intGrid - 1)
+    arrayFlat = arrayCells[:, 0] * intGrid + arrayCells[:, 1]
+    arrayOrder = np.argsort(arrayFlat, kind="stable")
+    arrayOccupied, arrayStarts, arrayOccupancy = np.unique(arrayFlat[arrayOrder], return_index=True, return_counts=True)
+    arrayRows = np.searchsorted(arrayOccupied, arrayFlat[arrayOrder])
+    arrayTable = np.full((len(arrayOccupied), int(arrayOccupancy.max())), -1, dtype=np.int64)
+    arrayTable[arrayRows, np.arange(intNodes) - arrayStarts[arrayRows]] = arrayOrder
+    intChunk = max(1, int_NEAR_FIELD_PAIRS // arrayTable.shape[1])
+
+    for intX in (-1, 0, 1):
+        for intY in (-1, 0, 1):
+            arrayNeighbourX = arrayCells[arrayTargets, 0] + intX
+            arrayNeighbourY = arrayCells[arrayTargets, 1] + intY
+            arrayInside = np.nonzero((arrayNeighbourX >= 0) & (arrayNeighbourX < intGrid) & (arrayNeighbourY >= 0) & (arrayNeighbourY < intGrid))[0]
+            arrayCell = arrayNeighbourX[arrayInside] * intGrid + arrayNeighbourY[arrayInside]
+            arrayRows = np.minimum(np.searchsorted(arrayOccupied, arrayCell), len(arrayOccupied) - 1)
+            arrayFound = arrayOccupied[arrayRows] == arrayCell
+            arrayInside = arrayInside[arrayFound]
+            arrayRows = arrayRows[arrayFound]
+
+            for intFirst in range(0, len(arrayInside), intChunk):
+                arrayMembers = arrayTable[arrayRows[intFirst:intFirst + intChunk]]
+                arrayNode = arrayTargets[arrayInside[intFirst:intFirst + intChunk]]
+                arrayUsed = (arrayMembers >= 0) & (arrayMembers != arrayNode[:, None])
+
+                arrayDelta = arrayPositions[arrayNode][:, None, :] - arrayPositions[np.maximum(arrayMembers, 0)]
+                arrayFactor = np.where(arrayUsed, floatK2 / np.maximum((arrayDelta ** 2).sum(axis=2), 1e-12), 0.0)
+                arrayDisplacement[arrayNode] += (arrayDelta * arrayFactor[:, :, None]).sum(axis=1)
+
+    return arrayDisplacement
+
+def getAttraction(np, arrayPositions, arrayStarts, arrayEnds, arrayWeights, floatK) -> object:
+    arrayDisplacement = np.zeros_like(arrayPositions)
+    if (len(arrayStarts) == 0):
+        return arrayDisplacement
+
+    arrayDelta = arrayPositions[arrayStarts] - arrayPositions[arrayEnds]
+    arrayForce = arrayDelta * (np.sqrt((arrayDelta ** 2).sum(axis=1)) * arrayWeights / floatK)[:, None]
+    for intAxis in (0, 1):
+        arrayDisplacement[:, intAxis] -= np.bincount(arrayStarts, weights=arrayForce[:, intAxis], minlength=len(arrayPositions))
+        arrayDisplacement[:, intAxis] += np.bincount(arrayEnds, weights=arrayForce[:, intAxis], minlength=len(arrayPositions))
+
+    return arrayDisplacement
+
+def runForceIterations(np, arrayPositions, arrayStarts, arrayEnds, arrayWeights, intIterations, floatTemperature, arrayFixed=None) -> object:
+    floatK = 1 / math.sqrt(max(len(arrayPositions), 1))
+    floatCooling = floatTemperature / (intIterations + 1)
+    arrayTargets = None if arrayFixed is None else np.nonzero(~arrayFixed)[0] # Repulsion is only computed for nodes that can move
+
+    for intIteration in range(intIterations):
+        arrayDisplacement = getRepulsion(np, arrayPositions, floatK * floatK, arrayTargets) + getAttraction(np, arrayPositions, arrayStarts, arrayEnds, arrayWeights, floatK)
+        if (arrayFixed is not None):
+            arrayDisplacement[arrayFixed] = 0
+
+        arrayLength = np.maximum(np.sqrt((arrayDisplacement ** 2).sum(axis=1)), 1e-12)
+        arrayPositions = arrayPositions + arrayDisplacement * (np.minimum(arrayLength, floatTemperature) / arrayLength)[:, None]
+        floatTemperature -= floatCooling
+
+    return arrayPositions
+
+def coarsenGraph(np, intNodes, arrayStarts, arrayEnds, arrayWeights, objectRandom) -> tuple:
+    # Heavy edge matching: visit edges from heavy to light (ties broken randomly) and merge both ends if still free
+    arrayOrder = np.lexsort((objectRandom.random(len(arrayWeights)), -arrayWeights))
+    arrayMapping = np.full(intNodes, -1, dtype=np.int64)
+    intCoarseNodes = 0
+    for intStart, intEnd in zip(arrayStarts[arrayOrder].tolist(), arrayEnds[arrayOrder].tolist()):
+        if (arrayMapping[intStart] == -1 and arrayMapping[intEnd] == -1):
+            arrayMapping[intStart] = intCoarseNodes
+            arrayMapping[intEnd] = intCoarseNodes
+            intCoarseNodes += 1
+
+    arrayUnmatched = np.nonzero(arrayMapping == -1)[0]
+    arrayMapping[arrayUnmatched] = np.arange(intCoarseNodes, intCoarseNodes + len(arrayUnmatched))
+    intCoarseNodes += len(arrayUnmatched)
+
+    # Edges between merged nodes are summed, edges inside a merged node disappear
+    arrayCoarseStarts = np.minimum(arrayMapping[arrayStarts], arrayMapping[arrayEnds])
+    arrayCoarseEnds = np.maximum(arrayMapping[arrayStarts], arrayMapping[arrayEnds])
+    arrayKept = arrayCoarseStarts != arrayCoarseEnds
+    arrayKeys, arrayInverse = np.unique(arrayCoarseStarts[arrayKept] * intCoarseNodes + arrayCoarseEnds[arrayKept], return_inverse=True)
+    arrayCoarseWeights = np.bincount(arrayInverse, weights=arrayWeights[arrayKept], minlength=len(arrayKeys))
+
+    return intCoarseNodes, arrayMapping, arrayKeys // intCoarseNodes, arrayKeys % intCoarseNodes, arrayCoarseWeights
+
+def layoutWarm(np, arrayNodes, arrayEdges, intSeed, dictInitial) -> dict:
+    objectRandom = np.random.default_rng(intSeed)
+    arrayStarts, arrayEnds, arrayWeights = getEdgeIndices(np, arrayNodes, arrayEdges)
+
+    # Work in the units of the force model, where int_NODE_SPACING pixels equal the natural edge length
+    floatK = 1 / math.sqrt(len(arrayNodes))
+    arrayPositions, arrayFixed = placeNewNodes(np, arrayNodes, arrayStarts, arrayEnds, dictInitial, floatK / int_NODE_SPACING, floatK, objectRandom)
+    arrayPositions = runForceIterations(np, arrayPositions, arrayStarts, arrayEnds, arrayWeights, 50, floatK * 2, arrayFixed)
+
+    return {node: dictInitial[node] if node in dictInitial else (round(float(arrayPosition[0]) * int_NODE_SPACING / floatK), round(float(arrayPosition[1]) * int_NODE_SPACING / floatK)) for node, arrayPosition in zip(arrayNodes, arrayPositions)}
+
+def layoutFruchtermanReingold(arrayNodes, arrayEdges, dictClusters, intSeed, dictInitial, objectMemo=None) -> dict:
+    import networkx as nx # Required for drawing topologies
+
+    graphCoordinateSource = nx.Graph()
+    graphCoordinateSource.add_nodes_from(arrayNodes)
+    graphCoordinateSource.add_edges_from(arrayEdges)
+    if (not dictInitial):
+        dictCoordinates = nx.fruchterman_reingold_layout(graphCoordinateSource, seed=intSeed)
+    else:
+        # Previous nodes are fixed, so networkx only moves the new ones and doesn't rescale the result
+        import numpy as np # Required for drawing topologies
+
+        arrayStarts, arrayEnds, arrayWeights = getEdgeIndices(np, arrayNodes, arrayEdges)
+        arrayPositions, arrayFixed = placeNewNodes(np, arrayNodes, arrayStarts, arrayEnds, dictInitial, 1 / int_LAYOUT_SCALE, 1 / math.sqrt(len(arrayNodes)), np.random.default_rng(intSeed))
+        dictCoordinates = nx.fruchterman_reingold_layout(graphCoordinateSource, pos=dict(zip(arrayNodes, arrayPositions)), fixed=list(dictInitial), seed=intSeed)
+
+    return {node: dictInitial[node] if node in dictInitial else (round(arrayCoordinate[0] * int_LAYOUT_SCALE), round(arrayCoordinate[1] * int_LAYOUT_SCALE)) for node, arrayCoordinate in dictCoordinates.items()}
+
+def layoutGrid(arrayNodes, arrayEdges, dictClusters, intSeed, dictInitial, objectMemo=None) -> dict:
+    # Nodes are placed row by row in creation order, so clusters end up next to each other
+    intColumns = max(1, math.ceil(math.sqrt(len(arrayNodes))))
+    intOffset = (intColumns - 1) * int_NODE_SPACING // 2
+    dictCoordinates = {node: ((intIndex % intColumns) * int_NODE_SPACING - intOffset, (intIndex // intColumns) * int_NODE_SPACING - intOffset) for intIndex, node in enumerate(arrayNodes)}
+
+    return anchorLayout(dictCoordinates, dictInitial, dictClusters) if dictInitial else dictCoordinates
+
+def layoutNone(arrayNodes, arrayEdges, dictClusters, intSeed, dictInitial, objectMemo=None) -> dict:
+    return {node: dictInitial.get(node, (0, 0)) for node in arrayNodes} # Every new node stays at the origin
+
+def layoutBarnesHut(arrayNodes, arrayEdges, dictClusters, intSeed, dictInitial, objectMemo=None) -> dict:
+    import numpy as np # Required for drawing topologies
+
+    if (dictInitial):
+        return layoutWarm(np, arrayNodes, arrayEdges, intSeed, dictInitial)
+
+    objectRandom = np.random.default_rng(intSeed)
+    arrayStarts, arrayEnds, arrayWeights = getEdgeIndices(np, arrayNodes, arrayEdges)
+    arrayPositions = runForceIterations(np, objectRandom.random((len(arrayNodes), 2)), arrayStarts, arrayEnds, arrayWeights, 50, 0.1)
+
+    return toPixels(np, arrayNodes, arrayPositions, arrayStarts, arrayEnds)
+
+def layoutMultilevel(arrayNodes, arrayEdges, dictClusters, intSeed, dictInitial, objectMemo=None) -> dict:
+    import numpy as np # Required for drawing topologies
+
+    if (dictInitial):
+        return layoutWarm(np, arrayNodes, arrayEdges, intSeed, dictInitial) # Previous nodes already form the coarse layout
+
+    objectRandom = np.random.default_rng(intSeed)
+    arrayStarts, arrayEnds, arrayWeights = getEdgeIndices(np, arrayNodes, arrayEdges)
+
+    # Coarsen until the graph is small, or until matching stops making progress (stars barely coarsen)
+    arrayLevels = [] # Holds per level a tuple containing the amount of nodes, the edges and the mapping to the next level
+    intNodes = len(arrayNodes)
+    while (intNodes > int_COARSEST_SIZE and len(arrayStarts) > 0):
+        intCoarseNodes, arrayMapping, arrayCoarseStarts, arrayCoarseEnds, arrayCoarseWeights = coarsenGraph(np, intNodes, arrayStarts, arrayEnds, arrayWeights, objectRandom)
+        if (intCoarseNodes > intNodes * 0.9):
+            break
+        arrayLevels.append((intNodes, arrayStarts, arrayEnds, arrayWeights, arrayMapping))
+        intNodes, arrayStarts, arrayEnds, arrayWeights = intCoarseNodes, arrayCoarseStarts, arrayCoarseEnds, arrayCoarseWeights
+
+    # Lay out the coarsest graph thoroughly, then refine level by level with a lower temperature
+    arrayPositions = runForceIterations(np, objectRandom.random((intNodes, 2)), arrayStarts, arrayEnds, arrayWeights, 100, 0.1)
+    for intNodes, arrayStarts, arrayEnds, arrayWeights, arrayMapping in reversed(arrayLevels):
+        floatK = 1 / math.sqrt(intNodes)
+        arrayPositions = arrayPositions[arrayMapping] + (objectRandom.random((intNodes, 2)) - 0.5) * floatK * 0.1
+        arrayPositions = runForceIterations(np, arrayPositions, arrayStarts, arrayEnds, arrayWeights, 20, floatK * 2)
+
+    return toPixels(np, arrayNodes, arrayPositions, arrayStarts, arrayEnds)
+
+def layoutCluster(arrayNodes, arrayEdges, dictClusters, intSeed, dictInitial, objectMemo=None) -> dict:
+    import numpy as np # Required for drawing topologies
+
+    # Every node without a cluster is a cluster on its own
+    dictMembers = {} # Holds per cluster its nodes, in creation order
+    for node in arrayNodes:
+        dictMembers.setdefault(dictClusters.get(node, node), []).append(node)
+    arrayClusters = list(dictMembers)
+    if (len(arrayClusters) == 0):
+        return {}
+
+    # Place the devices of every cluster locally: hub-and-spoke clusters get their hub in the middle, others a circle
+    dictDegrees = {} # Holds per node the amount of neighbours inside its own cluster
+    setLocalEdges = set() # Multiple cables between the same devices only count once
+    arraySuperEdges = []
+    for nodeStart, nodeEnd in arrayEdges:
+        if (dictClusters.get(nodeStart, nodeStart) == dictClusters.get(nodeEnd, nodeEnd)):
+            if (nodeStart != nodeEnd and (nodeStart, nodeEnd) not in setLocalEdges):
+                setLocalEdges.update(((nodeStart, nodeEnd), (nodeEnd, nodeStart)))
+                dictDegrees[nodeStart] = dictDegrees.get(nodeStart, 0) + 1
+                dictDegrees[nodeEnd] = dictDegrees.get(nodeEnd, 0) + 1
+        else:
+            arraySuperEdges.append((dictClusters.get(nodeStart, nodeStart), dictClusters.get(nodeEnd, nodeEnd)))
+
+    dictLocal = {}
+    arrayRadii = []
+    for cluster in arrayClusters:
+        arrayMembers = dictMembers[cluster]
+        arrayHubs = [node for node in arrayMembers if dictDegrees.get(node, 0) >= len(arrayMembers) - 1]
+        arrayRing = arrayMembers
+        if (len(arrayMembers) > 3 and len(arrayHubs) == 1):
+            dictLocal[arrayHubs[0]] = (0.0, 0.0)
+            arrayRing = [node for node in arrayMembers if node != arrayHubs[0]]
+
+        floatRadius = 0.0 if len(arrayRing) == 1 else int_NODE_SPACING / (2 * math.sin(math.pi / len(arrayRing))) # Neighbours on the circle are int_NODE_SPACING apart
+        if (len(arrayRing) < len(arrayMembers)):
+            floatRadius = max(floatRadius, int_NODE_SPACING) # Keep the spokes away from the hub
+        for intIndex, node in enumerate(arrayRing):
+            floatAngle = 2 * math.pi * intIndex / len(arrayRing)
+            dictLocal[node] = (floatRadius * math.cos(floatAngle), floatRadius * math.sin(floatAngle))
+        arrayRadii.append(floatRadius + int_NODE_SPACING / 2)
+
+    # Lay out the clusters as supernodes, then spread them out just enough for no two clusters to overlap
+    objectRandom = np.random.default_rng(intSeed)
+    arrayStarts, arrayEnds, arrayWeights = getEdgeIndices(np, arrayClusters, arraySuperEdges)
+    strKey = getMemoKey("supernodes", intSeed, len(arrayClusters), arrayStarts.tobytes(), arrayEnds.tobytes(), arrayWeights.tobytes()) if objectMemo != None else None
+    arrayRemembered = objectMemo.get(strKey) if objectMemo != None else None
+    if (arrayRemembered != None):
+        arrayPositions = np.frombuffer(arrayRemembered, dtype=np.float64).reshape(-1, 2)
+    else:
+        arrayPositions = runForceIterations(np, objectRandom.random((len(arrayClusters), 2)), arrayStarts, arrayEnds, arrayWeights, 100, 0.1)
+        if (objectMemo != None):
+            objectMemo.set(strKey, array("d", arrayPositions.ravel().tolist()))
+    arrayRadii = np.array(arrayRadii)
+
+    floatScale = 1.0
+    for intChunk in range(0, len(arrayClusters), 512):
+        arrayDistance = np.sqrt(((arrayPositions[intChunk:intChunk + 512, None, :] - arrayPositions[None, :, :]) ** 2).sum(axis=2))
+        arrayNeeded = arrayRadii[intChunk:intChunk + 512, None] + arrayRadii[None, :]
+        arrayDistance[np.arange(arrayDistance.shape[0]), np.arange(intChunk, intChunk + arrayDistance.shape[0])] = np.inf
+        floatScale = max(floatScale, float((arrayNeeded / np.maximum(arrayDistance, 1e-9)).max()))
+
+    arrayPositions = (arrayPositions - arrayPositions.mean(axis=0)) * floatScale
+    dictCoordinates = {}
+    for cluster, arrayPosition in zip(arrayClusters, arrayPositions):
+        for node in dictMembers[cluster]:
+            dictCoordinates[node] = (round(float(arrayPosition[0]) + dictLocal[node][0]), round(float(arrayPosition[1]) + dictLocal[node][1]))
+
+    return anchorLayout(dictCoordinates, dictInitial, dictClusters) if dictInitial else dictCoordinates
+
+dict_LAYOUT_ENGINES = {
+    "fruchterman-reingold": layoutFruchtermanReingold,
+    "barnes-hut": layoutBarnesHut,
+    "multilevel": layoutMultilevel,
+    "cluster": layoutCluster,
+    "grid": layoutGrid,
+    "none": layoutNone
+}
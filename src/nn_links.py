@@ -0,0 +1,183 @@
+from collections.abc import Iterable, Iterator # Required for generating links lazily
+
+"""
+###################################################################################################################
+Defining global variables.
+
+This section specifies variables that display repeated use throughout the link definitions.
+###################################################################################################################
+"""
+int_VECTORIZE_THRESHOLD = 4096 # Links a cluster or connection needs before NumPy (and its import) pays off
+
+"""
+###################################################################################################################
+Defining links.
+
+This section describes which links clusters and connections consist of, for routers and switches alike. Every
+clustermode and connectionmode is described as a few blocks of device pairs:
+
+    zip       pairs the devices of two lists one by one, until the shortest list is exhausted
+    product   pairs every device of one list with every device of another, row by row
+    triangle  pairs every device of a list with every device after it (a full mesh)
+
+Blocks are only expanded into the start and end devices of every link when the links are written. Small clusters and
+connections, the only ones that fit the port limit, are expanded lazily in plain Python: links are generated one at a
+time and get their ports right away, so the links of a cluster or connection never exist as a list. Large ones, like
+the meshes --plan is asked about, are expanded as NumPy index arrays, with the full mesh taken from triangular
+indices, and get their ports all at once. Both give the exact same links in the exact same order.
+
+- getShiftedPoints():
+  Rotates the devices of a cluster by the connectionshift of every input cluster with its tag, one after the other,
+  and returns a snapshot of the devices after every rotation.
+
+- countBlock():
+  Returns the amount of device pairs in a block.
+
+- expandBlocks():
+  Expands blocks into links, optionally dropping links whose reverse was already defined, and multiplying
+  every link by a number of cables. Returns a generator of start and end devices, or a tuple of NumPy arrays of start
+  and end devices for large blocks.
+
+- iterateBlocks():
+  Generates the start and end device of every link in some blocks, one link at a time.
+
+- defineClusterLinks():
+  Defines the internal links of a cluster, influenced by the clustermode variable.
+
+- defineConnectionLinks():
+  Defines the links of a connection between the shifted devices of its router clusters and, when it has one, its
+  switch cluster, influenced by the connectionmode variable.
+
+- writeLinks():
+  Adds links to the topology as they're generated, allocating the next free port on both ends, and returns how many
+  it added. Raises PortLimitError as soon as a device runs out of ports.
+###################################################################################################################
+"""
+def getShiftedPoints(arrayDevices, arrayInputClusters, booleanShiftable) -> list:
+    intShift = 0
+    arrayPoints = []
+    for objectInputCluster in arrayInputClusters:
+        if (booleanShiftable == True):
+            intShift = (intShift + objectInputCluster["connectionshift"]) % len(arrayDevices)
+        arrayPoints.append(arrayDevices[intShift:] + arrayDevices[:intShift])
+    return arrayPoints
+
+def countBlock(tupleBlock) -> int:
+    strKind, arrayFirst, arraySecond = tupleBlock
+    if (strKind == "zip"):
+        return min(len(arrayFirst), len(arraySecond))
+    if (strKind == "product"):
+        return len(arrayFirst) * len(arraySecond)
+    return len(arrayFirst) * (len(arrayFirst) - 1) // 2
+
+def expandBlocks(arrayBlocks, booleanUnique=False, intCables=1, objectProfile=None) -> Iterable:
+    intTotal = sum(countBlock(tupleBlock) for tupleBlock in arrayBlocks)
+    if (objectProfile != None and booleanUnique):
+        objectProfile.count("dedup checks", intTotal)
+
+    if (intTotal * intCables >= int_VECTORIZE_THRESHOLD):
+        import numpy as np # Required for defining large amounts of links
+
+        arrayStarts = []
+        arrayEnds = []
+        for strKind, arrayFirst, arraySecond in arrayBlocks:
+            arrayFirst = np.asarray(arrayFirst, dtype=np.int64)
+            if (strKind == "zip"):
+                intLength = min(len(arrayFirst), len(arraySecond))
+                arrayStarts.append(arrayFirst[:intLength])
+                arrayEnds.append(np.asarray(arraySecond, dtype=np.int64)[:intLength])
+            elif (strKind == "product"):
+                arrayStarts.append(np.repeat(arrayFirst, len(arraySecond)))
+                arrayEnds.append(np.tile(np.asarray(arraySecond, dtype=np.int64), len(arrayFirst)))
+            else:
+                arrayRows, arrayColumns = np.triu_indices(len(arrayFirst), 1)
+                arrayStarts.append(arrayFirst[arrayRows])
+                arrayEnds.append(arrayFirst[arrayColumns])
+        arrayStarts = np.concatenate(arrayStarts) if arrayStarts else np.zeros(0, dtype=np.int64)
+        arrayEnds = np.concatenate(arrayEnds) if arrayEnds else np.zeros(0, dtype=np.int64)
+
+        if (booleanUnique and len(arrayStarts) > 0):
+            # Both directions of a link share the same key: every link in the direction that came first is kept, every
+            # link in the other direction is dropped, and a link from a device to itself is only kept once
+            arrayKeys = np.minimum(arrayStarts, arrayEnds) * (int(max(arrayStarts.max(), arrayEnds.max())) + 1) + np.maximum(arrayStarts, arrayEnds)
+            arrayUnique, arrayFirsts, arrayInverse = np.unique(arrayKeys, return_index=True, return_inverse=True)
+            arrayFirsts = arrayFirsts[arrayInverse]
+            arrayKept = (arrayStarts == arrayStarts[arrayFirsts]) & ((arrayStarts != arrayEnds) | (np.arange(len(arrayStarts)) == arrayFirsts))
+            arrayStarts = arrayStarts[arrayKept]
+            arrayEnds = arrayEnds[arrayKept]
+        return np.repeat(arrayStarts, intCables), np.repeat(arrayEnds, intCables)
+
+    return iterateBlocks(arrayBlocks, booleanUnique, intCables)
+
+def iterateBlocks(arrayBlocks, booleanUnique=False, intCables=1) -> Iterator:
+    setLinks = set() # Holds every link kept so far, in the direction it was kept in
+    for strKind, arrayFirst, arraySecond in arrayBlocks:
+        if (strKind == "zip"):
+            iteratorPairs = zip(arrayFirst, arraySecond)
+        elif (strKind == "product"):
+            iteratorPairs = ((intStart, intEnd) for intStart in arrayFirst for intEnd in arraySecond)
+        else:
+            iteratorPairs = ((intStart, intEnd) for intIndex, intStart in enumerate(arrayFirst) for intEnd in arrayFirst[intIndex + 1:])
+
+        for tupleLink in iteratorPairs:
+            if (booleanUnique):
+                # Only the reverse of a link that was already kept is dropped, a link in the same direction is kept again
+                if ((tupleLink[1], tupleLink[0]) in setLinks):
+                    continue
+                setLinks.add(tupleLink)
+            for intCurrent in range(intCables):
+                yield tupleLink
+
+def defineClusterLinks(arrayDevices, strClusterMode, intCables) -> Iterable:
+    match strClusterMode:
+        case "full":
+            arrayBlocks = [("triangle", arrayDevices, None)]
+        case "loop":
+            arrayBlocks = [("zip", arrayDevices, arrayDevices[1:] + arrayDevices[:1])]
+        case "line":
+            arrayBlocks = [("zip", arrayDevices, arrayDevices[1:])] # The "cut" in the loop
+        case "hubspoke":
+            arrayBlocks = [("product", arrayDevices[:1], arrayDevices[1:])]
+    return expandBlocks(arrayBlocks, intCables=intCables)
+
+def defineConnectionLinks(strConnectionMode, arrayRouterPoints, arraySwitchPoints, arrayRouterTags, intCables=1, objectProfile=None) -> Iterable:
+    # arrayRouterPoints holds a tuple of the tag and the shifted devices of every involved router cluster in the input
+    # file, arraySwitchPoints the shifted devices of every switch cluster with the involved tag (empty without one)
+    arrayBlocks = []
+    booleanUnique = True
+    match strConnectionMode:
+        case "single":
+            # Put the switch cluster inbetween in case necessary
+            if (arraySwitchPoints):
+                arrayBlocks.append(("product", [tupleRouterPoint[1][0] for tupleRouterPoint in arrayRouterPoints], arraySwitchPoints[0][:1]))
+                booleanUnique = False
+            else:
+                arrayBlocks.append(("zip", [tupleRouterPointSTART[1][0] for tupleRouterPointSTART in arrayRouterPoints for tupleRouterPointEND in arrayRouterPoints if tupleRouterPointSTART[0] != tupleRouterPointEND[0]],
+                                           [tupleRouterPointEND[1][0] for tupleRouterPointSTART in arrayRouterPoints for tupleRouterPointEND in arrayRouterPoints if tupleRouterPointSTART[0] != tupleRouterPointEND[0]]))
+        case "full":
+            # Put the switch cluster inbetween in case necessary
+            if (arraySwitchPoints):
+                arrayBlocks += [("product", tupleRouterPoint[1], arraySwitchPoint) for tupleRouterPoint in arrayRouterPoints for arraySwitchPoint in arraySwitchPoints]
+            else:
+                arrayBlocks += [("product", tupleRouterPointSTART[1], tupleRouterPointEND[1]) for tupleRouterPointSTART in arrayRouterPoints for tupleRouterPointEND in arrayRouterPoints if tupleRouterPointSTART[0] != tupleRouterPointEND[0]]
+        case "parallel":
+            # Put the switch cluster inbetween in case necessary
+            if (arraySwitchPoints):
+                arrayBlocks += [("zip", tupleRouterPoint[1], arraySwitchPoint) for tupleRouterPoint in arrayRouterPoints for arraySwitchPoint in arraySwitchPoints]
+            else:
+                # Every pair of router clusters is cabled in parallel, after all of their shifts
+                dictLastPoints = {strTag: arrayShifted for strTag, arrayShifted in arrayRouterPoints}
+                arrayBlocks += [("zip", dictLastPoints[strTagSTART], dictLastPoints[strTagEND]) for intIndex, strTagSTART in enumerate(arrayRouterTags) for strTagEND in arrayRouterTags[intIndex + 1:]]
+                booleanUnique = False
+    return expandBlocks(arrayBlocks, booleanUnique, intCables, objectProfile)
+
+def writeLinks(objectTopology, links) -> int:
+    if (isinstance(links, tuple)):
+        objectTopology.addLinks(links[0], links[1]) # NumPy arrays are added at once
+        return len(links[0])
+
+    intLinks = 0
+    for intStart, intEnd in links:
+        objectTopology.addLink(intStart, intEnd)
+        intLinks += 1
+    return intLinks
@@ -0,0 +1,108 @@
+import time                 # Required for timing every stage
+import tracemalloc          # Required for measuring the peak memory of every stage
+
+"""
+###################################################################################################################
+Profiling builds.
+
+This section describes the report of a build with --profile. A profile is the dictionary of timings that buildTopology()
+and the command line already fill in, so every stage is timed the same way with or without it, but it also keeps
+track of the peak and held memory after every stage (with tracemalloc) and of counters, such as how many links were
+checked for duplicates. Memory is only traced between start() and stop(), which makes building a few times slower.
+
+- Profile:
+  The timings, memory and counters of every stage of a build, in the order the stages first ran. Storing the time of
+  a stage also records its memory.
+
+- Profile.getProfile():
+  Returns the dictionary of timings of a build if it's a Profile, so stages only count their work when profiled.
+
+- Profile.start():
+  Starts tracing memory and the total time of the build.
+
+- Profile.stop():
+  Stops tracing memory and the total time of the build.
+
+- Profile.recordMemory():
+  Records the peak memory since the previous stage and the memory still held after a stage.
+
+- Profile.count():
+  Adds an amount to a counter.
+
+- Profile.countTopology():
+  Counts the clusters, nodes and links of a built topology.
+
+- Profile.getReport():
+  Returns the profile as a dictionary that can be written as JSON.
+
+- Profile.formatReport():
+  Returns the profile as a table.
+###################################################################################################################
+"""
+class Profile(dict):
+    def __init__(self, booleanMemory=True):
+        super().__init__()
+        self.booleanMemory = booleanMemory
+        self.dictPeaks = {}     # Holds per stage the peak of the traced memory, in bytes
+        self.dictHeld = {}      # Holds per stage the traced memory after it ended, in bytes
+        self.dictCounters = {}
+        self.floatStart = None
+        self.floatTotal = 0.0
+
+    def __setitem__(self, strStage, floatSeconds) -> None:
+        super().__setitem__(strStage, floatSeconds)
+        self.recordMemory(strStage)
+
+    @staticmethod
+    def getProfile(dictTimings) -> object:
+        return dictTimings if isinstance(dictTimings, Profile) else None
+
+    def start(self) -> None:
+        if (self.booleanMemory and not tracemalloc.is_tracing()):
+            tracemalloc.start()
+        self.floatStart = time.perf_counter()
+
+    def stop(self) -> None:
+        if (self.floatStart != None):
+            self.floatTotal += time.perf_counter() - self.floatStart
+            self.floatStart = None
+        if (self.booleanMemory and tracemalloc.is_tracing()):
+            tracemalloc.stop()
+
+    def recordMemory(self, strStage) -> None:
+        if (not tracemalloc.is_tracing()):
+            return
+        intHeld, intPeak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        self.dictPeaks[strStage] = max(self.dictPeaks.get(strStage, 0), intPeak)
+        self.dictHeld[strStage] = intHeld
+
+    def count(self, strCounter, intAmount=1) -> None:
+        self.dictCounters[strCounter] = self.dictCounters.get(strCounter, 0) + intAmount
+
+    def countTopology(self, objectTopology) -> None:
+        self.count("clusters", len(objectTopology.arrayClusters))
+        self.count("nodes", len(objectTopology.arrayDeviceTypes))
+        self.count("links", len(objectTopology.arrayLinkStarts))
+
+    def getReport(self) -> dict:
+        return {
+            "seconds": self.floatTotal or sum(self.values()),
+            "peak_bytes": max(self.dictPeaks.values(), default=None),
+            "stages": [{"stage": strStage, "seconds": floatSeconds, "peak_bytes": self.dictPeaks.get(strStage), "held_bytes": self.dictHeld.get(strStage)} for strStage, floatSeconds in self.items()],
+            "counters": dict(self.dictCounters)
+        }
+
+    def formatReport(self) -> str:
+        dictReport = self.getReport()
+        floatTotal = dictReport["seconds"] or 1.0
+        arrayLines = [f"{'stage':<12} {'seconds':>10} {'share':>7} {'peak (MB)':>10} {'held (MB)':>10}"]
+        for dictStage in dictReport["stages"]:
+            strPeak = f"{dictStage['peak_bytes'] / 1048576:>10.2f}" if dictStage["peak_bytes"] != None else f"{'-':>10}"
+            strHeld = f"{dictStage['held_bytes'] / 1048576:>10.2f}" if dictStage["held_bytes"] != None else f"{'-':>10}"
+            arrayLines.append(f"{dictStage['stage']:<12} {dictStage['seconds']:>10.4f} {dictStage['seconds'] / floatTotal:>7.1%} {strPeak} {strHeld}")
+        arrayLines.append(f"{'total':<12} {dictReport['seconds']:>10.4f}")
+        arrayLines.append("")
+        for strCounter, intValue in dictReport["counters"].items():
+            arrayLines.append(f"{strCounter:<24} {intValue:>12}")
+        return "\n".join(arrayLines)
@@ -0,0 +1,172 @@
+import asyncio              # Required for pushing nodes and links concurrently
+import http.client          # Required for talking to the GNS3 server
+import json                 # Required for talking to the GNS3 server
+import queue                # Required for pooling connections to the GNS3 server
+import time                 # Required for retrying requests
+from base64 import b64encode # Required for authenticating with the GNS3 server
+from concurrent.futures import ThreadPoolExecutor # Required for pushing nodes and links concurrently
+from itertools import chain # Required for pushing nodes and links concurrently
+from urllib.parse import urlsplit, unquote # Required for parsing the address of the GNS3 server
+
+"""
+###################################################################################################################
+Defining global variables.
+
+This section specifies variables that display repeated use throughout pushing projects.
+###################################################################################################################
+"""
+int_DEFAULT_PORT = 3080     # The port a GNS3 server listens on by default
+int_PUSH_CONCURRENCY = 8    # The amount of requests sent to the GNS3 server at the same time, by default
+int_PUSH_RETRIES = 3        # The amount of times a failed request is sent again before giving up
+float_PUSH_BACKOFF = 0.5    # Seconds to wait before the first retry, doubled before every next one
+float_PUSH_TIMEOUT = 30.0   # Seconds to wait for the GNS3 server to answer a request
+tuple_RETRY_STATUSES = (408, 429, 502, 503, 504) # Statuses of a busy server (or proxy in front of it), worth trying again
+
+"""
+###################################################################################################################
+Pushing projects.
+
+This section creates a project directly on a GNS3 server through its v2 REST API, instead of writing a .gns3 file
+that has to be copied onto the server and opened there. Nodes and links keep the exact same node_ids, link_ids and
+coordinates as in the .gns3 file. Requests are sent from a few threads over a pool of keep-alive connections: every
+node is created concurrently, and every link as soon as both of its nodes exist. A request that fails because the
+server can't be reached or is busy is retried a few times; any other failure removes the half-pushed project from the
+server again.
+
+- PushError:
+  Raised when a project can't be pushed to the GNS3 server.
+
+- ConnectionPool:
+  Keeps connections to the GNS3 server open between requests, one per thread at most.
+
+- ConnectionPool.request():
+  Sends a request with a JSON body to the GNS3 server and returns its JSON answer, retrying when it fails because the
+  server can't be reached or is busy.
+
+- ConnectionPool.close():
+  Closes every idle connection.
+
+- pushProject():
+  Creates a project with all of its nodes and links on a GNS3 server and returns its project_id. Reports progress to
+  a function, when given one.
+
+- pushItems():
+  Creates the nodes and links of a project on the GNS3 server, a limited amount at the same time.
+###################################################################################################################
+"""
+class PushError(Exception):
+    pass
+
+class ConnectionPool:
+    __slots__ = ("strHost", "intPort", "booleanSecure", "dictHeaders", "floatTimeout", "queueIdle")
+
+    def __init__(self, strServer, floatTimeout=float_PUSH_TIMEOUT):
+        objectAddress = urlsplit(strServer if "://" in strServer else "http://" + strServer)
+        try:
+            intPort = objectAddress.port
+        except ValueError:
+            intPort = None
+            objectAddress = None
+        if (objectAddress == None or objectAddress.scheme not in ("http", "https") or not objectAddress.hostname):
+            raise PushError("'" + strServer + "' isn't the address of a GNS3 server, such as http://localhost:3080.")
+
+        self.strHost = objectAddress.hostname
+        self.intPort = intPort or int_DEFAULT_PORT
+        self.booleanSecure = objectAddress.scheme == "https"
+        self.dictHeaders = {"Content-Type": "application/json", "Accept": "application/json"}
+        if (objectAddress.username != None):
+            strCredentials = unquote(objectAddress.username) + ":" + unquote(objectAddress.password or "")
+            self.dictHeaders["Authorization"] = "Basic " + b64encode(strCredentials.encode()).decode()
+        self.floatTimeout = floatTimeout
+        self.queueIdle = queue.LifoQueue() # The most recently used connection is the most likely to still be open
+
+    def request(self, strMethod, strPath, objectBody=None):
+        bytesBody = json.dumps(objectBody).encode() if objectBody != None else None
+        strProblem = None
+        for intAttempt in range(int_PUSH_RETRIES + 1):
+            if (intAttempt > 0):
+                time.sleep(float_PUSH_BACKOFF * 2 ** (intAttempt - 1))
+            try:
+                connection = self.queueIdle.get_nowait()
+            except queue.Empty:
+                connection = (http.client.HTTPSConnection if self.booleanSecure else http.client.HTTPConnection)(self.strHost, self.intPort, timeout=self.floatTimeout)
+
+            try:
+                connection.request(strMethod, strPath, bytesBody, self.dictHeaders)
+                response = connection.getresponse()
+                bytesAnswer = response.read()
+            except (OSError, http.client.HTTPException) as err:
+                connection.close()
+                strProblem = str(err) or type(err).__name__
+                continue
+            self.queueIdle.put(connection)
+
+            if (response.status in tuple_RETRY_STATUSES):
+                strProblem = "status " + str(response.status)
+                continue
+            if (response.status == 409 and strMethod == "POST" and intAttempt > 0):
+                return None # An earlier attempt did reach the server, the item already exists
+            if (response.status >= 400):
+                try:
+                    strMessage = json.loads(bytesAnswer)["message"]
+                except (ValueError, TypeError, KeyError):
+                    strMessage = bytesAnswer.decode(errors="replace").strip() or response.reason
+                raise PushError(strMethod + " " + strPath + " failed with status " + str(response.status) + ": " + strMessage)
+            return json.loads(bytesAnswer) if bytesAnswer else None
+
+        raise PushError(strMethod + " " + strPath + " failed " + str(int_PUSH_RETRIES + 1) + " times, the last time with " + strProblem + ".")
+
+    def close(self) -> None:
+        while (not self.queueIdle.empty()):
+            self.queueIdle.get_nowait().close()
+
+def pushProject(objectGNS3Project, strServer, intConcurrency=int_PUSH_CONCURRENCY, functionProgress=None) -> str:
+    objectPool = ConnectionPool(strServer)
+    strProjectPath = "/v2/projects/" + objectGNS3Project["project_id"]
+    try:
+        objectVersion = objectPool.request("GET", "/v2/version")
+        if (not isinstance(objectVersion, dict) or not str(objectVersion.get("version", "")).startswith("2.")):
+            raise PushError(strServer + " doesn't seem to be a GNS3 2.x server.")
+
+        objectPool.request("POST", "/v2/projects", {"name": objectGNS3Project["name"], "project_id": objectGNS3Project["project_id"]})
+        try:
+            asyncio.run(pushItems(objectPool, strProjectPath, objectGNS3Project["topology"]["nodes"], objectGNS3Project["topology"]["links"], intConcurrency, functionProgress))
+        except BaseException:
+            # Don't leave a half-pushed project behind
+            try:
+                objectPool.request("DELETE", strProjectPath)
+            except PushError:
+                pass
+            raise
+    finally:
+        objectPool.close()
+    return objectGNS3Project["project_id"]
+
+async def pushItems(objectPool, strProjectPath, nodes, links, intConcurrency=int_PUSH_CONCURRENCY, functionProgress=None) -> None:
+    loop = asyncio.get_running_loop()
+    dictCreated = {} # Holds per node_id a future that's done once the node exists on the server
+    dictDone = {"nodes": 0, "links": 0}
+    iteratorItems = chain((("nodes", objectNode) for objectNode in nodes), (("links", objectLink) for objectLink in links)) # Shared by every worker, so every node is picked up before any link
+
+    async def pushNext() -> None:
+        for strKind, objectItem in iteratorItems:
+            if (strKind == "nodes"):
+                futureCreated = dictCreated[objectItem["node_id"]] = loop.create_future()
+            else:
+                for objectEnd in objectItem["nodes"]:
+                    await dictCreated[objectEnd["node_id"]]
+
+            await loop.run_in_executor(executor, objectPool.request, "POST", strProjectPath + "/" + strKind, objectItem)
+            if (strKind == "nodes"):
+                futureCreated.set_result(None)
+            dictDone[strKind] += 1
+            if (functionProgress != None):
+                functionProgress(dictDone["nodes"], len(nodes), dictDone["links"], len(links))
+
+    with ThreadPoolExecutor(max(1, intConcurrency)) as executor:
+        try:
+            async with asyncio.TaskGroup() as group:
+                for intCurrent in range(max(1, intConcurrency)):
+                    group.create_task(pushNext())
+        except ExceptionGroup as err:
+            raise err.exceptions[0] from None # The first request that failed, the others were only cancelled because of it
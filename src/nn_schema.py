@@ -0,0 +1,284 @@
+from typing import TypedDict # Required for describing the normalized input model
+import re                   # Required for checking IP summaries
+
+"""
+###################################################################################################################
+Defining the input model.
+
+This section describes what a validated and normalized input file looks like. Every optional variable has its
+default value filled in, so the rest of the engine never has to check for missing keys.
+###################################################################################################################
+"""
+class SwitchCluster(TypedDict):
+    tag: str
+    cables: int
+    ipclass: str
+    ipsummary: str
+    amount: int
+    clustermode: str
+    connectionshift: int
+
+class Connection(TypedDict):
+    tag: str
+    cables: int
+    ipclass: str
+    ipsummary: str
+    connectionmode: str
+    shiftable: bool
+    switches: SwitchCluster | None
+
+class RouterCluster(TypedDict):
+    tag: str
+    cables: int
+    ipclass: str
+    ipsummary: str
+    amount: int
+    clustermode: str
+    connectionshift: int
+    routing: str
+    gateway: bool
+    connectedto: list[str | Connection] | None
+
+class InputModel(TypedDict):
+    routers: list[RouterCluster]
+    connections: list[Connection] | None
+
+"""
+###################################################################################################################
+Defining the input schema.
+
+This section specifies the schema every input file must follow. It is the reference for the fast validator below
+and is only consulted directly when an input file turns out to be invalid, so its error messages can be shown.
+That's also why the schema library is only imported, and the schema only built, the first time it's needed.
+
+- UniqueTags:
+  Part of the schema: rejects a list of router clusters or connections in which the same tag is used more than once.
+  Switch clusters may share a tag across connections, that's how a connection refers to them.
+
+- getDesiredSchemaTotal():
+  Returns the schema of an entire input file.
+###################################################################################################################
+"""
+str_IP_SUMMARY_PATTERN = r"^(?:\d{1,3}\.){3}\d{1,3}\/(?:[1-9]|[1-2][0-9]|3[0-2])$"
+
+class InvalidInputError(Exception):
+    pass # Raised when an input file doesn't follow the schema; its message is the schema library's explanation
+
+class UniqueTags:
+    def __init__(self, strKind):
+        self.strKind = strKind
+
+    def validate(self, arrayData, **kwargs):
+        strTag = getDuplicateTag(arrayData)
+        if (strTag != None):
+            from schema import SchemaError
+            raise SchemaError("Tag '" + strTag + "' is used by more than one " + self.strKind + ".")
+        return arrayData
+
+objectDesiredSchemaTotal = None
+
+def getDesiredSchemaTotal():
+    global objectDesiredSchemaTotal
+    if (objectDesiredSchemaTotal != None):
+        return objectDesiredSchemaTotal
+
+    from schema import Schema, Optional, And, Or, Regex # Required for explaining invalid input files
+
+    objectDesiredSchemaBase = Schema({
+        "tag": str,
+        Optional("cables", default=1): And(int, lambda value: 1 <= value <= 3),
+        Optional("ipclass", default="A"): Or("A", "B", "C"),
+        Optional("ipsummary", default="auto"): Or("auto", Regex(str_IP_SUMMARY_PATTERN))
+    })
+
+    objectDesiredSchemaSwitchCluster = Schema({**objectDesiredSchemaBase.schema, **Schema({
+        Optional("amount", default=1): And(int, lambda value: 1 <= value <= 255),
+        Optional("clustermode", default="full"): Or("full", "loop", "line", "hubspoke"),
+        Optional("connectionshift", default=0): And(int, lambda value: 1 <= value <= 255)
+    }).schema})
+
+    objectDesiredSchemaConnection = Schema({**objectDesiredSchemaBase.schema, **Schema({
+        Optional("connectionmode", default="single"): Or("single", "full", "parallel"),
+        Optional("shiftable", default=True): bool,
+        Optional("switches", default=None): objectDesiredSchemaSwitchCluster
+    }).schema})
+
+    objectDesiredSchemaRouterCluster = Schema({**objectDesiredSchemaSwitchCluster.schema, **Schema({
+        Optional("routing", default="static"): Or("static"),
+        Optional("gateway", default=False): bool,
+        Optional("connectedto", default=None): [Or(str, objectDesiredSchemaConnection)]
+    }).schema})
+
+    objectDesiredSchemaTotal = Schema({
+        "input": {
+            "routers": And([objectDesiredSchemaRouterCluster], UniqueTags("router cluster")),
+            Optional("connections", default=None): And([objectDesiredSchemaConnection], UniqueTags("connection"))
+        }
+    })
+
+    return objectDesiredSchemaTotal
+
+"""
+###################################################################################################################
+Defining the fast validator.
+
+This section compiles the schema above into plain Python checks. Every check returns the normalized value, or
+object_INVALID when the value doesn't follow the schema. It mirrors the schema library's semantics exactly (for
+example, booleans don't count as integers), so both validators accept and reject the same input files.
+
+- getDuplicateTag():
+  Returns the first tag in a list of clusters or connections that was already used before it, or None.
+
+- compileDictValidator():
+  Turns a table of per-key checks and defaults into a single function validating one dictionary.
+
+- validateInputFast():
+  Validates and normalizes an entire input file, returning object_INVALID on the first violation.
+
+- validateInput():
+  Validates and normalizes an entire input file exactly once, raising an InvalidInputError on the first violation.
+###################################################################################################################
+"""
+object_INVALID = object() # Returned by checks on values that don't follow the schema
+object_REQUIRED = object() # Used as default for keys that must be present
+regex_IP_SUMMARY = re.compile(str_IP_SUMMARY_PATTERN)
+
+def checkString(value):
+    return value if isinstance(value, str) else object_INVALID
+
+def checkBoolean(value):
+    return value if isinstance(value, bool) else object_INVALID
+
+def checkIntegerBetween(intMinimum, intMaximum):
+    return lambda value: value if (isinstance(value, int) and not isinstance(value, bool) and intMinimum <= value <= intMaximum) else object_INVALID
+
+def checkChoice(*arrayChoices):
+    return lambda value: value if value in arrayChoices else object_INVALID
+
+def checkPattern(regexPattern):
+    return lambda value: value if (isinstance(value, str) and regexPattern.search(value) != None) else object_INVALID
+
+def checkList(functionCheckItem):
+    def checkListItems(value):
+        if (not isinstance(value, list)):
+            return object_INVALID
+
+        arrayResult = []
+        for item in value:
+            itemResult = functionCheckItem(item)
+            if (itemResult is object_INVALID):
+                return object_INVALID
+            arrayResult.append(itemResult)
+
+        return arrayResult
+
+    return checkListItems
+
+def checkAny(*arrayChecks):
+    def checkAnyOf(value):
+        for functionCheck in arrayChecks:
+            valueResult = functionCheck(value)
+            if (valueResult is not object_INVALID):
+                return valueResult
+
+        return object_INVALID
+
+    return checkAnyOf
+
+def checkUniqueTags(functionCheck):
+    def checkUniqueTagsOf(value):
+        valueResult = functionCheck(value)
+        if (valueResult is object_INVALID or getDuplicateTag(valueResult) != None):
+            return object_INVALID
+        return valueResult
+
+    return checkUniqueTagsOf
+
+def getDuplicateTag(arrayData):
+    setTags = set()
+    for objectData in arrayData:
+        if (objectData["tag"] in setTags):
+            return objectData["tag"]
+        setTags.add(objectData["tag"])
+    return None
+
+def compileDictValidator(dictFields):
+    setAllowedKeys = frozenset(dictFields)
+    arrayFields = list(dictFields.items())
+
+    def validateDict(objectData):
+        if (not isinstance(objectData, dict) or not setAllowedKeys.issuperset(objectData)):
+            return object_INVALID
+
+        objectResult = {}
+        for strKey, (functionCheck, default) in arrayFields:
+            if (strKey in objectData):
+                valueResult = functionCheck(objectData[strKey])
+                if (valueResult is object_INVALID):
+                    return object_INVALID
+                objectResult[strKey] = valueResult
+            elif (default is object_REQUIRED):
+                return object_INVALID
+            else:
+                objectResult[strKey] = default
+
+        return objectResult
+
+    return validateDict
+
+dict_FIELDS_BASE = {
+    "tag": (checkString, object_REQUIRED),
+    "cables": (checkIntegerBetween(1, 3), 1),
+    "ipclass": (checkChoice("A", "B", "C"), "A"),
+    "ipsummary": (checkAny(checkChoice("auto"), checkPattern(regex_IP_SUMMARY)), "auto")
+}
+
+dict_FIELDS_SWITCH_CLUSTER = {**dict_FIELDS_BASE, **{
+    "amount": (checkIntegerBetween(1, 255), 1),
+    "clustermode": (checkChoice("full", "loop", "line", "hubspoke"), "full"),
+    "connectionshift": (checkIntegerBetween(1, 255), 0)
+}}
+
+validateSwitchClusterFast = compileDictValidator(dict_FIELDS_SWITCH_CLUSTER)
+
+dict_FIELDS_CONNECTION = {**dict_FIELDS_BASE, **{
+    "connectionmode": (checkChoice("single", "full", "parallel"), "single"),
+    "shiftable": (checkBoolean, True),
+    "switches": (validateSwitchClusterFast, None)
+}}
+
+validateConnectionFast = compileDictValidator(dict_FIELDS_CONNECTION)
+
+dict_FIELDS_ROUTER_CLUSTER = {**dict_FIELDS_SWITCH_CLUSTER, **{
+    "routing": (checkChoice("static"), "static"),
+    "gateway": (checkBoolean, False),
+    "connectedto": (checkList(checkAny(checkString, validateConnectionFast)), None)
+}}
+
+validateRouterClusterFast = compileDictValidator(dict_FIELDS_ROUTER_CLUSTER)
+
+validateTotalFast = compileDictValidator({
+    "input": (compileDictValidator({
+        "routers": (checkUniqueTags(checkList(validateRouterClusterFast)), object_REQUIRED),
+        "connections": (checkUniqueTags(checkList(validateConnectionFast)), None)
+    }), object_REQUIRED)
+})
+
+def validateInputFast(objectInputFile) -> InputModel:
+    objectResult = validateTotalFast(objectInputFile)
+    if (objectResult is object_INVALID):
+        return object_INVALID
+
+    return objectResult["input"]
+
+def validateInput(objectInputFile) -> InputModel:
+    objectResult = validateInputFast(objectInputFile)
+    if (objectResult is object_INVALID):
+        # Only the schema library knows how to explain what's wrong
+        from schema import SchemaError
+        try:
+            objectResult = getDesiredSchemaTotal().validate(objectInputFile)["input"]
+        except SchemaError as err:
+            raise InvalidInputError(str(err))
+
+    return objectResult
@@ -0,0 +1,188 @@
+from array import array     # Required for storing devices and links compactly
+
+"""
+###################################################################################################################
+Defining global variables.
+
+This section specifies variables that display repeated use throughout the intermediate representation. Devices are
+identified by dense integers, starting from 0 in the order they're created, and so are links.
+###################################################################################################################
+"""
+int_ROUTER = 0
+int_SWITCH = 1
+int_CLOUD = 2
+array_DEVICE_TYPES = ["router", "switch", "cloud"]
+tuple_ADAPTERS = (1, 0, 0)  # The adapter every device type connects its links to: a router's NM-16ESW sits in slot 1
+int_PORT_LIMIT = 16         # Depends on NM-16ESW's 16 slot limit, arbitrarily the same for switches
+
+"""
+###################################################################################################################
+Defining the intermediate representation.
+
+This section describes the topology as it's built, before it's emitted as GNS3 objects. Clusters are small objects,
+but devices and links only exist as a row in a few typed arrays, so a device takes 26 bytes and a link 10 bytes.
+Nothing in here knows about node_ids or link_ids; those are only assigned when the topology is emitted.
+
+- PortLimitError:
+  Raised when a link would need a port beyond the port limit of one of its devices.
+
+- Cluster:
+  A router or switch cluster: its tag, device type and devices, in the order they were created. Gateway clouds belong
+  to the router cluster they're connected to, but aren't one of its devices.
+
+- Topology:
+  All clusters, indexed by device type and tag, and the device and link tables.
+
+- Topology.getCluster():
+  Looks up the cluster of a device type with a certain tag, creating it when it doesn't exist yet.
+
+- Topology.addDevice():
+  Adds a device to a cluster. Its number is what its name ends with.
+
+- Topology.addLink():
+  Adds a link between two devices, allocating the next free port on both.
+
+- Topology.addLinks():
+  Adds many links at once from NumPy arrays of start and end devices, allocating ports exactly like addLink() would
+  one link after the other. Nothing is added when one of the devices runs out of ports.
+
+- Topology.addLinkGroup():
+  Marks where the links of a router cluster, switch cluster or connection start, so they can be told apart later
+  (for addressing them). A group's links run up to the first link of the next group; gateway links don't get one.
+
+- Topology.getDeviceName():
+  Returns the name of a device, as shown in GNS3.
+
+- TopologyPlan:
+  A topology that only counts links and the ports every device needs, without a port limit, for planning networks
+  before they're built.
+###################################################################################################################
+"""
+class PortLimitError(Exception):
+    def __init__(self, intType):
+        super().__init__(array_DEVICE_TYPES[intType])
+        self.intType = intType
+
+class Cluster:
+    __slots__ = ("intId", "strTag", "intType", "arrayDevices")
+
+    def __init__(self, intId, strTag, intType):
+        self.intId = intId
+        self.strTag = strTag
+        self.intType = intType
+        self.arrayDevices = []
+
+class Topology:
+    __slots__ = ("arrayClusters", "dictClusters", "arrayDeviceTypes", "arrayDeviceClusters", "arrayDeviceNumbers", "arrayDevicePorts", "arrayX", "arrayY", "arrayLinkStarts", "arrayLinkStartPorts", "arrayLinkEnds", "arrayLinkEndPorts", "arrayLinkGroups")
+
+    def __init__(self):
+        self.arrayClusters = []
+        self.dictClusters = {} # Holds per tuple of device type and tag its cluster
+
+        # The device table, one row per device
+        self.arrayDeviceTypes = array("B")
+        self.arrayDeviceClusters = array("I")
+        self.arrayDeviceNumbers = array("I")
+        self.arrayDevicePorts = array("B") # The next free port, every device type connects all of its links to a single adapter
+        self.arrayX = array("q")
+        self.arrayY = array("q")
+
+        # The link table, one row per link
+        self.arrayLinkStarts = array("I")
+        self.arrayLinkStartPorts = array("B")
+        self.arrayLinkEnds = array("I")
+        self.arrayLinkEndPorts = array("B")
+        self.arrayLinkGroups = [] # Holds per cluster or connection a tuple of its first link, its kind and its input definition
+
+    def getCluster(self, intType, strTag) -> Cluster:
+        objectCluster = self.dictClusters.get((intType, strTag))
+        if (objectCluster == None):
+            objectCluster = Cluster(len(self.arrayClusters), strTag, intType)
+            self.arrayClusters.append(objectCluster)
+            self.dictClusters[(intType, strTag)] = objectCluster
+        return objectCluster
+
+    def addDevice(self, objectCluster, intNumber, intType=None) -> int:
+        intDevice = len(self.arrayDeviceTypes)
+        self.arrayDeviceTypes.append(objectCluster.intType if intType == None else intType)
+        self.arrayDeviceClusters.append(objectCluster.intId)
+        self.arrayDeviceNumbers.append(intNumber)
+        self.arrayDevicePorts.append(0)
+        self.arrayX.append(0)
+        self.arrayY.append(0)
+        if (intType == None):
+            objectCluster.arrayDevices.append(intDevice)
+        return intDevice
+
+    def addLink(self, intStart, intEnd) -> int:
+        for intDevice in (intStart, intEnd):
+            if (self.arrayDevicePorts[intDevice] >= int_PORT_LIMIT):
+                raise PortLimitError(self.arrayDeviceTypes[intDevice])
+
+        intLink = len(self.arrayLinkStarts)
+        self.arrayLinkStarts.append(intStart)
+        self.arrayLinkStartPorts.append(self.arrayDevicePorts[intStart])
+        self.arrayDevicePorts[intStart] += 1
+        self.arrayLinkEnds.append(intEnd)
+        self.arrayLinkEndPorts.append(self.arrayDevicePorts[intEnd])
+        self.arrayDevicePorts[intEnd] += 1
+        return intLink
+
+    def addLinks(self, arrayStarts, arrayEnds) -> int:
+        import numpy as np # Required for adding large amounts of links
+
+        # Every endpoint gets the next free port of its device, in the order addLink() would visit them
+        arrayEndpoints = np.empty(2 * len(arrayStarts), dtype=np.int64)
+        arrayEndpoints[0::2] = arrayStarts
+        arrayEndpoints[1::2] = arrayEnds
+        arrayOrder = np.argsort(arrayEndpoints, kind="stable")
+        arraySorted = arrayEndpoints[arrayOrder]
+        arrayIndices = np.arange(len(arraySorted))
+        arrayGroupStarts = np.maximum.accumulate(np.where(np.concatenate(([True], arraySorted[1:] != arraySorted[:-1])), arrayIndices, 0))
+        arrayRanks = np.empty_like(arrayIndices)
+        arrayRanks[arrayOrder] = arrayIndices - arrayGroupStarts
+        arrayPorts = np.frombuffer(self.arrayDevicePorts, dtype=self.arrayDevicePorts.typecode).astype(np.int64)[arrayEndpoints] + arrayRanks
+
+        arrayFull = np.flatnonzero(arrayPorts >= int_PORT_LIMIT)
+        if (len(arrayFull) > 0):
+            raise PortLimitError(self.arrayDeviceTypes[int(arrayEndpoints[arrayFull[0]])])
+
+        intLink = len(self.arrayLinkStarts)
+        self.arrayLinkStarts.frombytes(arrayEndpoints[0::2].astype(self.arrayLinkStarts.typecode).tobytes())
+        self.arrayLinkStartPorts.frombytes(arrayPorts[0::2].astype(self.arrayLinkStartPorts.typecode).tobytes())
+        self.arrayLinkEnds.frombytes(arrayEndpoints[1::2].astype(self.arrayLinkEnds.typecode).tobytes())
+        self.arrayLinkEndPorts.frombytes(arrayPorts[1::2].astype(self.arrayLinkEndPorts.typecode).tobytes())
+        for intDevice, intCount in zip(*(arrayColumn.tolist() for arrayColumn in np.unique(arrayEndpoints, return_counts=True))):
+            self.arrayDevicePorts[intDevice] += intCount
+        return intLink
+
+    def addLinkGroup(self, strKind, objectDefinition) -> None:
+        self.arrayLinkGroups.append((len(self.arrayLinkStarts), strKind, objectDefinition))
+
+    def getDeviceName(self, intDevice) -> str:
+        objectCluster = self.arrayClusters[self.arrayDeviceClusters[intDevice]]
+        if (self.arrayDeviceTypes[intDevice] == int_CLOUD):
+            return "INTERNET-" + objectCluster.strTag
+        return objectCluster.strTag + "-id" + str(self.arrayDeviceNumbers[intDevice])
+
+class TopologyPlan(Topology):
+    __slots__ = ("intLinks",)
+
+    def __init__(self):
+        super().__init__()
+        self.arrayDevicePorts = array("I") # The port demand of a device, which may go far beyond the port limit
+        self.intLinks = 0
+
+    def addLink(self, intStart, intEnd) -> int:
+        self.arrayDevicePorts[intStart] += 1
+        self.arrayDevicePorts[intEnd] += 1
+        self.intLinks += 1
+        return self.intLinks - 1
+
+    def addLinks(self, arrayStarts, arrayEnds) -> int:
+        import numpy as np # Required for adding large amounts of links
+
+        for intDevice, intCount in zip(*(arrayColumn.tolist() for arrayColumn in np.unique(np.concatenate((arrayStarts, arrayEnds)), return_counts=True))):
+            self.arrayDevicePorts[intDevice] += intCount
+        self.intLinks += len(arrayStarts)
+        return self.intLinks - len(arrayStarts)
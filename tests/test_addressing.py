@@ -0,0 +1,46 @@
+import re
+from collections import defaultdict
+
+import nn
+from nn_addressing import formatAddress
+from nn_configs import prepareConfigs, renderConfig, tuple_MASKS
+
+# Every router has two cables to both switches of the LAN, and two to its neighbour
+dict_INPUT_FILE = {
+    "input": {
+        "routers": [
+            {"tag": "core", "amount": 2, "clustermode": "full", "cables": 2, "connectedto": ["lan"]},
+            {"tag": "edge", "amount": 1, "connectedto": ["lan"]}
+        ],
+        "connections": [
+            {"tag": "lan", "connectionmode": "full", "cables": 2, "switches": {"tag": "access", "amount": 2, "clustermode": "full"}}
+        ]
+    }
+}
+
+def test_plan_and_configs_agree():
+    objectGNS3Project, objectEmitter = nn.buildProject(dict_INPUT_FILE, strLayout="none", strSeed="addressing")
+    objectTopology = objectEmitter.objectTopology
+    objectAddressPlan = nn.planProjectAddresses(objectTopology)
+    objectConfigPlan = prepareConfigs(objectAddressPlan, objectEmitter)
+
+    dictPlanned = defaultdict(dict) # Holds per router the planned address and mask of every port
+    dictLANAddresses = defaultdict(set) # Holds per router its addresses in the LAN
+    for intDevice, intPort, intAddress, intPrefix, intLink, intSummary in objectAddressPlan.iterateInterfaces():
+        strName = objectTopology.getDeviceName(intDevice)
+        dictPlanned[strName][intPort] = formatAddress(intAddress) + " " + tuple_MASKS[intPrefix]
+        if (objectAddressPlan.arraySummaries[intSummary][0] == "switch"):
+            dictLANAddresses[strName].add(intAddress)
+
+    # More cables and more switches still give a router a single address in the LAN
+    assert sorted(dictLANAddresses) == ["core-id1", "core-id2", "edge-id1"]
+    assert all(len(setAddresses) == 1 for setAddresses in dictLANAddresses.values())
+    assert len(set.union(*dictLANAddresses.values())) == 3
+
+    for intRouter, strName in enumerate(objectConfigPlan.arrayNames):
+        strConfig = renderConfig(objectConfigPlan, intRouter)
+        dictVLANs = dict(re.findall(r"interface Vlan(\d+)\n ip address (.+)\n", strConfig))
+        dictPorts = {int(strPort): strVLAN for strPort, strVLAN in re.findall(r"interface FastEthernet1/(\d+)\n description .*\n switchport access vlan (\d+)\n", strConfig)}
+        # Every planned interface is configured with its planned address, and every configured address was planned
+        assert {intPort: dictVLANs[strVLAN] for intPort, strVLAN in dictPorts.items()} == dictPlanned[strName]
+        assert set(dictVLANs.values()) == set(dictPlanned[strName].values())
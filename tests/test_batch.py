@@ -0,0 +1,70 @@
+import json
+import os
+import shutil
+
+import pytest
+
+import nn
+
+str_EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "example_input_file.yml")
+
+def runMain(arrayArguments) -> object:
+    # Returns the exit code of nn.py, None when it finished without calling exit()
+    try:
+        nn.main(arrayArguments)
+    except SystemExit as objectExit:
+        return objectExit.code
+    return None
+
+def writeInputs(objectDirectory) -> None:
+    shutil.copy(str_EXAMPLE, objectDirectory / "a_good.yml")
+    (objectDirectory / "b_syntax.yml").write_text("input:\n  routers: [\n")
+    (objectDirectory / "c_schema.yml").write_text("input:\n  routers:\n    - tag: rout_A\n      clustermode: star\n")
+    shutil.copy(str_EXAMPLE, objectDirectory / "d_good.yml")
+
+def test_batch_keeps_going_after_a_bad_file(tmp_path, capsys):
+    writeInputs(tmp_path)
+    strSummary = str(tmp_path / "summary.json")
+    intCode = runMain(["--batch", str(tmp_path / "*.yml"), str(tmp_path / "missing_*.yml"), "--output-dir", str(tmp_path / "out"), "--gateway-interface", "eth0", "--layout", "none", "--seed", "batch", "--workers", "2", "--summary", strSummary])
+    assert intCode == 1
+    assert "Built 2 of 5 input files" in capsys.readouterr().out
+
+    with open(strSummary) as objectFile:
+        objectSummary = json.load(objectFile)
+    assert (objectSummary["built"], objectSummary["failed"]) == (2, 3)
+    assert [os.path.basename(objectResult["input"]) for objectResult in objectSummary["files"]] == ["a_good.yml", "b_syntax.yml", "c_schema.yml", "d_good.yml", "missing_*.yml"]
+    assert [objectResult["status"] for objectResult in objectSummary["files"]] == ["ok", "error", "error", "ok", "error"]
+    assert objectSummary["files"][1]["error"] == "Invalid .yml file. There is a syntax error."
+    assert objectSummary["files"][2]["error"].startswith("Invalid input file.")
+    assert objectSummary["files"][4]["error"] == "No input files match this pattern."
+    assert sorted(os.listdir(tmp_path / "out")) == ["a_good.gns3", "d_good.gns3"] # Failed builds leave nothing behind
+
+    # A batch build is the same as a single build
+    assert runMain(["-i", str_EXAMPLE, "-o", str(tmp_path / "single.gns3"), "--gateway-interface", "eth0", "--layout", "none", "--seed", "batch"]) == None
+    assert (tmp_path / "out" / "a_good.gns3").read_bytes() == (tmp_path / "single.gns3").read_bytes()
+
+def test_batch_without_failures(tmp_path):
+    shutil.copy(str_EXAMPLE, tmp_path / "lab.yml")
+    assert runMain(["--batch", str(tmp_path / "*.yml"), "--gateway-interface", "eth0", "--layout", "none", "--workers", "1", "--archive"]) == None
+    assert (tmp_path / "lab.gns3project").exists()
+
+def test_manifest(tmp_path):
+    writeInputs(tmp_path)
+    (tmp_path / "manifest.yml").write_text("- input: a_good.yml\n  output: built/first.gns3\n  name: first\n- input: b_syntax.yml\n  output: built/broken.gns3\n- input: d_good.yml\n  output: built/second.gns3\n")
+    strSummary = str(tmp_path / "summary.json")
+    assert runMain(["--manifest", str(tmp_path / "manifest.yml"), "--gateway-interface", "eth0", "--layout", "none", "--workers", "1", "--summary", strSummary]) == 1
+
+    with open(strSummary) as objectFile:
+        objectSummary = json.load(objectFile)
+    assert [objectResult["output"] for objectResult in objectSummary["files"]] == [str(tmp_path / "built" / strName) for strName in ("first.gns3", "broken.gns3", "second.gns3")] # Relative to the manifest
+    assert [objectResult["status"] for objectResult in objectSummary["files"]] == ["ok", "error", "ok"]
+    with open(tmp_path / "built" / "first.gns3") as objectFile:
+        assert json.load(objectFile)["name"].startswith("first (ID: ")
+    with open(tmp_path / "built" / "second.gns3") as objectFile:
+        assert json.load(objectFile)["name"].startswith(nn.str_DEFAULT_NAME + " (ID: ")
+
+@pytest.mark.parametrize("strManifest", ["input: lab.yml\n", "- input: lab.yml\n"], ids=["not-a-list", "no-output"])
+def test_invalid_manifest(tmp_path, capsys, strManifest):
+    (tmp_path / "manifest.yml").write_text(strManifest)
+    assert runMain(["--manifest", str(tmp_path / "manifest.yml")]) == 1
+    assert capsys.readouterr().out.rstrip().endswith("Aborting.")
@@ -0,0 +1,92 @@
+import copy
+import json
+import pickle
+
+import pytest
+
+import nn
+import nn_layout
+
+dict_INPUT_FILE = {
+    "input": {
+        "routers": [
+            {"tag": "core", "amount": 4, "clustermode": "full", "connectedto": ["uplink"]},
+            {"tag": "edge", "amount": 3, "clustermode": "loop", "connectedto": ["uplink"]},
+            {"tag": "lab", "amount": 2, "clustermode": "line", "connectedto": ["uplink"]}
+        ],
+        "connections": [
+            {"tag": "uplink", "connectionmode": "single", "switches": {"tag": "access", "amount": 2, "clustermode": "line"}}
+        ]
+    }
+}
+
+def build(objectInputFile, strLayout, objectMemo, strPath):
+    objectGNS3Project = nn.buildProject(objectInputFile, strLayout=strLayout, strSeed="cache", objectLayoutMemo=objectMemo)[0]
+    nn.writeProject(objectGNS3Project, strPath)
+    with open(strPath, "rb") as stream:
+        return stream.read()
+
+def getCoordinates(bytesProject) -> dict:
+    return {objectNode["name"]: (objectNode["x"], objectNode["y"]) for objectNode in json.loads(bytesProject)["topology"]["nodes"]}
+
+def rebuildThroughCache(objectMemo, strCachePath) -> nn.LayoutMemo:
+    nn.writeBuildCache(strCachePath, objectMemo)
+    return nn.readBuildCache(strCachePath)
+
+@pytest.mark.parametrize("strLayout", ["fruchterman-reingold", "barnes-hut", "cluster"])
+def test_cached_rebuild_matches_clean_build(tmp_path, monkeypatch, strLayout):
+    bytesClean = build(dict_INPUT_FILE, strLayout, None, str(tmp_path / "clean.gns3"))
+    assert build(dict_INPUT_FILE, strLayout, nn.LayoutMemo(), str(tmp_path / "first.gns3")) == bytesClean
+
+    objectMemo = nn.LayoutMemo()
+    build(dict_INPUT_FILE, strLayout, objectMemo, str(tmp_path / "lab.gns3"))
+    objectMemo = rebuildThroughCache(objectMemo, str(tmp_path / "lab.layouts"))
+    monkeypatch.setitem(nn_layout.dict_LAYOUT_ENGINES, strLayout, None) # An unchanged network isn't laid out again
+    assert build(dict_INPUT_FILE, strLayout, objectMemo, str(tmp_path / "lab.gns3")) == bytesClean
+
+def test_edited_cluster_is_only_one_laid_out(tmp_path, monkeypatch):
+    objectMemo = nn.LayoutMemo()
+    dictBefore = getCoordinates(build(dict_INPUT_FILE, "fruchterman-reingold", objectMemo, str(tmp_path / "lab.gns3")))
+    objectMemo = rebuildThroughCache(objectMemo, str(tmp_path / "lab.layouts"))
+
+    arrayPlaced = []
+    functionEngine = nn_layout.dict_LAYOUT_ENGINES["fruchterman-reingold"]
+    def recordEngine(arrayNodes, arrayEdges, dictClusters, intSeed, dictInitial, objectMemo=None):
+        arrayPlaced.append(len(arrayNodes) - len(dictInitial))
+        return functionEngine(arrayNodes, arrayEdges, dictClusters, intSeed, dictInitial, objectMemo)
+    monkeypatch.setitem(nn_layout.dict_LAYOUT_ENGINES, "fruchterman-reingold", recordEngine)
+
+    objectInputFile = copy.deepcopy(dict_INPUT_FILE)
+    objectInputFile["input"]["routers"][1]["amount"] = 5 # The edge cluster grows from 3 to 5 routers
+    dictAfter = getCoordinates(build(objectInputFile, "fruchterman-reingold", objectMemo, str(tmp_path / "lab.gns3")))
+    assert arrayPlaced == [5]
+    for strName, tupleCoordinates in dictBefore.items():
+        if (not strName.startswith("edge-")):
+            assert dictAfter[strName] == tupleCoordinates
+
+def test_edited_cluster_engine_matches_clean_build(tmp_path):
+    objectMemo = nn.LayoutMemo()
+    build(dict_INPUT_FILE, "cluster", objectMemo, str(tmp_path / "lab.gns3"))
+    objectMemo = rebuildThroughCache(objectMemo, str(tmp_path / "lab.layouts"))
+
+    objectInputFile = copy.deepcopy(dict_INPUT_FILE)
+    objectInputFile["input"]["routers"][1]["clustermode"] = "full"
+    assert build(objectInputFile, "cluster", objectMemo, str(tmp_path / "lab.gns3")) == build(objectInputFile, "cluster", None, str(tmp_path / "clean.gns3"))
+
+def test_cache_file_never_unpickled(tmp_path):
+    strCachePath = str(tmp_path / "lab.layouts")
+    objectMemo = nn.LayoutMemo()
+    build(dict_INPUT_FILE, "fruchterman-reingold", objectMemo, str(tmp_path / "lab.gns3"))
+    nn.writeBuildCache(strCachePath, objectMemo)
+    with open(strCachePath, "rb") as stream:
+        objectHeader = json.loads(stream.readline())
+    assert objectHeader["version"] == nn.int_MEMO_VERSION and len(objectHeader["layouts"]) == 5 # The whole layout and every cluster
+
+    # A pickle that would run code, or a cache that's cut short, is ignored
+    class Payload:
+        def __reduce__(self):
+            return (pytest.fail, ("unpickled",))
+    for bytesCache in (pickle.dumps({"version": nn.int_MEMO_VERSION, "layouts": Payload()}), open(strCachePath, "rb").read()[:-8]):
+        with open(strCachePath, "wb") as stream:
+            stream.write(bytesCache)
+        assert nn.readBuildCache(strCachePath).getRecentEntries() == {}
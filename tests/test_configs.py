@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+import nn
+
+dict_INPUT_FILE = {
+    "input": {
+        "routers": [{"tag": "core", "amount": 3, "clustermode": "loop"}]
+    }
+}
+
+def buildConfiguredProject():
+    objectGNS3Project, objectEmitter = nn.buildProject(dict_INPUT_FILE, strLayout="none", strSeed="configs")
+    arrayFiles = nn.renderProjectConfigs(objectEmitter, nn.planProjectAddresses(objectEmitter.objectTopology), intWorkers=1)
+    return objectGNS3Project, arrayFiles
+
+def listFiles(strDirectory) -> list:
+    return sorted(os.path.relpath(os.path.join(strRoot, strFile), strDirectory).replace(os.sep, "/") for strRoot, arrayDirectories, arrayFiles in os.walk(strDirectory) for strFile in arrayFiles)
+
+def test_configs_written_with_project(tmp_path):
+    objectGNS3Project, arrayFiles = buildConfiguredProject()
+    nn.writeProject(objectGNS3Project, str(tmp_path / "lab.gns3"), arrayFiles=arrayFiles)
+    assert listFiles(tmp_path) == sorted(["lab.gns3"] + [strPath for strPath, strContent in arrayFiles])
+    for strPath, strContent in arrayFiles:
+        assert (tmp_path / strPath).read_text() == strContent
+
+def test_configs_not_left_behind_when_project_fails(tmp_path, monkeypatch):
+    objectGNS3Project, arrayFiles = buildConfiguredProject()
+
+    def failReplace(strSource, strDestination):
+        raise OSError(28, "No space left on device")
+    monkeypatch.setattr(os, "replace", failReplace)
+    with pytest.raises(nn.NetworkNarcoticError, match="No space left on device"):
+        nn.writeProject(objectGNS3Project, str(tmp_path / "lab.gns3"), arrayFiles=arrayFiles)
+    assert listFiles(tmp_path) == []
@@ -0,0 +1,115 @@
+import json
+import os
+import re
+import shutil
+from collections import Counter
+
+import networkx
+import pytest
+import yaml
+
+import nn
+import nn_emitters
+
+str_EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "example_input_file.yml")
+
+# Tags with spaces, and switch names too long for a Linux bridge
+dict_LONG_TAGS = {"input": {
+    "connections": [{"tag": "core uplinks", "connectionmode": "parallel", "cables": 2, "switches": {"tag": "distribution switches", "amount": 12, "clustermode": "loop"}}],
+    "routers": [{"tag": "core routers", "amount": 3, "gateway": True, "connectedto": ["core uplinks"]}, {"tag": "edge", "amount": 2, "connectedto": ["core uplinks"]}]
+}}
+
+@pytest.fixture(params=["example", "long-tags"])
+def built(request, tmp_path) -> tuple:
+    # Builds an input file into every format at once, returning the output directory and the .gns3 project
+    if (request.param == "example"):
+        shutil.copy(str_EXAMPLE, tmp_path / "lab.yml")
+    else:
+        (tmp_path / "lab.yml").write_text(yaml.safe_dump(dict_LONG_TAGS))
+    nn.main(["-i", str(tmp_path / "lab.yml"), "-o", str(tmp_path / "lab.gns3"), "-n", "round trip", "--gateway-interface", "eth0", "--layout", "grid",
+             "--ansible", str(tmp_path / "inventory.yml"), "--graphml", str(tmp_path / "lab.graphml"), "--edgelist", str(tmp_path / "lab.tsv"), "--containerlab", str(tmp_path / "lab.clab.yml")])
+    with open(tmp_path / "lab.gns3") as objectFile:
+        return tmp_path, json.load(objectFile)
+
+def getNodes(objectGNS3Project) -> dict:
+    return {objectNode["node_id"]: objectNode for objectNode in objectGNS3Project["topology"]["nodes"]}
+
+def getLinks(objectGNS3Project) -> Counter:
+    # Every link as the names and port numbers of both ends
+    dictNodes = getNodes(objectGNS3Project)
+    return Counter(tuple((dictNodes[objectEnd["node_id"]]["name"], objectEnd["port_number"]) for objectEnd in objectLink["nodes"]) for objectLink in objectGNS3Project["topology"]["links"])
+
+def getCluster(strName) -> str:
+    return strName.rsplit("-id", 1)[0]
+
+def test_ansible_round_trip(built):
+    tmp_path, objectGNS3Project = built
+    with open(tmp_path / "inventory.yml") as objectFile:
+        objectInventory = yaml.safe_load(objectFile)
+    assert objectInventory["all"]["vars"]["gns3_project"] == "round trip"
+
+    dictHosts = {}
+    for strParent, strType in (("routers", "router"), ("switches", "switch")):
+        for strGroup, objectGroup in objectInventory["all"]["children"][strParent]["children"].items():
+            assert re.fullmatch(r"\w+", strGroup)
+            for strHost, dictVariables in objectGroup["hosts"].items():
+                assert strGroup == nn_emitters.getGroupName(nn.int_ROUTER if strType == "router" else nn.int_SWITCH, dictVariables["gns3_cluster"])
+                assert getCluster(strHost) == dictVariables["gns3_cluster"]
+                dictHosts[dictVariables["gns3_node_id"]] = strHost
+    assert dictHosts == {strNodeId: objectNode["name"] for strNodeId, objectNode in getNodes(objectGNS3Project).items() if objectNode["node_type"] != "cloud"}
+
+def test_graphml_round_trip(built):
+    tmp_path, objectGNS3Project = built
+    graph = networkx.read_graphml(tmp_path / "lab.graphml", force_multigraph=True)
+    dictNodes = getNodes(objectGNS3Project)
+    assert set(graph.nodes) == set(dictNodes)
+    for strNodeId, dictData in graph.nodes(data=True):
+        assert dictData["name"] == dictNodes[strNodeId]["name"]
+        assert (dictData["x"], dictData["y"]) == (dictNodes[strNodeId]["x"], dictNodes[strNodeId]["y"])
+    assert set(strLinkId for _, _, strLinkId in graph.edges(keys=True)) == set(objectLink["link_id"] for objectLink in objectGNS3Project["topology"]["links"])
+    # Undirected edges may come back in either direction, the link_id tells which end is which
+    dictLinks = {objectLink["link_id"]: tuple(objectEnd["node_id"] for objectEnd in objectLink["nodes"]) for objectLink in objectGNS3Project["topology"]["links"]}
+    assert Counter(((dictNodes[dictLinks[strLinkId][0]]["name"], dictData["start_port"]), (dictNodes[dictLinks[strLinkId][1]]["name"], dictData["end_port"])) for _, _, strLinkId, dictData in graph.edges(keys=True, data=True)) == getLinks(objectGNS3Project)
+    assert all({strStart, strEnd} == set(dictLinks[strLinkId]) for strStart, strEnd, strLinkId in graph.edges(keys=True))
+
+def test_edgelist_round_trip(built):
+    tmp_path, objectGNS3Project = built
+    graph = networkx.read_edgelist(tmp_path / "lab.tsv", delimiter="\t", create_using=networkx.MultiGraph, data=(("start_port", int), ("end_port", int)))
+    assert set(graph.nodes) == {objectNode["name"] for objectNode in objectGNS3Project["topology"]["nodes"]}
+
+    # The file itself keeps the direction of every link
+    with open(tmp_path / "lab.tsv") as objectFile:
+        arrayLines = [strLine.rstrip("\n").split("\t") for strLine in objectFile if not strLine.startswith("#")]
+    assert Counter(((strStart, int(strStartPort)), (strEnd, int(strEndPort))) for strStart, strEnd, strStartPort, strEndPort in arrayLines) == getLinks(objectGNS3Project)
+    assert graph.number_of_edges() == len(arrayLines)
+
+def test_containerlab_round_trip(built):
+    tmp_path, objectGNS3Project = built
+    with open(tmp_path / "lab.clab.yml") as objectFile:
+        objectLab = yaml.safe_load(objectFile)
+    assert objectLab["name"] == "round-trip"
+
+    dictNames = {} # Holds per node of the lab the name of its GNS3 node
+    for strNode, dictNode in objectLab["topology"]["nodes"].items():
+        dictNames[strNode] = dictNode.get("labels", {}).get("gns3-name", strNode)
+        if (dictNode["kind"] == "bridge"):
+            assert re.fullmatch(r"[A-Za-z0-9_.-]{1,15}", strNode) # A Linux interface name on the containerlab host
+    dictNodes = getNodes(objectGNS3Project)
+    assert sorted(dictNames.values()) == sorted(objectNode["name"] for objectNode in dictNodes.values() if objectNode["node_type"] != "cloud")
+
+    arrayLinks = []
+    for objectLink in objectLab["topology"]["links"]:
+        arrayEnds = []
+        for strEndpoint in objectLink["endpoints"]:
+            strNode, strInterface = strEndpoint.split(":")
+            assert len(strInterface) <= 15
+            arrayEnds.append((dictNames[strNode], int(re.search(r"\d+$", strInterface).group()) - (1 if strInterface.startswith("eth") else 0)))
+        arrayLinks.append(tuple(arrayEnds))
+    assert len(set(strEndpoint for objectLink in objectLab["topology"]["links"] for strEndpoint in objectLink["endpoints"])) == 2 * len(arrayLinks) # Every interface is used once
+    assert Counter(arrayLinks) == Counter({tupleLink: intCount for tupleLink, intCount in getLinks(objectGNS3Project).items() if not any(strName.startswith("INTERNET-") for strName, _ in tupleLink)})
+
+def test_bridge_names():
+    assert nn_emitters.getBridgeName("swit_A-id1") == "swit_A-id1"
+    arrayNames = [nn_emitters.getBridgeName("distribution switches-id" + str(intId)) for intId in range(1, 13)] + [nn_emitters.getBridgeName("distribution_switches-id1")]
+    assert all(re.fullmatch(r"distri-[0-9a-f]{8}", strName) for strName in arrayNames)
+    assert len(set(arrayNames)) == len(arrayNames)
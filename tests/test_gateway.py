@@ -0,0 +1,75 @@
+import json
+import socket
+import time
+from types import SimpleNamespace
+
+import psutil
+import pytest
+
+import nn
+
+dict_INTERFACES = {
+    "lo": [SimpleNamespace(family=socket.AF_INET, address="127.0.0.1")],
+    "eth0": [SimpleNamespace(family=socket.AF_INET6, address="fe80::1"), SimpleNamespace(family=socket.AF_INET, address="192.168.1.10")],
+    "wlan0": [SimpleNamespace(family=socket.AF_INET, address="10.0.0.5")],
+}
+
+class FakeProbe:
+    # Answers like a ping through the given interfaces would, and remembers which interfaces it was asked about
+    def __init__(self, arrayOnline):
+        self.arrayOnline = arrayOnline
+        self.arrayCalls = []
+
+    def __call__(self, strInterface, strAddress, floatTimeout):
+        self.arrayCalls.append((strInterface, strAddress))
+        return strInterface in self.arrayOnline
+
+@pytest.fixture(autouse=True)
+def interfaces(monkeypatch):
+    monkeypatch.setattr(psutil, "net_if_addrs", lambda: dict_INTERFACES)
+
+def test_gateway_probes_ipv4_addresses(tmp_path):
+    objectProbe = FakeProbe(["wlan0"])
+    strCachePath = str(tmp_path / "gateway.json")
+    assert nn.getGatewayInterface(functionProbe=objectProbe, strCachePath=strCachePath) == "wlan0"
+    assert sorted(objectProbe.arrayCalls) == [("eth0", "192.168.1.10"), ("lo", "127.0.0.1"), ("wlan0", "10.0.0.5")]
+    with open(strCachePath) as stream:
+        assert json.load(stream)["interface"] == "wlan0"
+
+def test_gateway_prefers_first_interface_online(tmp_path):
+    objectProbe = FakeProbe(["eth0", "wlan0"])
+    assert nn.getGatewayInterface(functionProbe=objectProbe, strCachePath=str(tmp_path / "gateway.json")) == "eth0"
+
+def test_gateway_cache_hit_skips_probe(tmp_path):
+    strCachePath = str(tmp_path / "gateway.json")
+    nn.getGatewayInterface(functionProbe=FakeProbe(["eth0"]), strCachePath=strCachePath)
+
+    objectProbe = FakeProbe([])
+    assert nn.getGatewayInterface(functionProbe=objectProbe, strCachePath=strCachePath) == "eth0"
+    assert objectProbe.arrayCalls == []
+
+def test_gateway_cache_expires(tmp_path, monkeypatch):
+    strCachePath = str(tmp_path / "gateway.json")
+    nn.getGatewayInterface(functionProbe=FakeProbe(["eth0"]), strCachePath=strCachePath, intCacheTTL=60)
+
+    floatNow = time.time()
+    monkeypatch.setattr(time, "time", lambda: floatNow + 61)
+    objectProbe = FakeProbe(["wlan0"])
+    assert nn.getGatewayInterface(functionProbe=objectProbe, strCachePath=strCachePath, intCacheTTL=60) == "wlan0"
+    assert len(objectProbe.arrayCalls) == 3
+
+def test_gateway_cache_ignored_without_ttl_or_interface(tmp_path):
+    strCachePath = str(tmp_path / "gateway.json")
+    with open(strCachePath, "w") as stream:
+        json.dump({"interface": "eth0", "timestamp": time.time()}, stream)
+    assert nn.getGatewayInterface(functionProbe=FakeProbe(["wlan0"]), strCachePath=strCachePath, intCacheTTL=0) == "wlan0"
+
+    with open(strCachePath, "w") as stream:
+        json.dump({"interface": "tun0", "timestamp": time.time()}, stream) # An interface that's gone since
+    assert nn.getGatewayInterface(functionProbe=FakeProbe(["eth0"]), strCachePath=strCachePath) == "eth0"
+
+def test_gateway_without_internet_aborts(tmp_path):
+    strCachePath = tmp_path / "gateway.json"
+    with pytest.raises(nn.NetworkNarcoticError, match="doesn't seem to have access to the internet. Aborting."):
+        nn.getGatewayInterface(functionProbe=FakeProbe([]), strCachePath=str(strCachePath))
+    assert not strCachePath.exists()
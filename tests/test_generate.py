@@ -0,0 +1,51 @@
+import itertools
+from collections import Counter
+
+import pytest
+import yaml
+
+import nn
+import nn_generate
+import nn_schema
+
+@pytest.mark.parametrize("strClusterMode, strConnectionMode", list(itertools.product(nn_generate.array_CLUSTER_MODES + [nn_generate.str_MIXED], nn_generate.array_CONNECTION_MODES + [nn_generate.str_MIXED])))
+@pytest.mark.parametrize("intSwitches", [0, 3])
+@pytest.mark.parametrize("strShape", nn_generate.array_SHAPES)
+def test_generated_input_is_valid(strClusterMode, strConnectionMode, intSwitches, strShape):
+    objectInputFile = nn_generate.generateInputFile(5, 3, strClusterMode, strConnectionMode, 2, intSwitches, strShape, 1, 2)
+    assert nn_schema.validateInputFast(objectInputFile) is not nn_schema.object_INVALID
+    assert nn_schema.validateInput(objectInputFile) == nn_schema.getDesiredSchemaTotal().validate(objectInputFile)["input"]
+
+    objectPlan = nn.planTopology(objectInputFile)
+    assert objectPlan["routers"] + objectPlan["switches"] == nn_generate.countDevices(objectInputFile)
+    assert objectPlan["violations"] == []
+
+@pytest.mark.parametrize("intClusters", [1, 2, 3])
+def test_small_shapes(intClusters):
+    for strShape in nn_generate.array_SHAPES:
+        objectInputFile = nn_generate.generateInputFile(intClusters, strShape=strShape)
+        nn_schema.validateInput(objectInputFile)
+        intConnections = len(objectInputFile["input"].get("connections", []))
+        assert intConnections == (intClusters if strShape == "loop" and intClusters > 2 else intClusters - 1)
+
+def getLinkCounts(objectInputFile) -> Counter:
+    # Counts the links within clusters and those between them
+    objectGNS3Project = nn.buildTopology(objectInputFile, strGatewayInterface="eth0", strLayout="none")
+    dictNames = {objectNode["node_id"]: objectNode["name"].rsplit("-id", 1)[0] for objectNode in objectGNS3Project["topology"]["nodes"]}
+    return Counter("cluster" if len({dictNames[objectEnd["node_id"]] for objectEnd in objectLink["nodes"]}) == 1 else "connection" for objectLink in objectGNS3Project["topology"]["links"])
+
+@pytest.mark.parametrize("intSwitches", [0, 3])
+def test_cables_of_clusters_and_connections(intSwitches):
+    objectSingle = getLinkCounts(nn_generate.generateInputFile(4, 3, "line", "parallel", 1, intSwitches))
+    assert getLinkCounts(nn_generate.generateInputFile(4, 3, "line", "parallel", 1, intSwitches, intClusterCables=2)) == Counter({"cluster": objectSingle["cluster"] * 2, "connection": objectSingle["connection"]})
+    assert getLinkCounts(nn_generate.generateInputFile(4, 3, "line", "parallel", 2, intSwitches)) == Counter({"cluster": objectSingle["cluster"], "connection": objectSingle["connection"] * 2})
+
+def test_command_line(tmp_path, capsys):
+    nn_generate.main(["--clusters", "3", "--amount", "2", "--switches", "2", "--connection-cables", "3", "--cluster-cables", "2", "--shape", "line", "-o", str(tmp_path / "lab.yml")])
+    with open(tmp_path / "lab.yml") as objectFile:
+        assert yaml.safe_load(objectFile) == nn_generate.generateInputFile(3, 2, "full", "single", 3, 2, "line", 0, 2)
+    assert capsys.readouterr().out == "Generated " + str(tmp_path / "lab.yml") + " with 10 devices.\n"
+
+    # Cables are always either of connections or of clusters
+    with pytest.raises(SystemExit):
+        nn_generate.main(["--clusters", "3", "--cables", "2"])
@@ -0,0 +1,46 @@
+import warnings
+
+import pytest
+
+import nn_layout
+
+@pytest.mark.parametrize("strLayout", list(nn_layout.dict_LAYOUT_ENGINES))
+def test_layout_without_nodes(strLayout):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error") # Empty NumPy reductions only warn
+        assert nn_layout.computeLayout(strLayout, [], []) == {}
+
+def getExactRepulsion(np, arrayPositions, floatK2):
+    arrayDelta = arrayPositions[:, None, :] - arrayPositions[None, :, :]
+    arrayDistance2 = np.maximum((arrayDelta ** 2).sum(axis=2), 1e-12)
+    np.fill_diagonal(arrayDistance2, np.inf)
+    return (arrayDelta * (floatK2 / arrayDistance2)[:, :, None]).sum(axis=1)
+
+@pytest.mark.parametrize("intDirectLimit", [0, 1])
+def test_repulsion_quadtree_matches_exact(monkeypatch, intDirectLimit):
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(nn_layout, "int_DIRECT_LIMIT", intDirectLimit)
+    arrayPositions = np.random.default_rng(7).random((300, 2)) * 10
+    arrayExact = getExactRepulsion(np, arrayPositions, 2.0)
+
+    arrayQuadtree = nn_layout.getRepulsion(np, arrayPositions, 2.0)
+    assert np.linalg.norm(arrayQuadtree - arrayExact) / np.linalg.norm(arrayExact) < 0.02
+    arrayTargets = np.arange(0, 300, 7)
+    assert np.array_equal(nn_layout.getRepulsion(np, arrayPositions, 2.0, arrayTargets)[arrayTargets], arrayQuadtree[arrayTargets])
+
+def test_repulsion_coincident_points(monkeypatch):
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(nn_layout, "int_DIRECT_LIMIT", 0)
+    monkeypatch.setattr(nn_layout, "int_NEAR_FIELD_PAIRS", 1000) # Forces the near field into several chunks
+    arrayPositions = np.concatenate([np.full((400, 2), 3.0), np.random.default_rng(7).random((100, 2)) * 10])
+
+    # However many nodes share a cell, the quadtree stops at about 16 cells per node
+    arrayUnit = (arrayPositions - arrayPositions.min(axis=0)) / 10
+    assert 4 ** nn_layout.getQuadtreeDepth(np, arrayUnit) <= 16 * len(arrayPositions)
+    assert nn_layout.getQuadtreeDepth(np, np.zeros((5000, 2))) <= 8
+
+    arrayQuadtree = nn_layout.getRepulsion(np, arrayPositions, 2.0)
+    arrayExact = getExactRepulsion(np, arrayPositions, 2.0)
+    assert np.isfinite(arrayQuadtree).all()
+    assert np.allclose(arrayQuadtree[:400], arrayQuadtree[0]) # Coincident nodes don't push each other
+    assert np.linalg.norm(arrayQuadtree - arrayExact) / np.linalg.norm(arrayExact) < 0.02
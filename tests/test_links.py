@@ -0,0 +1,126 @@
+import json
+import os
+
+import pytest
+import yaml
+
+import nn
+import nn_links
+
+str_EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "example_input_file.yml")
+
+# The links the original script built for the README example, as (name, adapter, port) pairs in link order
+array_EXAMPLE_LINKS = [
+    [("swit_A-id1", 0, 0), ("swit_A-id2", 0, 0)],
+    [("swit_A-id1", 0, 1), ("swit_A-id3", 0, 0)],
+    [("swit_A-id1", 0, 2), ("swit_A-id4", 0, 0)],
+    [("INTERNET-rout_A", 0, 0), ("rout_A-id1", 1, 0)],
+    [("rout_B-id1", 1, 0), ("rout_B-id2", 1, 0)],
+    [("rout_C-id1", 1, 0), ("rout_C-id2", 1, 0)],
+    [("rout_C-id2", 1, 1), ("rout_C-id3", 1, 0)],
+    [("rout_C-id3", 1, 1), ("rout_C-id4", 1, 0)],
+    [("rout_A-id1", 1, 1), ("rout_B-id1", 1, 1)],
+    [("rout_A-id1", 1, 2), ("rout_B-id1", 1, 2)],
+    [("rout_A-id1", 1, 3), ("rout_B-id2", 1, 1)],
+    [("rout_A-id1", 1, 4), ("rout_B-id2", 1, 2)],
+    [("rout_B-id1", 1, 3), ("rout_C-id2", 1, 2)],
+    [("rout_B-id2", 1, 3), ("rout_C-id3", 1, 2)],
+    [("rout_B-id1", 1, 4), ("swit_A-id1", 0, 3)],
+    [("rout_D-id1", 1, 0), ("swit_A-id1", 0, 4)],
+]
+
+def getLinks(objectGNS3Project) -> list:
+    objectProject = json.loads(json.dumps(objectGNS3Project))
+    dictNames = {objectNode["node_id"]: objectNode["name"] for objectNode in objectProject["topology"]["nodes"]}
+    return [[(dictNames[objectEnd["node_id"]], objectEnd["adapter_number"], objectEnd["port_number"]) for objectEnd in objectLink["nodes"]] for objectLink in objectProject["topology"]["links"]]
+
+def test_example_links_match_original():
+    with open(str_EXAMPLE) as objectFile:
+        objectInputFile = yaml.safe_load(objectFile)
+    objectGNS3Project = nn.buildTopology(objectInputFile, strGatewayInterface="eth0", strLayout="none")
+    assert getLinks(objectGNS3Project) == array_EXAMPLE_LINKS
+
+def test_unique_drops_only_reversed_links(monkeypatch):
+    arrayBlocks = [("zip", [0, 1, 0, 2], [1, 0, 1, 2]), ("zip", [2, 3], [2, 0])]
+    arrayExpected = [(0, 1), (0, 1), (2, 2), (3, 0)]
+    assert list(nn_links.expandBlocks(arrayBlocks, booleanUnique=True)) == arrayExpected
+
+    # Large blocks are expanded with NumPy, which has to keep the exact same links
+    monkeypatch.setattr(nn_links, "int_VECTORIZE_THRESHOLD", 0)
+    arrayStarts, arrayEnds = nn_links.expandBlocks(arrayBlocks, booleanUnique=True)
+    assert list(zip(arrayStarts.tolist(), arrayEnds.tolist())) == arrayExpected
+
+def test_unique_keeps_cables_of_repeated_links():
+    arrayLinks = list(nn_links.expandBlocks([("zip", [0, 0], [1, 1])], booleanUnique=True, intCables=2))
+    assert arrayLinks == [(0, 1)] * 4
+
+def getConnectionLinks(objectGNS3Project) -> list:
+    # The links between devices of different clusters, as pairs of names
+    return [(tupleStart[0], tupleEnd[0]) for tupleStart, tupleEnd in getLinks(objectGNS3Project) if tupleStart[0].split("-id")[0] != tupleEnd[0].split("-id")[0]]
+
+def test_parallel_connection_of_three_clusters_needs_switches():
+    objectInputFile = {"input": {
+        "connections": [{"tag": "conn", "connectionmode": "parallel"}],
+        "routers": [{"tag": strTag, "amount": 2, "connectedto": ["conn"]} for strTag in ("A", "B", "C")]
+    }}
+    with pytest.raises(nn.NetworkNarcoticError) as objectError:
+        nn.buildTopology(objectInputFile, strGatewayInterface="eth0", strLayout="none")
+    assert str(objectError.value) == "Hooking more than two router clusters to a connection (conn) requires a switch cluster. Aborting."
+
+def test_parallel_connection_of_three_clusters_through_switches():
+    objectInputFile = {"input": {
+        "connections": [{"tag": "conn", "connectionmode": "parallel", "switches": {"tag": "S", "amount": 3, "clustermode": "line"}}],
+        "routers": [
+            {"tag": "A", "amount": 2, "clustermode": "line", "connectedto": ["conn"]},
+            {"tag": "B", "amount": 3, "clustermode": "line", "connectionshift": 1, "connectedto": ["conn"]},
+            {"tag": "C", "amount": 1, "connectedto": ["conn"]}
+        ]
+    }}
+    # Every cluster is cabled in parallel to the switch cluster, in input order, after B is shifted by one
+    assert getConnectionLinks(nn.buildTopology(objectInputFile, strGatewayInterface="eth0", strLayout="none")) == [
+        ("A-id1", "S-id1"), ("A-id2", "S-id2"),
+        ("B-id2", "S-id1"), ("B-id3", "S-id2"), ("B-id1", "S-id3"),
+        ("C-id1", "S-id1")
+    ]
+
+def getRouterPoints() -> list:
+    # Three router clusters, the second of which is in the input file twice and shifted for both of its entries
+    arrayPoints = [("A", [0, 1, 2])]
+    arrayPoints += [("B", arrayShifted) for arrayShifted in nn_links.getShiftedPoints([3, 4, 5, 6], [{"connectionshift": 1}, {"connectionshift": 2}], True)]
+    arrayPoints += [("C", [7, 8])]
+    return arrayPoints
+
+def expandBothWays(monkeypatch, functionDefine) -> tuple:
+    monkeypatch.setattr(nn_links, "int_VECTORIZE_THRESHOLD", 1 << 62)
+    links = functionDefine()
+    assert not isinstance(links, tuple)
+    arrayPython = list(links)
+
+    monkeypatch.setattr(nn_links, "int_VECTORIZE_THRESHOLD", 0)
+    links = functionDefine()
+    assert isinstance(links, tuple)
+    return arrayPython, list(zip(links[0].tolist(), links[1].tolist()))
+
+@pytest.mark.parametrize("strConnectionMode", ["single", "full", "parallel"])
+@pytest.mark.parametrize("booleanSwitches", [False, True], ids=["routers", "switches"])
+@pytest.mark.parametrize("intCables", [1, 2])
+def test_connection_links_python_and_numpy_agree(monkeypatch, strConnectionMode, booleanSwitches, intCables):
+    arraySwitchPoints = nn_links.getShiftedPoints([9, 10, 11], [{"connectionshift": 1}, {"connectionshift": 1}], True) if booleanSwitches else []
+    arrayPython, arrayNumPy = expandBothWays(monkeypatch, lambda: nn_links.defineConnectionLinks(strConnectionMode, getRouterPoints(), arraySwitchPoints, ["A", "B", "C"], intCables))
+    assert len(arrayPython) > 0
+    assert arrayPython == arrayNumPy
+
+@pytest.mark.parametrize("strClusterMode", ["full", "loop", "line", "hubspoke"])
+@pytest.mark.parametrize("intCables", [1, 3])
+def test_cluster_links_python_and_numpy_agree(monkeypatch, strClusterMode, intCables):
+    arrayPython, arrayNumPy = expandBothWays(monkeypatch, lambda: nn_links.defineClusterLinks(list(range(2, 9)), strClusterMode, intCables))
+    assert len(arrayPython) > 0
+    assert arrayPython == arrayNumPy
+
+def test_built_links_python_and_numpy_agree(monkeypatch):
+    with open(str_EXAMPLE) as objectFile:
+        objectInputFile = yaml.safe_load(objectFile)
+    objectPython = nn.buildTopology(objectInputFile, strGatewayInterface="eth0", strLayout="none", strSeed="links")
+    monkeypatch.setattr(nn_links, "int_VECTORIZE_THRESHOLD", 0)
+    objectNumPy = nn.buildTopology(objectInputFile, strGatewayInterface="eth0", strLayout="none", strSeed="links")
+    assert json.dumps(objectPython) == json.dumps(objectNumPy)
@@ -0,0 +1,70 @@
+import os
+from collections import Counter
+
+import pytest
+import yaml
+
+import nn
+
+str_EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "example_input_file.yml")
+
+def loadExample() -> dict:
+    with open(str_EXAMPLE) as objectFile:
+        return yaml.safe_load(objectFile)
+
+def getMesh(intAmount, intCables=0) -> dict:
+    # A full mesh of routers, optionally with every one of them connected to one more router by this many cables
+    if (intCables == 0):
+        return {"input": {"routers": [{"tag": "mesh", "amount": intAmount}]}}
+    return {"input": {
+        "connections": [{"tag": "uplink", "connectionmode": "full", "cables": intCables}],
+        "routers": [{"tag": "mesh", "amount": intAmount, "connectedto": ["uplink"]}, {"tag": "core", "connectedto": ["uplink"]}]
+    }}
+
+def getBuiltPorts(objectInputFile) -> dict:
+    objectGNS3Project = nn.buildTopology(objectInputFile, strGatewayInterface="eth0", strLayout="none", strSeed="plan")
+    dictNames = {objectNode["node_id"]: objectNode["name"] for objectNode in objectGNS3Project["topology"]["nodes"]}
+    objectPorts = Counter({strName: 0 for strName in dictNames.values()})
+    for objectLink in objectGNS3Project["topology"]["links"]:
+        for objectEnd in objectLink["nodes"]:
+            objectPorts[dictNames[objectEnd["node_id"]]] += 1
+    return dict(objectPorts)
+
+@pytest.mark.parametrize("objectInputFile", [loadExample(), getMesh(4), getMesh(17), getMesh(15, 1)], ids=["example", "mesh4", "mesh17", "mesh15-uplink"])
+def test_plan_matches_built_ports(objectInputFile):
+    objectPlan = nn.planTopology(objectInputFile)
+    dictBuilt = getBuiltPorts(objectInputFile)
+    assert {objectDevice["name"]: objectDevice["ports"] for objectDevice in objectPlan["devices"]} == dictBuilt
+    assert objectPlan["nodes"] == len(dictBuilt)
+    assert objectPlan["links"] * 2 == sum(dictBuilt.values())
+    for objectCluster in objectPlan["clusters"]:
+        arrayPorts = [intPorts for strName, intPorts in dictBuilt.items() if strName.startswith(objectCluster["tag"] + "-id")]
+        assert (objectCluster["devices"], objectCluster["min_ports"], objectCluster["max_ports"]) == (len(arrayPorts), min(arrayPorts), max(arrayPorts))
+    assert objectPlan["violations"] == []
+
+@pytest.mark.parametrize("objectInputFile, intViolations, setPorts", [(getMesh(18), 18, {17}), (getMesh(16, 2), 17, {17, 32})], ids=["mesh18", "mesh16-uplink"])
+def test_seventeenth_port_is_rejected(objectInputFile, intViolations, setPorts):
+    objectPlan = nn.planTopology(objectInputFile)
+    assert len(objectPlan["violations"]) == intViolations
+    assert {objectDevice["ports"] for objectDevice in objectPlan["violations"]} == setPorts
+
+    strMessage = nn.formatPortViolations(objectPlan["violations"])
+    assert strMessage.startswith(str(intViolations) + " of your devices exceed the 16-port limit.")
+    assert "\n    mesh-id1 (router) needs 17 ports" in strMessage
+
+    # A build stops with the same message, and so does --plan, with exit code 1
+    with pytest.raises(nn.NetworkNarcoticError) as objectError:
+        nn.buildTopology(objectInputFile, strGatewayInterface="eth0", strLayout="none")
+    assert str(objectError.value) == strMessage
+
+def test_plan_command_exit_code(tmp_path, capsys):
+    for intAmount, intCode in ((17, None), (18, 1)):
+        (tmp_path / "mesh.yml").write_text(yaml.safe_dump(getMesh(intAmount)))
+        if (intCode == None):
+            nn.main(["-i", str(tmp_path / "mesh.yml"), "--plan"])
+            assert "Every device fits in the 16-port limit." in capsys.readouterr().out
+            continue
+        with pytest.raises(SystemExit) as objectExit:
+            nn.main(["-i", str(tmp_path / "mesh.yml"), "--plan"])
+        assert objectExit.value.code == intCode
+        assert nn.formatPortViolations(nn.planTopology(getMesh(intAmount))["violations"]) in capsys.readouterr().out
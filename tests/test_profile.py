@@ -0,0 +1,30 @@
+import os
+
+import yaml
+
+import nn
+from nn_profile import Profile
+
+str_EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "example_input_file.yml")
+
+def loadExample() -> dict:
+    with open(str_EXAMPLE) as objectFile:
+        return yaml.safe_load(objectFile)
+
+def test_profile_counts_the_built_topology():
+    objectProfile = Profile()
+    objectProfile.start()
+    objectGNS3Project = nn.buildTopology(loadExample(), strGatewayInterface="eth0", strLayout="none", strSeed="profile", dictTimings=objectProfile)
+    objectProfile.stop()
+
+    dictReport = objectProfile.getReport()
+    assert dictReport["counters"]["nodes"] == len(objectGNS3Project["topology"]["nodes"])
+    assert dictReport["counters"]["links"] == len(objectGNS3Project["topology"]["links"])
+    assert 0 < dictReport["counters"]["desired links"] <= dictReport["counters"]["links"] # Links within clusters and to gateways come on top
+    assert all(dictStage["peak_bytes"] != None for dictStage in dictReport["stages"]) # Every timed stage also recorded its memory
+
+def test_plain_timings_are_not_profiled():
+    dictTimings = {}
+    nn.buildTopology(loadExample(), strGatewayInterface="eth0", strLayout="none", strSeed="profile", dictTimings=dictTimings)
+    assert Profile.getProfile(dictTimings) == None
+    assert {"validate", "links", "layout"} <= set(dictTimings)
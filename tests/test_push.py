@@ -0,0 +1,137 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import yaml
+
+import nn
+import nn_push
+
+str_EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "example_input_file.yml")
+
+class MockGNS3Handler(BaseHTTPRequestHandler):
+    # A GNS3 2.x server that keeps projects in memory, and can be told to answer some requests with an error first
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *arrayArguments):
+        pass
+
+    def answer(self, intStatus, objectBody=None):
+        bytesBody = json.dumps(objectBody).encode() if objectBody != None else b""
+        self.send_response(intStatus)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(bytesBody)))
+        self.end_headers()
+        self.wfile.write(bytesBody)
+
+    def do_GET(self):
+        if (self.path == "/v2/version"):
+            return self.answer(200, {"version": "2.2.44", "local": True})
+        self.answer(404, {"message": "Not found"})
+
+    def do_DELETE(self):
+        with self.server.lock:
+            self.server.arrayRequests.append(("DELETE", self.path))
+            self.server.dictProjects.pop(self.path.split("/")[3], None)
+        self.answer(204)
+
+    def do_POST(self):
+        objectBody = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        arrayParts = self.path.split("/")
+        strKind = arrayParts[4] if len(arrayParts) > 4 else "projects"
+        with self.server.lock:
+            self.server.arrayRequests.append(("POST", self.path))
+            arrayStatuses = self.server.dictStatuses.get(strKind)
+            intStatus = arrayStatuses.pop(0) if arrayStatuses else None
+            if (intStatus != None and not self.server.booleanLostAnswers):
+                return self.answer(intStatus, {"message": "Injected failure"})
+
+            if (strKind == "projects"):
+                if (objectBody["project_id"] in self.server.dictProjects):
+                    return self.answer(409, {"message": "Project ID " + objectBody["project_id"] + " already used"})
+                self.server.dictProjects[objectBody["project_id"]] = {"nodes": {}, "links": {}}
+            else:
+                dictProject = self.server.dictProjects.get(arrayParts[3])
+                if (dictProject == None):
+                    return self.answer(404, {"message": "Project not found"})
+                strId = objectBody["node_id" if strKind == "nodes" else "link_id"]
+                if (strId in dictProject[strKind]):
+                    return self.answer(409, {"message": "Already exists"})
+                if (strKind == "links" and any(objectEnd["node_id"] not in dictProject["nodes"] for objectEnd in objectBody["nodes"])):
+                    return self.answer(404, {"message": "Node not found"})
+                dictProject[strKind][strId] = objectBody
+
+            # The item was created, but the answer can still be lost on its way back
+            self.answer(intStatus if intStatus != None else 201, objectBody)
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(nn_push, "float_PUSH_BACKOFF", 0.0)
+    objectServer = ThreadingHTTPServer(("127.0.0.1", 0), MockGNS3Handler)
+    objectServer.daemon_threads = True
+    objectServer.lock = threading.Lock()
+    objectServer.dictProjects = {}
+    objectServer.dictStatuses = {}
+    objectServer.booleanLostAnswers = False
+    objectServer.arrayRequests = []
+    threading.Thread(target=objectServer.serve_forever, args=(0.01,), daemon=True).start()
+    objectServer.strAddress = "http://127.0.0.1:" + str(objectServer.server_address[1])
+    yield objectServer
+    objectServer.shutdown()
+    objectServer.server_close()
+
+@pytest.fixture
+def project():
+    with open(str_EXAMPLE) as objectFile:
+        objectInputFile = yaml.safe_load(objectFile)
+    return nn.buildTopology(objectInputFile, strGatewayInterface="eth0", strLayout="none", strSeed="push")
+
+def assertPushed(server, project):
+    dictProject = server.dictProjects[project["project_id"]]
+    assert set(dictProject["nodes"]) == {objectNode["node_id"] for objectNode in project["topology"]["nodes"]}
+    assert set(dictProject["links"]) == {objectLink["link_id"] for objectLink in project["topology"]["links"]}
+
+def test_push_creates_every_node_and_link(server, project):
+    arrayProgress = []
+    strProjectId = nn_push.pushProject(project, server.strAddress, functionProgress=lambda *tupleProgress: arrayProgress.append(tupleProgress))
+    assert strProjectId == project["project_id"]
+    assertPushed(server, project)
+    intNodes, intLinks = len(project["topology"]["nodes"]), len(project["topology"]["links"])
+    assert len(arrayProgress) == intNodes + intLinks
+    assert arrayProgress[-1] == (intNodes, intNodes, intLinks, intLinks)
+
+def test_push_refuses_existing_project(server, project):
+    server.dictProjects[project["project_id"]] = {"nodes": {}, "links": {}}
+    with pytest.raises(nn_push.PushError, match="status 409"):
+        nn_push.pushProject(project, server.strAddress)
+    assert project["project_id"] in server.dictProjects # Somebody else's project is left alone
+    assert ("DELETE", "/v2/projects/" + project["project_id"]) not in server.arrayRequests
+
+@pytest.mark.parametrize("strKind", ["nodes", "links"])
+def test_push_removes_project_when_item_fails(server, project, strKind):
+    server.dictStatuses[strKind] = [400]
+    with pytest.raises(nn_push.PushError, match="status 400: Injected failure"):
+        nn_push.pushProject(project, server.strAddress)
+    assert project["project_id"] not in server.dictProjects
+    assert ("DELETE", "/v2/projects/" + project["project_id"]) in server.arrayRequests
+
+@pytest.mark.parametrize("intStatus", [429, 502, 503, 504])
+def test_push_retries_busy_server(server, project, intStatus):
+    server.dictStatuses = {"projects": [intStatus], "nodes": [intStatus] * nn_push.int_PUSH_RETRIES, "links": [intStatus, intStatus]}
+    nn_push.pushProject(project, server.strAddress)
+    assertPushed(server, project)
+
+def test_push_gives_up_after_retries(server, project):
+    server.dictStatuses["nodes"] = [503] * (nn_push.int_PUSH_RETRIES + 1)
+    with pytest.raises(nn_push.PushError, match="failed " + str(nn_push.int_PUSH_RETRIES + 1) + " times, the last time with status 503"):
+        nn_push.pushProject(project, server.strAddress, intConcurrency=1)
+    assert project["project_id"] not in server.dictProjects
+
+def test_push_counts_conflict_on_retry_as_created(server, project):
+    # The first attempt creates the item but its answer is lost, so the retry finds it already exists
+    server.booleanLostAnswers = True
+    server.dictStatuses = {"projects": [504], "nodes": [502], "links": [503]}
+    nn_push.pushProject(project, server.strAddress)
+    assertPushed(server, project)
@@ -0,0 +1,84 @@
+import os
+
+import pytest
+import yaml
+
+import nn_schema
+from schema import SchemaError
+
+str_EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "example_input_file.yml")
+
+def getRouters(*arrayRouters, arrayConnections=None) -> dict:
+    objectInput = {"routers": list(arrayRouters)}
+    if (arrayConnections != None):
+        objectInput["connections"] = arrayConnections
+    return {"input": objectInput}
+
+array_INVALID_INPUTS = [
+    # Wrong types
+    ("not a dict", []),
+    ("routers not a list", {"input": {"routers": {"tag": "a"}}}),
+    ("tag not a string", getRouters({"tag": 1})),
+    ("amount a string", getRouters({"tag": "a", "amount": "2"})),
+    ("amount a boolean", getRouters({"tag": "a", "amount": True})),
+    ("cables a float", getRouters({"tag": "a", "cables": 1.0})),
+    ("gateway a string", getRouters({"tag": "a", "gateway": "yes"})),
+    ("shiftable an integer", getRouters({"tag": "a"}, arrayConnections=[{"tag": "c", "shiftable": 1}])),
+    ("connectedto a string", getRouters({"tag": "a", "connectedto": "c"})),
+    ("connectedto an integer", getRouters({"tag": "a", "connectedto": [1]})),
+    ("switches a list", getRouters({"tag": "a"}, arrayConnections=[{"tag": "c", "switches": [{"tag": "s"}]}])),
+    # Out of range
+    ("amount 0", getRouters({"tag": "a", "amount": 0})),
+    ("amount 256", getRouters({"tag": "a", "amount": 256})),
+    ("cables 4", getRouters({"tag": "a", "cables": 4})),
+    ("connectionshift 0", getRouters({"tag": "a", "connectionshift": 0})),
+    ("ipsummary /33", getRouters({"tag": "a", "ipsummary": "10.0.0.0/33"})),
+    # Missing keys
+    ("no input", {}),
+    ("no routers", {"input": {"connections": [{"tag": "c"}]}}),
+    ("router without tag", getRouters({"amount": 2})),
+    ("connection without tag", getRouters({"tag": "a"}, arrayConnections=[{"connectionmode": "full"}])),
+    ("switches without tag", getRouters({"tag": "a"}, arrayConnections=[{"tag": "c", "switches": {"amount": 2}}])),
+    # Unknown modes and keys
+    ("unknown clustermode", getRouters({"tag": "a", "clustermode": "star"})),
+    ("unknown connectionmode", getRouters({"tag": "a"}, arrayConnections=[{"tag": "c", "connectionmode": "ring"}])),
+    ("unknown switch clustermode", getRouters({"tag": "a"}, arrayConnections=[{"tag": "c", "switches": {"tag": "s", "clustermode": "star"}}])),
+    ("unknown routing", getRouters({"tag": "a", "routing": "ospf"})),
+    ("unknown ipclass", getRouters({"tag": "a", "ipclass": "D"})),
+    ("unknown router key", getRouters({"tag": "a", "colour": "red"})),
+    ("unknown input key", {"input": {"routers": [{"tag": "a"}], "switches": []}}),
+    # Duplicate tags
+    ("duplicate router tags", getRouters({"tag": "a"}, {"tag": "b"}, {"tag": "a", "amount": 2})),
+    ("duplicate connection tags", getRouters({"tag": "a", "connectedto": ["c"]}, arrayConnections=[{"tag": "c"}, {"tag": "c", "connectionmode": "full"}]))
+]
+
+@pytest.mark.parametrize("objectInputFile", [objectInputFile for _, objectInputFile in array_INVALID_INPUTS], ids=[strName for strName, _ in array_INVALID_INPUTS])
+def test_both_validators_reject(objectInputFile):
+    assert nn_schema.validateInputFast(objectInputFile) is nn_schema.object_INVALID
+    with pytest.raises(SchemaError) as objectSchemaError:
+        nn_schema.getDesiredSchemaTotal().validate(objectInputFile)
+    with pytest.raises(nn_schema.InvalidInputError) as objectInputError:
+        nn_schema.validateInput(objectInputFile)
+    assert str(objectInputError.value) == str(objectSchemaError.value)
+
+def test_duplicate_tag_messages():
+    for strName, strMessage in (("duplicate router tags", "Tag 'a' is used by more than one router cluster."), ("duplicate connection tags", "Tag 'c' is used by more than one connection.")):
+        with pytest.raises(nn_schema.InvalidInputError) as objectError:
+            nn_schema.validateInput(dict(array_INVALID_INPUTS)[strName])
+        assert str(objectError.value).endswith("\n" + strMessage)
+
+def loadExample() -> dict:
+    with open(str_EXAMPLE) as objectFile:
+        return yaml.safe_load(objectFile)
+
+array_VALID_INPUTS = [
+    loadExample(),
+    getRouters({"tag": "a"}),
+    getRouters({"tag": "a", "amount": 255, "cables": 3, "ipclass": "C", "ipsummary": "10.0.0.0/8", "clustermode": "hubspoke", "connectionshift": 255, "gateway": True}),
+    getRouters({"tag": "a", "connectedto": [{"tag": "c", "switches": {"tag": "s"}}]}, {"tag": "b", "connectedto": ["c"]}),
+    getRouters({"tag": "a", "connectedto": ["c", "d"]}, arrayConnections=[{"tag": "c", "switches": {"tag": "s"}}, {"tag": "d", "shiftable": False, "switches": {"tag": "s"}}]) # Switch clusters share their tag
+]
+
+@pytest.mark.parametrize("objectInputFile", array_VALID_INPUTS)
+def test_both_validators_normalize_the_same(objectInputFile):
+    assert nn_schema.validateInputFast(objectInputFile) == nn_schema.getDesiredSchemaTotal().validate(objectInputFile)["input"]
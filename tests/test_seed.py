@@ -0,0 +1,32 @@
+import os
+import re
+
+import pytest
+
+import nn
+
+str_EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "example_input_file.yml")
+str_UUID = r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+
+def buildExample(strOutput, strSeed, *arrayOptions) -> bytes:
+    nn.main(["-i", str_EXAMPLE, "-o", strOutput, "--gateway-interface", "eth0", "--seed", strSeed, *arrayOptions])
+    with open(strOutput, "rb") as objectFile:
+        return objectFile.read()
+
+@pytest.mark.parametrize("arrayOptions", [[], ["--archive", "--configs"]], ids=["gns3", "archive"])
+def test_same_seed_gives_same_bytes(tmp_path, arrayOptions):
+    strSuffix = ".gns3project" if arrayOptions else ".gns3"
+    bytesFirst = buildExample(str(tmp_path / ("first" + strSuffix)), "lab", *arrayOptions)
+    bytesSecond = buildExample(str(tmp_path / ("second" + strSuffix)), "lab", *arrayOptions)
+    assert bytesFirst == bytesSecond
+
+def test_other_seed_gives_other_identifiers(tmp_path):
+    strFirst = buildExample(str(tmp_path / "first.gns3"), "lab").decode()
+    strSecond = buildExample(str(tmp_path / "second.gns3"), "other lab").decode()
+    setFirst = set(re.findall(str_UUID, strFirst))
+    setSecond = set(re.findall(str_UUID, strSecond))
+    assert len(setFirst) > 13 and len(setSecond) == len(setFirst)
+    assert setFirst.isdisjoint(setSecond)
+
+    # Only the identifiers differ
+    assert re.sub(str_UUID, "", strFirst) == re.sub(str_UUID, "", strSecond)
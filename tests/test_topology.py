@@ -0,0 +1,50 @@
+import json
+import os
+
+import pytest
+import yaml
+
+import nn
+
+str_EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "example_input_file.yml")
+
+def loadExample() -> dict:
+    with open(str_EXAMPLE) as objectFile:
+        return yaml.safe_load(objectFile)
+
+def test_built_project_is_plain_json():
+    objectGNS3Project = nn.buildTopology(loadExample(), strGatewayInterface="eth0", strLayout="none", strSeed="topology")
+    assert type(objectGNS3Project["topology"]["nodes"]) is list
+    assert type(objectGNS3Project["topology"]["links"]) is list
+    objectParsed = json.loads(json.dumps(objectGNS3Project))
+    assert len(objectParsed["topology"]["nodes"]) == 13
+    assert len(objectParsed["topology"]["links"]) == 16
+
+def test_built_project_matches_written_project(tmp_path):
+    nn.writeProject(nn.buildProject(loadExample(), strGatewayInterface="eth0", strLayout="none", strSeed="topology")[0], str(tmp_path / "lab.gns3"))
+    objectGNS3Project = nn.buildTopology(loadExample(), strGatewayInterface="eth0", strLayout="none", strSeed="topology")
+    assert (tmp_path / "lab.gns3").read_text() == json.dumps(objectGNS3Project, indent=4)
+
+def test_duplicate_connectedto_aborts(tmp_path):
+    objectInputFile = {"input": {
+        "connections": [{"tag": "conn_A"}, {"tag": "conn_B"}],
+        "routers": [{"tag": "rout_A", "connectedto": ["conn_A", "conn_B", "conn_A"]}, {"tag": "rout_B", "connectedto": ["conn_A", "conn_B"]}]
+    }}
+    with pytest.raises(nn.NetworkNarcoticError) as objectError:
+        nn.buildTopology(objectInputFile, strGatewayInterface="eth0", strLayout="none")
+    assert str(objectError.value) == "Router cluster with tag rout_A is referring to the same connection more than once. Aborting."
+
+    # --plan aborts the same way, and a build from the command line writes nothing
+    with pytest.raises(nn.NetworkNarcoticError):
+        nn.planTopology(objectInputFile)
+    (tmp_path / "lab.yml").write_text(yaml.safe_dump(objectInputFile))
+    with pytest.raises(SystemExit):
+        nn.main(["-i", str(tmp_path / "lab.yml"), "-o", str(tmp_path / "lab.gns3"), "--gateway-interface", "eth0"])
+    assert sorted(os.listdir(tmp_path)) == ["lab.yml"]
+
+def test_same_connection_in_several_clusters():
+    objectInputFile = {"input": {
+        "connections": [{"tag": "conn_A"}],
+        "routers": [{"tag": "rout_A", "connectedto": ["conn_A"]}, {"tag": "rout_B", "connectedto": ["conn_A"]}]
+    }}
+    assert len(nn.buildTopology(objectInputFile, strGatewayInterface="eth0", strLayout="none")["topology"]["links"]) == 1
@@ -0,0 +1,82 @@
+import io
+import json
+import os
+
+import pytest
+import yaml
+
+import nn
+
+str_EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "example_input_file.yml")
+
+def loadExample() -> dict:
+    with open(str_EXAMPLE) as objectFile:
+        return yaml.safe_load(objectFile)
+
+def getStreamed(value, intIndent) -> str:
+    stream = io.StringIO()
+    nn.streamJSON(stream, value, intIndent)
+    return stream.getvalue()
+
+array_VALUES = [
+    {},
+    [],
+    "plain",
+    {"a": {"b": {"c": {"d": [1, {"e": []}, {}]}}}, "f": [[[[1, 2], []]]]},
+    {"empty": {}, "list": [], "nested": {"empty": {}, "list": [[], {}]}},
+    {"text": "line\nbreak \"quoted\" tab\t unicode é ✓  ", "none": None, "true": True, "false": False},
+    {"floats": [0.1, -2.5e-08, 1e+300, 3.0], "ints": [0, -1, 2 ** 70], "tuple": (1, "two", (3,))},
+    {1: "int key", "2": {3: [4]}},
+    [{"name": "é"}, [None, [{"deep": {"deeper": {"deepest": ["x\ny"]}}}]]]
+]
+
+@pytest.mark.parametrize("value", array_VALUES)
+def test_stream_matches_dumps(value):
+    assert getStreamed(value, 4) == json.dumps(value, indent=4)
+    assert getStreamed(value, 0) == json.dumps(value, separators=(",", ":"))
+
+def test_streamed_project_matches_dumps(tmp_path):
+    objectGNS3Project = nn.buildTopology(loadExample(), strGatewayInterface="eth0", strLayout="none", strSeed="write")
+    objectLazyProject = nn.buildProject(loadExample(), strGatewayInterface="eth0", strLayout="none", strSeed="write")[0]
+    assert getStreamed(objectLazyProject, 4) == json.dumps(objectGNS3Project, indent=4)
+
+    nn.writeProject(nn.buildProject(loadExample(), strGatewayInterface="eth0", strLayout="none", strSeed="write")[0], str(tmp_path / "lab.gns3"), booleanCompact=True)
+    assert (tmp_path / "lab.gns3").read_text(encoding="utf-8") == json.dumps(objectGNS3Project, separators=(",", ":"))
+
+def getProject(arrayNodes) -> dict:
+    return {"name": "lab", "topology": {"nodes": arrayNodes, "links": []}}
+
+@pytest.mark.parametrize("booleanArchive", [False, True], ids=["gns3", "archive"])
+def test_failed_write_leaves_nothing_behind(tmp_path, booleanArchive):
+    strOutput = str(tmp_path / ("lab.gns3project" if booleanArchive else "lab.gns3"))
+
+    # Halfway through the nodes, a node can't be serialized
+    with pytest.raises(TypeError):
+        nn.writeProject(getProject([{"name": "R1"}, object()]), strOutput, booleanArchive=booleanArchive)
+    assert os.listdir(tmp_path) == []
+
+    # An existing output file is kept as it was
+    nn.writeProject(getProject([{"name": "R1"}]), strOutput, booleanArchive=booleanArchive)
+    bytesWritten = open(strOutput, "rb").read()
+    with pytest.raises(TypeError):
+        nn.writeProject(getProject([{"name": "R2"}, object()]), strOutput, booleanArchive=booleanArchive)
+    assert os.listdir(tmp_path) == [os.path.basename(strOutput)]
+    assert open(strOutput, "rb").read() == bytesWritten
+
+def test_failed_project_file_leaves_nothing_behind(tmp_path):
+    strOutput = str(tmp_path / "lab.gns3")
+    nn.writeProject(getProject([{"name": "R1"}]), strOutput, arrayFiles=[("project-files/dynamips/a/configs/i1_startup-config.cfg", "hostname R1\n")])
+    arrayBefore = sorted(os.path.relpath(os.path.join(strRoot, strName), tmp_path) for strRoot, _, arrayNames in os.walk(tmp_path) for strName in arrayNames)
+    bytesWritten = open(strOutput, "rb").read()
+
+    # The second project file can't be written, since a file is in the way of its directory
+    (tmp_path / "blocked").write_text("")
+    with pytest.raises(nn.NetworkNarcoticError) as objectError:
+        nn.writeProject(getProject([{"name": "R2"}]), strOutput, arrayFiles=[("project-files/dynamips/a/configs/i1_startup-config.cfg", "hostname R2\n"), ("blocked/configs/i2_startup-config.cfg", "hostname R3\n")])
+    assert str(objectError.value).startswith("Can't write '" + strOutput + "': ")
+    assert str(objectError.value).endswith(". Aborting.")
+
+    (tmp_path / "blocked").unlink()
+    assert sorted(os.path.relpath(os.path.join(strRoot, strName), tmp_path) for strRoot, _, arrayNames in os.walk(tmp_path) for strName in arrayNames) == arrayBefore
+    assert open(strOutput, "rb").read() == bytesWritten
+    assert (tmp_path / "project-files" / "dynamips" / "a" / "configs" / "i1_startup-config.cfg").read_text() == "hostname R1\n"